@@ -341,16 +341,22 @@ def get_bit_length_from_plateau_lengths(merged_plateau_lengths) -> int:
         return int(result)
 
 
-def estimate(iq_array: IQArray, noise: float = None, modulation: str = None) -> dict:
+def estimate(iq_array: IQArray, noise: float = None, modulation: str = None, message_indices=None) -> dict:
+    """
+
+    :param message_indices: start and end indices of the messages for the given noise,
+                            if known e.g. from a burst index, otherwise they are segmented from the magnitudes
+    """
     if isinstance(iq_array, np.ndarray):
         iq_array = IQArray(iq_array)
 
-    magnitudes = iq_array.magnitudes
-    # find noise threshold
-    noise = detect_noise_level(magnitudes) if noise is None else noise
+    if noise is None or message_indices is None:
+        magnitudes = iq_array.magnitudes
+        # find noise threshold
+        noise = detect_noise_level(magnitudes) if noise is None else noise
 
-    # segment messages
-    message_indices = segment_messages_from_magnitudes(magnitudes, noise_threshold=noise)
+        # segment messages
+        message_indices = segment_messages_from_magnitudes(magnitudes, noise_threshold=noise)
 
     # detect modulation
     modulation = detect_modulation_for_messages(iq_array, message_indices) if modulation is None else modulation
@@ -49,6 +49,8 @@ except ImportError:
     os.chdir(old_dir)
 
 from urh.dev.BackendHandler import BackendHandler
+from urh.dev.RecordingSink import RecordingSink
+from urh.dev.SampleSource import FileSampleSource, GeneratorSampleSource
 from urh.signalprocessing.Modulator import Modulator
 from urh.dev.VirtualDevice import VirtualDevice
 from urh.signalprocessing.ProtocolSniffer import ProtocolSniffer
@@ -57,9 +59,16 @@ from urh.settings import PAUSE_SEP
 from urh.util.Logger import logger
 from urh.signalprocessing.Encoding import Encoding
 from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
+from urh.signalprocessing.AnalysisCache import AnalysisCache
+from urh.signalprocessing.BurstIndex import BurstIndex
+from urh.signalprocessing.Signal import Signal
+from urh.signalprocessing.StreamingModulator import StreamingModulator, stream_messages
+from urh.util import FileOperator
 
 DEVICES = BackendHandler.DEVICE_NAMES
 MODULATIONS = Modulator.MODULATION_TYPES
+# Samples modulated at once when streaming the modulation
+STREAM_BLOCK_SIZE = 2 ** 16
 
 
 def cli_progress_bar(value, end_value, bar_length=20, title="Percent"):
@@ -211,24 +220,73 @@ def read_messages_to_send(arguments: argparse.Namespace):
     return result
 
 
-def modulate_messages(messages, modulator):
+def modulate_messages(messages, modulator, num_threads=None):
     if len(messages) == 0:
         return None
 
     cli_progress_bar(0, len(messages), title="Modulating")
-    nsamples = sum(int(len(msg.encoded_bits) * modulator.samples_per_symbol + msg.pause) for msg in messages)
-    buffer = IQArray(None, dtype=np.float32, n=nsamples)
-    pos = 0
-    for i, msg in enumerate(messages):
-        # We do not need to modulate the pause extra, as result is already initialized with zeros
-        modulated = modulator.modulate(start=0, data=msg.encoded_bits, pause=0)
-        buffer[pos:pos + len(modulated)] = modulated
-        pos += len(modulated) + msg.pause
-        cli_progress_bar(i + 1, len(messages), title="Modulating")
+    try:
+        buffer, _ = Modulator.modulate_batch([modulator], [msg.encoded_bits for msg in messages],
+                                             [msg.pause for msg in messages], dtype=np.float32,
+                                             num_threads=num_threads,
+                                             progress_callback=lambda n: cli_progress_bar(n, len(messages),
+                                                                                          title="Modulating"))
+    except KeyboardInterrupt:
+        print("\nModulation cancelled")
+        sys.exit(1)
     print("\nSuccessfully modulated {} messages".format(len(messages)))
     return buffer
 
 
+def stream_modulated_messages(messages, modulator):
+    """
+    Get a sample source, which modulates the messages phase continuously while they are sent
+    """
+    if len(messages) == 0:
+        return None
+
+    if modulator.modulation_type == "OQPSK":
+        print("Streaming modulation is not supported for OQPSK.")
+        sys.exit(1)
+
+    data = [(msg.encoded_bits, msg.pause) for msg in messages]
+    return GeneratorSampleSource(stream_messages, StreamingModulator.get_num_samples(modulator, data),
+                                 modulator, data, STREAM_BLOCK_SIZE, np.float32)
+
+
+def extract_bursts(arguments: argparse.Namespace):
+    capture, output = arguments.extract_bursts
+    sample_rate = arguments.sample_rate if arguments.sample_rate else 1e6
+    signal = Signal(capture, "", sample_rate=sample_rate)
+
+    if signal.burst_index is not None and arguments.noise is None:
+        burst_index = signal.burst_index
+    else:
+        burst_index = BurstIndex.from_iq_array(signal.iq_array, noise_level=arguments.noise)
+
+    iq_array, offset_map = burst_index.extract(signal.iq_array, arguments.pre_padding, arguments.post_padding)
+    offset_map.original_filename = os.path.realpath(capture)
+
+    FileOperator.save_data(iq_array, output, sample_rate=signal.sample_rate)
+    offset_map.save(output)
+
+    print("Extracted {} bursts with {} of {} samples ({:.2%}) to {}".format(len(burst_index), len(iq_array),
+                                                                            signal.num_samples,
+                                                                            len(iq_array) / max(1, signal.num_samples),
+                                                                            output))
+    return offset_map
+
+
+def prune_analysis_cache(arguments: argparse.Namespace):
+    cache = AnalysisCache.get_default()
+    max_size = None if arguments.prune_analysis_cache < 0 else int(arguments.prune_analysis_cache * 1024 ** 2)
+    removed, freed = cache.prune(max_size)
+    print("Removed {} entries ({:.1f} MB) from {}, {:.1f} MB remaining".format(removed, freed / 1024 ** 2,
+                                                                               cache.directory,
+                                                                               cache.size / 1024 ** 2))
+    return removed, freed
+
+
 def parse_project_file(file_path: str):
     import xml.etree.ElementTree as ET
     from urh.util.ProjectManager import ProjectManager
@@ -304,6 +362,12 @@ def create_parser():
     group2.add_argument("-bl", "--bit-length", type=int,
                         help="Same as samples per symbol, just there for legacy support (default: {}).".format(DEFAULT_SAMPLES_PER_SYMBOL))
 
+    group2.add_argument("--modulation-threads", type=int,
+                        help="Number of threads to modulate messages in parallel (default: number of CPUs).")
+    group2.add_argument("--stream-modulation", action="store_true",
+                        help="Modulate messages phase continuously while sending instead of all before sending. "
+                             "Saves memory for many messages with native backends.")
+
     group2.add_argument("-n", "--noise", type=float,
                         help="Noise threshold (default: {}). Used for RX only.".format(DEFAULT_NOISE))
     group2.add_argument("-c", "--center", type=float,
@@ -341,6 +405,26 @@ def create_parser():
                              "Any negative value means infinite.")
     group3.add_argument("-r", "--raw", action="store_true",
                         help="Use raw mode i.e. send/receive IQ data instead of bits.")
+    group3.add_argument("--max-file-size", type=float, metavar="MB",
+                        help="Split raw recordings into files of at most this size in megabytes.")
+    group3.add_argument("--max-file-duration", type=float, metavar="SECONDS",
+                        help="Split raw recordings into files of at most this duration in seconds.")
+    group3.add_argument("--compress", action="store_true",
+                        help="Compress raw recordings to the chunked .coco format while receiving.")
+
+    group5 = parser.add_argument_group("Burst extraction",
+                                       "Write a compacted capture holding only the bursts of a sparse capture. "
+                                       "An offset map to the original sample positions is written next to it.")
+    group5.add_argument("-xb", "--extract-bursts", nargs=2, metavar=("CAPTURE", "OUTPUT"),
+                        help="Extract the bursts of CAPTURE to OUTPUT. Uses the noise level given with --noise "
+                             "or detects it automatically.")
+    group5.add_argument("--pre-padding", type=int, default=0, help="Number of samples to keep before each burst")
+    group5.add_argument("--post-padding", type=int, default=0, help="Number of samples to keep after each burst")
+
+    group6 = parser.add_argument_group("Analysis cache", "Manage the cache of demodulated messages.")
+    group6.add_argument("--prune-analysis-cache", type=float, nargs="?", const=-1, metavar="MAX_SIZE_MB",
+                        help="Remove least recently used entries until the cache is not larger than MAX_SIZE_MB. "
+                             "Defaults to the configured maximum size, 0 clears the cache.")
 
     group4 = parser.add_argument_group("Miscellaneous options")
     group4.add_argument("-h", "--help", action="help", help="show this help message and exit")
@@ -369,6 +453,14 @@ def main():
               "Use --parameters instead e.g. --parameters 20K 40K for a binary FSK.")
         sys.exit(1)
 
+    if args.extract_bursts:
+        extract_bursts(args)
+        sys.exit(0)
+
+    if args.prune_analysis_cache is not None:
+        prune_analysis_cache(args)
+        sys.exit(0)
+
     project_params = parse_project_file(args.project_file)
     for argument in ("device", "frequency", "sample_rate"):
         if getattr(args, argument):
@@ -441,11 +533,21 @@ def main():
             if args.filename is None:
                 print("You need to give a file (-file, --filename) where to read samples from.")
                 sys.exit(1)
-            samples_to_send = np.fromfile(args.filename, dtype=np.complex64)
+            if device.backend_is_native:
+                # Stream the samples from the file, so large files need not be loaded before sending
+                samples_to_send = FileSampleSource(args.filename)
+            else:
+                samples_to_send = np.fromfile(args.filename, dtype=np.complex64)
         else:
             modulator = build_modulator_from_args(args)
             messages_to_send = read_messages_to_send(args)
-            samples_to_send = modulate_messages(messages_to_send, modulator)
+            if args.stream_modulation:
+                samples_to_send = stream_modulated_messages(messages_to_send, modulator)
+                if samples_to_send is not None and not device.backend_is_native:
+                    # Only native backends pull samples while sending
+                    samples_to_send = IQArray(samples_to_send.read(0, len(samples_to_send)))
+            else:
+                samples_to_send = modulate_messages(messages_to_send, modulator, args.modulation_threads)
         device.samples_to_send = samples_to_send
         device.start()
 
@@ -467,6 +569,15 @@ def main():
                 sys.exit(1)
 
             receiver = build_device_from_args(args)
+            if receiver.backend_is_native:
+                # Stream samples to disk, so the recording is not limited by the receive buffer
+                max_file_size = None if args.max_file_size is None else int(args.max_file_size * 1024 ** 2)
+                sink = RecordingSink(args.filename, dtype=receiver.data_type, sample_rate=args.sample_rate,
+                                     max_file_size=max_file_size, max_file_duration=args.max_file_duration,
+                                     compress=args.compress)
+                receiver.recording_sink = sink
+            else:
+                sink = None
             receiver.start()
         else:
             receiver = build_protocol_sniffer_from_args(args)
@@ -479,7 +590,7 @@ def main():
         else:
             print("Receiving forever...")
 
-        f = None if args.filename is None else open(args.filename, "w")
+        f = None if args.filename is None or (args.raw and sink is not None) else open(args.filename, "w")
         kwargs = dict() if f is None else {"file": f}
 
         dev = receiver.rcv_device if hasattr(receiver, "rcv_device") else receiver
@@ -503,7 +614,13 @@ def main():
         print("\nStopping receiving...")
         if args.raw:
             receiver.stop("Receiving finished")
-            receiver.data[:receiver.current_index].tofile(f)
+            if sink is not None:
+                sink.close()
+                print("Received data written to {}".format(", ".join(sink.filenames)))
+                print("Written samples: {}, dropped samples: {}".format(sink.num_written_samples,
+                                                                       sink.num_dropped_samples))
+            else:
+                receiver.data[:receiver.current_index].tofile(f)
         else:
             receiver.stop()
 
@@ -75,6 +75,9 @@ class CompareFrameController(QWidget):
         self.select_action = self.search_select_filter_align_menu.addAction(self.tr("Select all"))
         self.filter_action = self.search_select_filter_align_menu.addAction(self.tr("Filter"))
         self.align_action = self.search_select_filter_align_menu.addAction(self.tr("Align"))
+        self.search_select_filter_align_menu.addSeparator()
+        self.regex_search_action = self.search_select_filter_align_menu.addAction(self.tr("Regular expression"))
+        self.regex_search_action.setCheckable(True)
         self.ui.btnSearchSelectFilter.setMenu(self.search_select_filter_align_menu)
 
         self.analyze_menu = QMenu()
@@ -472,7 +475,7 @@ class CompareFrameController(QWidget):
             proto_analyzer.name = datetime.fromtimestamp(messages[0].timestamp).strftime("%Y-%m-%d %H:%M:%S")
             proto_analyzer.messages = messages
             self.add_protocol(proto_analyzer, group_id=self.proto_tree_model.ngroups - 1)
-            self.refresh()
+            self.append_shown_protocol(proto_analyzer)
 
     def add_protocol_label(self, start: int, end: int, messagenr: int, proto_view: int, edit_label_name=True):
         # Ensure at least one Group is active
@@ -545,27 +548,8 @@ class CompareFrameController(QWidget):
                     if not message:
                         continue
 
-                    message.align_labels = align_labels
-                    try:
-                        if hasattr(proto.signal, "sample_rate"):
-                            if i > 0:
-                                rel_time = proto.messages[i - 1].get_duration(proto.signal.sample_rate)
-                                abs_time += rel_time
-                        else:
-                            # No signal, loaded from protocol file
-                            abs_time = datetime.fromtimestamp(message.timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")
-                            if i > 0:
-                                rel_time = message.timestamp - proto.messages[i - 1].timestamp
-                    except IndexError:
-                        pass
-
-                    message.absolute_time = abs_time
-                    message.relative_time = rel_time
-
+                    abs_time, rel_time = self.__add_shown_message(proto, i, align_labels, abs_time, rel_time)
                     num_messages += 1
-                    if message.message_type not in self.proto_analyzer.message_types:
-                        message.message_type = self.proto_analyzer.default_message_type
-                    self.proto_analyzer.messages.append(message)
 
                 line += num_messages
                 rows_for_cur_proto = list(range(prev_line, line))
@@ -608,6 +592,65 @@ class CompareFrameController(QWidget):
         self.updateUI()
         self.show_differences(self.ui.cbShowDiffs.isChecked())
 
+    def __add_shown_message(self, proto: ProtocolAnalyzer, index: int, align_labels: bool, abs_time, rel_time):
+        message = proto.messages[index]
+        message.align_labels = align_labels
+        try:
+            if hasattr(proto.signal, "sample_rate"):
+                if index > 0:
+                    rel_time = proto.messages[index - 1].get_duration(proto.signal.sample_rate)
+                    abs_time += rel_time
+            else:
+                # No signal, loaded from protocol file
+                abs_time = datetime.fromtimestamp(message.timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")
+                if index > 0:
+                    rel_time = message.timestamp - proto.messages[index - 1].timestamp
+        except IndexError:
+            pass
+
+        message.absolute_time = abs_time
+        message.relative_time = rel_time
+
+        if message.message_type not in self.proto_analyzer.message_types:
+            message.message_type = self.proto_analyzer.default_message_type
+        self.proto_analyzer.messages.append(message)
+        return abs_time, rel_time
+
+    def append_shown_protocol(self, proto: ProtocolAnalyzer):
+        """
+        Show the messages of a protocol that was added after all shown protocols, e.g. when sniffing.
+        Only the new rows are inserted into the protocol table instead of rebuilding it.
+        Falls back to a full refresh if the protocol is not the last one in the protocol list.
+
+        :param proto: protocol that was added last
+        """
+        self.__protocols = None
+        protocols = self.protocol_list
+        if not protocols or protocols[-1] is not proto or proto in self.rows_for_protocols:
+            self.refresh()
+            return
+
+        if not proto.show or not proto.messages:
+            self.updateUI(ignore_table_model=True, resize_table=False)
+            return
+
+        align_labels = settings.read("align_labels", True, bool)
+        abs_time, rel_time = 0, 0
+        start = len(self.proto_analyzer.messages)
+        for i, message in enumerate(proto.messages):
+            if message:
+                abs_time, rel_time = self.__add_shown_message(proto, i, align_labels, abs_time, rel_time)
+
+        end = len(self.proto_analyzer.messages)
+        self.rows_for_protocols[proto] = list(range(start, end))
+        if start != end:
+            if start != 0:
+                self.ui.tblViewProtocol.setRowHeight(start, settings.SEPARATION_ROW_HEIGHT)
+            self.protocol_model.first_messages.append(end)
+
+        self.protocol_model.append_rows()
+        self.updateUI(ignore_table_model=True)
+
     def restore_selection(self, old_view: int, sel_cols, sel_rows):
         if len(sel_cols) == 0 or len(sel_rows) == 0:
             return
@@ -675,7 +718,7 @@ class CompareFrameController(QWidget):
 
     def search(self):
         value = self.ui.lineEditSearch.text()
-        nresults = self.protocol_model.find_protocol_value(value)
+        nresults = self.protocol_model.find_protocol_value(value, regex=self.regex_search_action.isChecked())
 
         if nresults > 0:
             self.ui.btnNextSearch.setEnabled(True)
@@ -692,8 +735,7 @@ class CompareFrameController(QWidget):
 
         for search_result in self.protocol_model.search_results:
             startindex = self.protocol_model.index(search_result[0], search_result[1])
-            endindex = self.protocol_model.index(search_result[0],
-                                                 search_result[1] + len(self.protocol_model.search_value) - 1)
+            endindex = self.protocol_model.index(search_result[0], search_result[2] - 1)
 
             sel = QItemSelection()
             sel.select(startindex, endindex)
@@ -763,8 +805,7 @@ class CompareFrameController(QWidget):
         try:
             search_result = self.protocol_model.search_results[index]
             startindex = self.protocol_model.index(search_result[0], search_result[1])
-            endindex = self.protocol_model.index(search_result[0],
-                                                 search_result[1] + len(self.protocol_model.search_value) - 1)
+            endindex = self.protocol_model.index(search_result[0], search_result[2] - 1)
 
             sel = QItemSelection()
             sel.select(startindex, endindex)
@@ -788,8 +829,7 @@ class CompareFrameController(QWidget):
         try:
             search_result = self.protocol_model.search_results[index]
             startindex = self.protocol_model.index(search_result[0], search_result[1])
-            endindex = self.protocol_model.index(search_result[0],
-                                                 search_result[1] + len(self.protocol_model.search_value) - 1)
+            endindex = self.protocol_model.index(search_result[0], search_result[2] - 1)
 
             sel = QItemSelection()
             sel.select(startindex, endindex)
@@ -864,6 +904,8 @@ class CompareFrameController(QWidget):
 
         if filename.endswith(".bin"):
             self.proto_analyzer.to_binary(filename, use_decoded=True)
+        elif filename.endswith(".npz"):
+            self.proto_analyzer.to_npz(filename, use_decoded=True, participants=self.project_manager.participants)
         else:
             self.proto_analyzer.to_xml_file(filename=filename, decoders=self.decodings,
                                             participants=self.project_manager.participants, write_bits=True)
@@ -914,7 +956,7 @@ class CompareFrameController(QWidget):
         visible_rows = [i for i in range(self.protocol_model.row_count) if not self.ui.tblViewProtocol.isRowHidden(i)
                         and i != self.protocol_model.refindex]
 
-        visible_diff_columns = [diff_col for i in visible_rows for diff_col in self.protocol_model.diff_columns[i]]
+        visible_diff_columns = self.protocol_model.diff_columns.columns_of_rows(visible_rows)
 
         for j in range(self.protocol_model.col_count):
             if j in visible_diff_columns:
@@ -933,7 +975,7 @@ class CompareFrameController(QWidget):
         visible_rows = [i for i in range(self.protocol_model.row_count) if not self.ui.tblViewProtocol.isRowHidden(i)
                         and i != self.protocol_model.refindex]
 
-        visible_diff_columns = set([diff_col for i in visible_rows for diff_col in self.protocol_model.diff_columns[i]])
+        visible_diff_columns = self.protocol_model.diff_columns.columns_of_rows(visible_rows)
 
         visible_cols = visible_label_columns & visible_diff_columns
         for j in range(self.protocol_model.col_count):
@@ -1,4 +1,5 @@
 import locale
+import threading
 
 import numpy
 import numpy as np
@@ -21,6 +22,7 @@ from urh.plugins.RfCat.RfCatPlugin import RfCatPlugin
 from urh.signalprocessing.IQArray import IQArray
 from urh.signalprocessing.Message import Message
 from urh.signalprocessing.MessageType import MessageType
+from urh.signalprocessing.ModulationCache import ModulationCache
 from urh.signalprocessing.Modulator import Modulator
 from urh.signalprocessing.ProtocoLabel import ProtocolLabel
 from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
@@ -64,11 +66,13 @@ class GeneratorTabController(QWidget):
         self.init_rfcat_plugin()
 
         self.modulation_msg_indices = []
+        self.modulation_cancel_event = threading.Event()
 
         self.refresh_modulators()
         self.on_selected_modulation_changed()
         self.set_fuzzing_ui_status()
         self.ui.prBarGeneration.hide()
+        self.ui.btnCancelGeneration.hide()
         self.create_connects(compare_frame_controller)
 
         self.set_modulation_profile_status()
@@ -142,6 +146,7 @@ class GeneratorTabController(QWidget):
         self.ui.lWPauses.lost_focus.connect(self.on_lWPauses_lost_focus)
         self.ui.lWPauses.doubleClicked.connect(self.on_lWPauses_double_clicked)
         self.ui.btnGenerate.clicked.connect(self.generate_file)
+        self.ui.btnCancelGeneration.clicked.connect(self.on_btn_cancel_generation_clicked)
         self.label_list_model.protolabel_fuzzing_status_changed.connect(self.handle_plabel_fuzzing_state_changed)
         self.ui.btnFuzz.clicked.connect(self.on_btn_fuzzing_clicked)
         self.ui.tableMessages.create_label_triggered.connect(self.create_fuzzing_label)
@@ -379,6 +384,8 @@ class GeneratorTabController(QWidget):
                 self.unsetCursor()
                 return
             modulated_samples = self.modulate_data(buffer)
+            if modulated_samples is None:
+                return  # modulation was cancelled
             try:
                 sample_rate = self.modulators[0].sample_rate
             except Exception as e:
@@ -396,12 +403,13 @@ class GeneratorTabController(QWidget):
         memory_size_for_buffer = total_samples * n
         logger.debug("Allocating {0:.2f}MB for modulated samples".format(memory_size_for_buffer / (1024 ** 2)))
         try:
-            # allocate it three times as we need the same amount for the sending process
-            IQArray(None, dtype=dtype, n=3*total_samples)
+            # allocate it twice as the sending process may get a copy of it. It is converted chunkwise while sending,
+            # so no further copies are needed
+            IQArray(None, dtype=dtype, n=2*total_samples)
         except MemoryError:
             # will go into continuous mode in this case
             if show_error:
-                Errors.not_enough_ram_for_sending_precache(3*memory_size_for_buffer)
+                Errors.not_enough_ram_for_sending_precache(2*memory_size_for_buffer)
             return None
 
         return IQArray(None, dtype=dtype, n=total_samples)
@@ -410,26 +418,39 @@ class GeneratorTabController(QWidget):
         """
         
         :param buffer: Buffer in which the modulated data shall be written, initialized with zeros
-        :return: 
+        :return: the buffer or None if the modulation was cancelled
         """
         self.ui.prBarGeneration.show()
         self.ui.prBarGeneration.setValue(0)
         self.ui.prBarGeneration.setMaximum(self.table_model.row_count)
+        self.ui.btnCancelGeneration.show()
         self.modulation_msg_indices.clear()
+        self.modulation_cancel_event.clear()
 
-        pos = 0
-        for i in range(0, self.table_model.row_count):
-            message = self.table_model.protocol.messages[i]
-            modulator = self.__get_modulator_of_message(message)
-            # We do not need to modulate the pause extra, as result is already initialized with zeros
-            modulated = modulator.modulate(start=0, data=message.encoded_bits, pause=0)
-            buffer[pos:pos + len(modulated)] = modulated
-            pos += len(modulated) + message.pause
-            self.modulation_msg_indices.append(pos)
-            self.ui.prBarGeneration.setValue(i + 1)
+        def on_progress(num_modulated: int):
+            self.ui.prBarGeneration.setValue(num_modulated)
             QApplication.instance().processEvents()
 
-        self.ui.prBarGeneration.hide()
+        messages = self.table_model.protocol.messages[:self.table_model.row_count]
+        for message in messages:
+            # ensure the modulator index of every message is valid
+            self.__get_modulator_of_message(message)
+
+        try:
+            _, ends = Modulator.modulate_batch(self.modulators, [msg.encoded_bits for msg in messages],
+                                               [msg.pause for msg in messages],
+                                               modulator_indices=[msg.modulator_index for msg in messages],
+                                               buffer=buffer, dtype=buffer.dtype, progress_callback=on_progress,
+                                               cancel_event=self.modulation_cancel_event,
+                                               modulation_cache=ModulationCache.get_default())
+        finally:
+            self.ui.prBarGeneration.hide()
+            self.ui.btnCancelGeneration.hide()
+
+        if ends is None:
+            return None
+
+        self.modulation_msg_indices.extend(ends.tolist())
         return buffer
 
     @pyqtSlot(int)
@@ -569,9 +590,15 @@ class GeneratorTabController(QWidget):
     def on_btn_send_clicked(self):
         try:
             total_samples = self.total_modulated_samples
-            buffer = self.prepare_modulation_buffer(total_samples)
+            if total_samples > settings.CONTINUOUS_SEND_MIN_SAMPLES:
+                # Do not modulate large sequences up front, but message by message while sending
+                buffer = None
+            else:
+                buffer = self.prepare_modulation_buffer(total_samples)
             if buffer is not None:
                 modulated_data = self.modulate_data(buffer)
+                if modulated_data is None:
+                    return  # modulation was cancelled
             else:
                 # Enter continuous mode
                 modulated_data = None
@@ -606,6 +633,10 @@ class GeneratorTabController(QWidget):
             Errors.exception(e)
             self.unsetCursor()
 
+    @pyqtSlot()
+    def on_btn_cancel_generation_clicked(self):
+        self.modulation_cancel_event.set()
+
     @pyqtSlot()
     def on_btn_save_clicked(self):
         filename = FileOperator.ask_save_file_name("profile.fuzz.xml", caption="Save fuzzing profile")
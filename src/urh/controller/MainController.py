@@ -267,7 +267,7 @@ class MainController(QMainWindow):
         self.simulator_tab_controller.load_simulator_file(filename)
 
     def add_signalfile(self, filename: str, group_id=0, enforce_sample_rate=None):
-        if not os.path.exists(filename):
+        if not FileOperator.file_exists(filename):
             QMessageBox.critical(self, self.tr("File not Found"),
                                  self.tr("The file {0} could not be found. Was it moved or renamed?").format(
                                      filename))
@@ -365,7 +365,7 @@ class MainController(QMainWindow):
             return
 
         for i, filename in enumerate(filepaths):
-            if not os.path.exists(filename):
+            if not FileOperator.file_exists(filename):
                 continue
 
             if os.path.isdir(filename):
@@ -1,4 +1,6 @@
 import csv
+import itertools
+import warnings
 
 import os
 import numpy as np
@@ -15,6 +17,7 @@ class CSVImportDialog(QDialog):
 
 
     PREVIEW_ROWS = 100
+    CHUNK_ROWS = 2 ** 16
     COLUMNS = {"T": 0, "I": 1, "Q": 2}
 
     def __init__(self, filename="", parent=None):
@@ -25,6 +28,7 @@ class CSVImportDialog(QDialog):
         self.setWindowFlags(Qt.Window)
 
         self.ui.btnAutoDefault.hide()
+        self.ui.progressBarImport.hide()
 
         completer = QCompleter()
         completer.setModel(QDirModel(completer))
@@ -48,6 +52,7 @@ class CSVImportDialog(QDialog):
         self.ui.spinBoxIDataColumn.valueChanged.connect(self.on_spinbox_i_data_column_value_changed)
         self.ui.spinBoxQDataColumn.valueChanged.connect(self.on_spinbox_q_data_column_value_changed)
         self.ui.spinBoxTimestampColumn.valueChanged.connect(self.on_spinbox_timestamp_value_changed)
+        self.ui.spinBoxSkipRows.valueChanged.connect(self.on_spinbox_skip_rows_value_changed)
 
     def update_file(self):
         filename = self.ui.lineEditFilename.text()
@@ -70,6 +75,8 @@ class CSVImportDialog(QDialog):
         self.ui.spinBoxIDataColumn.setEnabled(enable)
         self.ui.spinBoxQDataColumn.setEnabled(enable)
         self.ui.spinBoxTimestampColumn.setEnabled(enable)
+        self.ui.spinBoxSkipRows.setEnabled(enable)
+        self.ui.spinBoxDecimation.setEnabled(enable)
         self.ui.tableWidgetPreview.setEnabled(enable)
         self.ui.labelFileNotFound.setVisible(not enable)
 
@@ -85,7 +92,8 @@ class CSVImportDialog(QDialog):
         self.ui.tableWidgetPreview.setRowCount(self.PREVIEW_ROWS)
 
         with open(self.filename, encoding="utf-8-sig") as f:
-            csv_reader = csv.reader(f, delimiter=self.ui.comboBoxCSVSeparator.currentText())
+            csv_reader = csv.reader(itertools.islice(f, self.ui.spinBoxSkipRows.value(), None),
+                                    delimiter=self.ui.comboBoxCSVSeparator.currentText())
             row = -1
 
             for line in csv_reader:
@@ -132,24 +140,171 @@ class CSVImportDialog(QDialog):
         return result
 
     @staticmethod
-    def parse_csv_file(filename: str, separator: str, i_data_col: int, q_data_col=-1, t_data_col=-1):
-        iq_data = []
+    def parse_csv_file(filename: str, separator: str, i_data_col: int, q_data_col=-1, t_data_col=-1,
+                       skip_rows=0, decimation=1):
+        """
+        Parse a CSV file into memory
+
+        :return: normalized complex samples and estimated sample rate or None if there are no timestamps
+        """
+        chunks = []
         timestamps = [] if t_data_col > -1 else None
-        with open(filename, encoding="utf-8-sig") as f:
-            csv_reader = csv.reader(f, delimiter=separator)
-            for line in csv_reader:
-                parsed = CSVImportDialog.parse_csv_line(line, i_data_col, q_data_col, t_data_col)
-                if parsed is None:
-                    continue
-
-                iq_data.append(complex(parsed["I"], parsed["Q"]))
-                if timestamps is not None:
-                    timestamps.append(parsed["T"])
-
-        iq_data = np.asarray(iq_data, dtype=np.complex64)
+        for iq, t in CSVImportDialog.iter_csv_chunks(filename, separator, i_data_col, q_data_col, t_data_col,
+                                                     skip_rows, decimation):
+            chunks.append(iq)
+            if timestamps is not None and len(timestamps) < CSVImportDialog.PREVIEW_ROWS:
+                timestamps.extend(t[:CSVImportDialog.PREVIEW_ROWS - len(timestamps)].tolist())
+
+        iq_data = np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.float32)
+        iq_data = iq_data.view(np.complex64).reshape(-1)
         sample_rate = CSVImportDialog.estimate_sample_rate(timestamps)
         return iq_data / abs(iq_data.max()), sample_rate
 
+    @staticmethod
+    def import_csv_file(filename: str, target_filename: str, separator: str, i_data_col: int, q_data_col=-1,
+                        t_data_col=-1, skip_rows=0, decimation=1, progress_callback=None):
+        """
+        Import a CSV file to a complex file chunk by chunk,
+        so files with tens of millions of rows never have to fit into memory.
+        The samples are normalized in place through a memory map after all rows are written.
+
+        :param progress_callback: called with the progress in percent
+        :return: number of imported samples and estimated sample rate or None if there are no timestamps
+        """
+        timestamps = [] if t_data_col > -1 else None
+        maximum = None  # largest sample in the order of complex numbers used by numpy, i.e. by I then by Q
+        num_samples = 0
+
+        tmp_filename = "{}.{}.tmp".format(target_filename, os.getpid())
+        try:
+            with open(tmp_filename, "wb") as f:
+                for iq, t in CSVImportDialog.iter_csv_chunks(filename, separator, i_data_col, q_data_col,
+                                                             t_data_col, skip_rows, decimation, progress_callback):
+                    if len(iq) == 0:
+                        continue
+
+                    iq.tofile(f)
+                    num_samples += len(iq)
+
+                    i_max = iq[:, 0].max()
+                    chunk_maximum = (i_max, iq[iq[:, 0] == i_max, 1].max())
+                    maximum = chunk_maximum if maximum is None else max(maximum, chunk_maximum)
+
+                    if timestamps is not None and len(timestamps) < CSVImportDialog.PREVIEW_ROWS:
+                        timestamps.extend(t[:CSVImportDialog.PREVIEW_ROWS - len(timestamps)].tolist())
+
+            norm = np.float32(abs(complex(*maximum))) if maximum is not None else 0
+            if num_samples > 0 and norm != 0:
+                data = np.memmap(tmp_filename, dtype=np.float32, mode="r+", shape=(num_samples, 2))
+                for start in range(0, num_samples, CSVImportDialog.CHUNK_ROWS):
+                    data[start:start + CSVImportDialog.CHUNK_ROWS] /= norm
+                data.flush()
+                del data
+
+            os.replace(tmp_filename, target_filename)
+        except Exception:
+            if os.path.isfile(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+
+        return num_samples, CSVImportDialog.estimate_sample_rate(timestamps)
+
+    @staticmethod
+    def iter_csv_chunks(filename: str, separator: str, i_data_col: int, q_data_col=-1, t_data_col=-1,
+                        skip_rows=0, decimation=1, progress_callback=None, chunk_rows=None):
+        """
+        Parse a CSV file in chunks of rows. Rows that can not be parsed, e.g. headers, are skipped.
+
+        :param skip_rows: number of rows at the beginning of the file to ignore
+        :param decimation: only keep every n-th parsed row
+        :param progress_callback: called with the progress in percent after every chunk
+        :return: generator of I/Q samples as float32 array of shape (n, 2) and timestamps or None
+        """
+        chunk_rows = CSVImportDialog.CHUNK_ROWS if chunk_rows is None else chunk_rows
+        decimation = max(1, int(decimation))
+        file_size = max(1, os.path.getsize(filename))
+        num_parsed = 0
+
+        # Read bytes, as the position of text files can not be told while iterating over them
+        with open(filename, "rb") as f:
+            for _ in itertools.islice(f, skip_rows):
+                pass
+
+            first_chunk = True
+            while True:
+                lines = list(itertools.islice(f, chunk_rows))
+                if not lines:
+                    break
+
+                text = b"".join(lines).decode("utf-8", errors="replace")
+                if first_chunk and text.startswith("\ufeff"):
+                    text = text[1:]
+                first_chunk = False
+
+                rows = CSVImportDialog.__parse_csv_chunk(text, separator, i_data_col, q_data_col, t_data_col)
+                offset = (-num_parsed) % decimation
+                num_parsed += len(rows)
+                rows = rows[offset::decimation]
+
+                iq = np.empty((len(rows), 2), dtype=np.float32)
+                iq[:, 0] = rows[:, 1] if i_data_col > -1 else 0
+                iq[:, 1] = rows[:, 2] if q_data_col > -1 else 0
+                yield iq, rows[:, 0] if t_data_col > -1 else None
+
+                if progress_callback is not None:
+                    progress_callback(int(100 * f.tell() / file_size))
+
+    @staticmethod
+    def __parse_csv_chunk(text: str, separator: str, i_data_col: int, q_data_col: int, t_data_col: int):
+        """
+        Parse a chunk of CSV lines
+
+        :return: float64 array of shape (number of valid lines, 3) with timestamp, I and Q of each line
+        """
+        columns = (t_data_col, i_data_col, q_data_col)
+        result = np.zeros((0, len(columns)), dtype=np.float64)
+        lines = text.splitlines()
+
+        # Drop leading lines that can not be parsed, e.g. headers, so the rest of the chunk can take the fast path
+        first = 0
+        while first < len(lines) and CSVImportDialog.parse_csv_line(lines[first].split(separator), i_data_col,
+                                                                    q_data_col, t_data_col) is None:
+            first += 1
+        lines = lines[first:]
+        if not lines:
+            return result
+
+        # Fast path: all lines are numeric and have the same number of columns as the first one,
+        # so the whole chunk can be parsed at once
+        num_columns = lines[0].count(separator) + 1
+        joined = separator.join(lines)
+        if max(columns) < num_columns and joined.count(separator) == len(lines) * num_columns - 1:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                try:
+                    values = np.fromstring(joined, sep=separator)
+                except ValueError:
+                    values = None
+
+            if values is not None and len(values) == len(lines) * num_columns:
+                values = values.reshape((len(lines), num_columns))
+                result = np.zeros((len(lines), len(columns)), dtype=np.float64)
+                for i, col in enumerate(columns):
+                    if col > -1:
+                        result[:, i] = values[:, col]
+                return result
+
+        # Slow path for chunks with headers, comments or quoted values
+        parsed_lines = []
+        for line in csv.reader(lines, delimiter=separator):
+            parsed = CSVImportDialog.parse_csv_line(line, i_data_col, q_data_col, t_data_col)
+            if parsed is not None:
+                parsed_lines.append((parsed.get("T", 0.0), parsed["I"], parsed["Q"]))
+
+        if parsed_lines:
+            result = np.array(parsed_lines, dtype=np.float64)
+        return result
+
     @staticmethod
     def estimate_sample_rate(timestamps):
         if timestamps is None or len(timestamps) < 2:
@@ -205,15 +360,14 @@ class CSVImportDialog(QDialog):
         self.ui.tableWidgetPreview.setColumnHidden(self.COLUMNS["T"], value == 0)
         self.update_preview()
 
+    @pyqtSlot(int)
+    def on_spinbox_skip_rows_value_changed(self, value: int):
+        self.update_preview()
+
     @pyqtSlot()
     def on_accepted(self):
         QApplication.setOverrideCursor(Qt.WaitCursor)
 
-        iq_data, sample_rate = self.parse_csv_file(self.filename, self.ui.comboBoxCSVSeparator.currentText(),
-                                                   self.ui.spinBoxIDataColumn.value()-1,
-                                                   self.ui.spinBoxQDataColumn.value()-1,
-                                                   self.ui.spinBoxTimestampColumn.value()-1)
-
         target_filename = self.filename.rstrip(".csv")
         if os.path.exists(target_filename + ".complex"):
             i = 1
@@ -225,11 +379,25 @@ class CSVImportDialog(QDialog):
         target_filename = target_filename if not i else target_filename + "_" + str(i)
         target_filename += ".complex"
 
-        iq_data.tofile(target_filename)
+        self.ui.progressBarImport.setValue(0)
+        self.ui.progressBarImport.show()
+        _, sample_rate = self.import_csv_file(self.filename, target_filename,
+                                              self.ui.comboBoxCSVSeparator.currentText(),
+                                              self.ui.spinBoxIDataColumn.value()-1,
+                                              self.ui.spinBoxQDataColumn.value()-1,
+                                              self.ui.spinBoxTimestampColumn.value()-1,
+                                              skip_rows=self.ui.spinBoxSkipRows.value(),
+                                              decimation=self.ui.spinBoxDecimation.value(),
+                                              progress_callback=self.on_import_progress)
+        self.ui.progressBarImport.hide()
 
         self.data_imported.emit(target_filename, sample_rate if sample_rate is not None else 0)
         QApplication.restoreOverrideCursor()
 
+    def on_import_progress(self, value: int):
+        self.ui.progressBarImport.setValue(value)
+        QApplication.instance().processEvents()
+
 if __name__ == '__main__':
     app = QApplication(["urh"])
     csv_dia = CSVImportDialog()
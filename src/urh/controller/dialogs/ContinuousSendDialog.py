@@ -1,10 +1,13 @@
+import numpy as np
 from PyQt5.QtCore import pyqtSlot
 from PyQt5.QtGui import QCloseEvent
 
 from urh.controller.dialogs.SendDialog import SendDialog
 from urh.controller.dialogs.SendRecvDialog import SendRecvDialog
+from urh.dev.SampleSource import GeneratorSampleSource
 from urh.dev.VirtualDevice import VirtualDevice, Mode
-from urh.signalprocessing.ContinuousModulator import ContinuousModulator
+from urh.signalprocessing.ContinuousModulator import ContinuousModulator, modulate_messages
+from urh.signalprocessing.Modulator import Modulator
 from urh.ui.painting.ContinuousSceneManager import ContinuousSceneManager
 
 
@@ -25,6 +28,8 @@ class ContinuousSendDialog(SendDialog):
 
         num_repeats = self.device_settings_widget.ui.spinBoxNRepeat.value()
         self.continuous_modulator = ContinuousModulator(messages, modulators, num_repeats=num_repeats)
+        self.__sample_source = None
+        self.__message_ends = None
         self.scene_manager = ContinuousSceneManager(ring_buffer=self.continuous_modulator.ring_buffer, parent=self)
         self.scene_manager.init_scene()
         self.graphics_view.setScene(self.scene_manager.scene)
@@ -42,8 +47,31 @@ class ContinuousSendDialog(SendDialog):
     def _update_send_indicator(self, width: int):
         pass
 
+    @property
+    def sample_source(self) -> GeneratorSampleSource:
+        """
+        Source for native devices, whose send process modulates the messages while sending
+        """
+        if self.__sample_source is None:
+            data = [msg.encoded_bits for msg in self.messages]
+            pauses = [msg.pause for msg in self.messages]
+            modulator_indices = [msg.modulator_index for msg in self.messages]
+            self.__sample_source = GeneratorSampleSource(modulate_messages, self.total_samples, data, pauses,
+                                                         modulator_indices, self.modulators,
+                                                         dtype=Modulator.get_dtype())
+
+            lengths = [len(bits) // self.modulators[i].bits_per_symbol * self.modulators[i].samples_per_symbol
+                       for bits, i in zip(data, modulator_indices)]
+            self.__message_ends = np.cumsum(np.array(lengths, dtype=np.int64) + np.array(pauses, dtype=np.int64))
+        return self.__sample_source
+
     def update_view(self):
         super().update_view()
+        if self.device.backend_is_native:
+            msg_index = np.searchsorted(self.__message_ends, self.device.current_index, side="right")
+            self.ui.progressBarMessage.setValue(min(msg_index, len(self.messages) - 1) + 1)
+            return
+
         self.ui.progressBarMessage.setValue(self.continuous_modulator.current_message_index.value + 1)
         self.scene_manager.init_scene()
         self.scene_manager.show_full_scene()
@@ -72,7 +100,7 @@ class ContinuousSendDialog(SendDialog):
     @pyqtSlot()
     def on_start_clicked(self):
         self.device_settings_widget.ui.spinBoxNRepeat.editingFinished.emit()  # inform continuous modulator
-        if not self.continuous_modulator.is_running:
+        if not self.device.backend_is_native and not self.continuous_modulator.is_running:
             self.continuous_modulator.start()
         super().on_start_clicked()
 
@@ -99,11 +127,19 @@ class ContinuousSendDialog(SendDialog):
         self.device = VirtualDevice(self.backend_handler, device_name, Mode.send,
                                     device_ip="192.168.10.2", sending_repeats=num_repeats, parent=self)
         self.ui.btnStart.setEnabled(True)
+        self.ui.progressBarSample.setVisible(self.device.backend_is_native)
+        self.ui.lSamplesSentText.setVisible(self.device.backend_is_native)
 
         try:
-            self.device.is_send_continuous = True
-            self.device.continuous_send_ring_buffer = self.continuous_modulator.ring_buffer
-            self.device.num_samples_to_send = self.total_samples
+            if self.device.backend_is_native:
+                # The send process pulls the modulated messages from the sample source,
+                # so neither a modulation process nor a ring buffer is needed
+                self.device.samples_to_send = self.sample_source
+                self.ui.progressBarSample.setMaximum(self.total_samples)
+            else:
+                self.device.is_send_continuous = True
+                self.device.continuous_send_ring_buffer = self.continuous_modulator.ring_buffer
+                self.device.num_samples_to_send = self.total_samples
 
             self._create_device_connects()
         except ValueError as e:
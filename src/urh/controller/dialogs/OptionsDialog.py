@@ -180,6 +180,10 @@ class OptionsDialog(QDialog):
         self.ui.checkBoxAlignLabels.setChecked(settings.read('align_labels', True, bool))
 
         self.ui.doubleSpinBoxRAMThreshold.setValue(100 * settings.read('ram_threshold', 0.6, float))
+        self.ui.checkBoxAnalysisCache.setChecked(settings.read('use_analysis_cache', False, bool))
+        self.ui.checkBoxAnalysisCacheStoreQad.setChecked(settings.read('analysis_cache_store_qad', False, bool))
+        self.ui.checkBoxAnalysisCacheStoreQad.setEnabled(self.ui.checkBoxAnalysisCache.isChecked())
+        self.ui.checkBoxBurstIndex.setChecked(settings.read('use_burst_index', False, bool))
 
         if self.backend_handler.gr_python_interpreter:
             self.ui.lineEditGRPythonInterpreter.setText(self.backend_handler.gr_python_interpreter)
@@ -237,6 +241,9 @@ class OptionsDialog(QDialog):
         self.ui.radioButtonHighModulationAccuracy.clicked.connect(self.on_radio_button_high_modulation_accuracy_clicked)
 
         self.ui.doubleSpinBoxRAMThreshold.valueChanged.connect(self.on_double_spinbox_ram_threshold_value_changed)
+        self.ui.checkBoxAnalysisCache.clicked.connect(self.on_checkbox_analysis_cache_clicked)
+        self.ui.checkBoxAnalysisCacheStoreQad.clicked.connect(self.on_checkbox_analysis_cache_store_qad_clicked)
+        self.ui.checkBoxBurstIndex.clicked.connect(self.on_checkbox_burst_index_clicked)
         self.ui.btnRebuildNative.clicked.connect(self.on_btn_rebuild_native_clicked)
         self.ui.comboBoxIconTheme.currentIndexChanged.connect(self.on_combobox_icon_theme_index_changed)
         self.ui.checkBoxMultipleModulations.clicked.connect(self.on_checkbox_multiple_modulations_clicked)
@@ -349,6 +356,19 @@ class OptionsDialog(QDialog):
         val = self.ui.doubleSpinBoxRAMThreshold.value()
         settings.write("ram_threshold", val / 100)
 
+    @pyqtSlot(bool)
+    def on_checkbox_analysis_cache_clicked(self, checked: bool):
+        settings.write("use_analysis_cache", checked)
+        self.ui.checkBoxAnalysisCacheStoreQad.setEnabled(checked)
+
+    @pyqtSlot(bool)
+    def on_checkbox_analysis_cache_store_qad_clicked(self, checked: bool):
+        settings.write("analysis_cache_store_qad", checked)
+
+    @pyqtSlot(bool)
+    def on_checkbox_burst_index_clicked(self, checked: bool):
+        settings.write("use_burst_index", checked)
+
     @pyqtSlot(bool)
     def on_checkbox_confirm_close_dialog_clicked(self, checked: bool):
         settings.write("not_show_close_dialog", not checked)
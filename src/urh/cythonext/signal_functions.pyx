@@ -193,39 +193,85 @@ cpdef uint8_t[:] get_oqpsk_bits(uint8_t[:] original_bits):
     return result
 
 
+# Polyphase Gaussian pulse shapes for GFSK per (sample_rate, samples_per_symbol, bt, filter_width)
+cdef dict gauss_pulse_cache = {}
+cdef int GAUSS_PULSE_CACHE_SIZE = 64
+
+cdef tuple get_gauss_pulse(float sample_rate, uint32_t samples_per_symbol, float gauss_bt, float filter_width):
+    """
+    Get the Gaussian filter response to a single symbol as matrix with a row per symbol the response reaches,
+    so the filtered frequencies are a weighted sum of the rows by the symbol frequencies.
+
+    :return: matrix of shape (num_rows, samples_per_symbol) and offset of the first row in symbols
+    """
+    key = (sample_rate, samples_per_symbol, gauss_bt, filter_width)
+    try:
+        return gauss_pulse_cache[key]
+    except KeyError:
+        pass
+
+    cdef np.ndarray[np.float32_t, ndim=1] gfir = gauss_fir(sample_rate, samples_per_symbol,
+                                                           bt=gauss_bt, filter_width=filter_width)
+    # Response to a symbol, aligned like np.convolve(mode="same") which centers the filter
+    pulse = np.convolve(np.ones(samples_per_symbol, dtype=np.float32), gfir).astype(np.float32)
+    cdef int64_t delay = (len(gfir) - 1) // 2
+    cdef int64_t first_row = -((delay + samples_per_symbol - 1) // samples_per_symbol)
+    cdef int64_t num_rows = (len(pulse) - delay - 1) // samples_per_symbol - first_row + 1
+
+    padded = np.zeros(num_rows * samples_per_symbol, dtype=np.float32)
+    cdef int64_t pad = -first_row * samples_per_symbol - delay
+    padded[pad:pad + len(pulse)] = pulse
+
+    result = (padded.reshape((num_rows, samples_per_symbol)), first_row)
+    if len(gauss_pulse_cache) >= GAUSS_PULSE_CACHE_SIZE:
+        gauss_pulse_cache.clear()
+    gauss_pulse_cache[key] = result
+    return result
+
 cdef np.ndarray[np.float32_t, ndim=2] get_gauss_filtered_freqs_phases(uint8_t[:] bits,  float[:] parameters,
                                                                      uint32_t num_symbols, uint32_t samples_per_symbol,
                                                                      float sample_rate, float phi, uint32_t start,
                                                                      float gauss_bt, float filter_width):
-    cdef int64_t i, s_i, index, num_values = num_symbols * samples_per_symbol
-    cdef np.ndarray[np.float32_t, ndim=1] frequencies = np.empty(num_values, dtype=np.float32)
+    cdef int64_t i, d, num_values = num_symbols * samples_per_symbol
     cdef uint16_t bits_per_symbol = int(len(bits) // num_symbols)
 
-    for s_i in range(0, num_symbols):
-        index = bit_array_to_number(bits, end=(s_i+1)*bits_per_symbol, start=s_i*bits_per_symbol)
+    weights = 1 << np.arange(bits_per_symbol - 1, -1, -1, dtype=np.int64)
+    indices = np.asarray(bits)[:num_symbols * bits_per_symbol].reshape((num_symbols, bits_per_symbol)).dot(weights)
+    symbol_freqs = np.asarray(parameters, dtype=np.float32)[indices]
 
-        for i in range(s_i * samples_per_symbol, (s_i+1)*samples_per_symbol):
-            frequencies[i] = parameters[index]
-
-    cdef np.ndarray[np.float32_t, ndim=1] t = np.arange(start, start + num_values, dtype=np.float32) / sample_rate
-    cdef np.ndarray[np.float32_t, ndim=1] gfir = gauss_fir(sample_rate, samples_per_symbol,
-                                                           bt=gauss_bt, filter_width=filter_width)
-
-    if len(frequencies) >= len(gfir):
-        frequencies = np.convolve(frequencies, gfir, mode="same")
+    cdef np.ndarray[np.float32_t, ndim=1] gfir
+    result = np.empty((num_values, 2), dtype=np.float32)
+    if num_values < 2 * int(filter_width * samples_per_symbol) + 1:
+        # Message is shorter than the filter, keep the alignment of np.convolve for this case
+        gfir = gauss_fir(sample_rate, samples_per_symbol, bt=gauss_bt, filter_width=filter_width)
+        result[:, 0] = np.convolve(gfir, np.repeat(symbol_freqs, samples_per_symbol), mode="same")[:num_values]
     else:
-        # Prevent dimension crash later, because gaussian finite impulse response is longer then param_vector
-        frequencies = np.convolve(gfir, frequencies, mode="same")[:len(frequencies)]
-
-    cdef np.ndarray[np.float32_t, ndim=1] phases = np.zeros(len(frequencies), dtype=np.float32)
+        # Sum the cached responses of all symbols shifted by their position instead of convolving every sample
+        pulse, first_row = get_gauss_pulse(sample_rate, samples_per_symbol, gauss_bt, filter_width)
+        frequencies = result[:, 0].reshape((num_symbols, samples_per_symbol))
+        frequencies[:] = 0
+        for i in range(len(pulse)):
+            d = first_row + i
+            if abs(d) >= num_symbols:
+                continue
+            elif d >= 0:
+                frequencies[d:] += symbol_freqs[:num_symbols - d, np.newaxis] * pulse[i]
+            else:
+                frequencies[:num_symbols + d] += symbol_freqs[-d:, np.newaxis] * pulse[i]
+
+    # Correct the phase to prevent spiky jumps. Accumulate in double precision, as the phase grows with time
+    frequencies = result[:, 0]
+    phases = np.arange(<int64_t>start - 1, <int64_t>start + num_values - 1, dtype=np.float64)
+    phases /= sample_rate
+    phases[1:] *= frequencies[:num_values - 1] - frequencies[1:]
+    phases[1:] *= 2 * M_PI
     phases[0] = phi
-    for i in range(0, len(phases) - 1):
-         # Correct the phase to prevent spiky jumps
-        phases[i + 1] = 2 * M_PI * t[i] * (frequencies[i] - frequencies[i + 1]) + phases[i]
+    np.cumsum(phases, out=phases)
+    result[:, 1] = phases
 
-    return np.column_stack((frequencies, phases))
+    return result
 
-cdef np.ndarray[np.float32_t, ndim=1] gauss_fir(float sample_rate, uint32_t samples_per_symbol,
+cpdef np.ndarray[np.float32_t, ndim=1] gauss_fir(float sample_rate, uint32_t samples_per_symbol,
                                                 float bt=.5, float filter_width=1.0):
     """
 
@@ -0,0 +1,207 @@
+import os
+import queue
+import threading
+
+import numpy as np
+
+from urh.signalprocessing.CompressedIQFile import CompressedIQWriter
+from urh.util.Logger import logger
+
+
+class RecordingSink(object):
+    """
+    Stream received samples to disk, so recordings are not limited by the size of the receive buffer.
+
+    Samples are copied into a pool of preallocated blocks and a dedicated writer thread writes full blocks
+    with large unbuffered writes. If the writer can not keep up and no free block is left,
+    samples are dropped instead of blocking the receiver, and counted in num_dropped_samples.
+    Recordings can be split into several files by size or duration and optionally be compressed
+    in parallel to the chunked .coco format.
+    """
+
+    BLOCK_SIZE = 4 * 1024 ** 2  # bytes per block and write call, a multiple of the page size
+    NUM_BLOCKS = 64
+
+    def __init__(self, filename: str, dtype=np.float32, sample_rate: float = None, max_file_size: int = None,
+                 max_file_duration: float = None, compress=False, codec=None, num_blocks: int = None):
+        """
+
+        :param filename: name of the recording. If it gets split, an index is appended to the name of each file.
+        :param dtype: data type of the samples
+        :param sample_rate: sample rate, required to split by duration
+        :param max_file_size: maximum size of each file in bytes before compression
+        :param max_file_duration: maximum duration of each file in seconds
+        :param compress: write compressed .coco files
+        :param codec: codec for compression, see CompressedIQFile
+        :param num_blocks: number of blocks to buffer, defaults to NUM_BLOCKS
+        """
+        self.filename = filename
+        self.dtype = np.dtype(dtype)
+        self.compress = compress
+        self.codec = codec
+
+        bytes_per_sample = 2 * self.dtype.itemsize
+        samples_per_file = []
+        if max_file_size is not None:
+            samples_per_file.append(int(max_file_size) // bytes_per_sample)
+        if max_file_duration is not None:
+            if not sample_rate:
+                raise ValueError("Sample rate is required to split recordings by duration")
+            samples_per_file.append(int(max_file_duration * sample_rate))
+        self.samples_per_file = max(1, min(samples_per_file)) if samples_per_file else None
+
+        self.filenames = []
+        self.num_written_samples = 0
+        self.__num_dropped_samples = 0  # only changed by the receiving thread
+        self.__num_failed_samples = 0  # only changed by the writer thread
+        self.error = None  # type: OSError
+
+        block_samples = max(1, self.BLOCK_SIZE // bytes_per_sample)
+        self.__free_blocks = queue.Queue()
+        for _ in range(self.NUM_BLOCKS if num_blocks is None else num_blocks):
+            self.__free_blocks.put(np.empty((block_samples, 2), dtype=self.dtype))
+        self.__full_blocks = queue.Queue()
+        self.__current_block = None
+        self.__current_length = 0
+
+        self.__file = None
+        self.__file_samples = 0
+
+        self.is_closed = False
+        self.__writer_thread = threading.Thread(target=self.__write_blocks)
+        self.__writer_thread.daemon = True
+        self.__writer_thread.start()
+
+    @property
+    def num_dropped_samples(self) -> int:
+        """
+        Number of samples that were not written, as no block was free or writing failed
+        """
+        return self.__num_dropped_samples + self.__num_failed_samples
+
+    @property
+    def num_received_samples(self) -> int:
+        return self.num_written_samples + self.num_dropped_samples
+
+    def write(self, samples: np.ndarray) -> bool:
+        """
+        Add samples of shape (n, 2) to the recording. This never blocks, so it can be called from receive threads.
+
+        :return: False if samples were dropped
+        """
+        if self.is_closed:
+            return False
+
+        n, pos = len(samples), 0
+        while pos < n:
+            if self.__current_block is None:
+                try:
+                    self.__current_block = self.__free_blocks.get_nowait()
+                    self.__current_length = 0
+                except queue.Empty:
+                    self.__num_dropped_samples += n - pos
+                    return False
+
+            block, length = self.__current_block, self.__current_length
+            k = min(n - pos, len(block) - length)
+            block[length:length + k] = samples[pos:pos + k]
+            self.__current_length += k
+            pos += k
+
+            if self.__current_length == len(block):
+                self.flush()
+
+        return True
+
+    def flush(self):
+        """
+        Hand the samples written so far to the writer thread
+        """
+        if self.__current_block is not None and self.__current_length > 0:
+            self.__full_blocks.put((self.__current_block, self.__current_length))
+            self.__current_block = None
+
+    def close(self):
+        """
+        Write all remaining samples and close the current file
+        """
+        if self.is_closed:
+            return
+        self.is_closed = True
+
+        self.flush()
+        self.__full_blocks.put(None)
+        self.__writer_thread.join()
+
+    def __write_blocks(self):
+        while True:
+            item = self.__full_blocks.get()
+            if item is None:
+                break
+
+            block, length = item
+            if self.error is None:
+                try:
+                    self.__write_samples(block[:length])
+                except OSError as e:
+                    logger.error("Could not write recording: {}".format(e))
+                    self.error = e
+            if self.error is not None:
+                self.__num_failed_samples += length
+            self.__free_blocks.put(block)
+
+        try:
+            self.__close_file()
+        except OSError as e:
+            logger.error("Could not write recording: {}".format(e))
+            self.error = e
+
+    def __write_samples(self, samples: np.ndarray):
+        pos = 0
+        while pos < len(samples):
+            if self.__file is None:
+                self.__open_file()
+
+            n = len(samples) - pos
+            if self.samples_per_file is not None:
+                n = min(n, self.samples_per_file - self.__file_samples)
+
+            if self.compress:
+                self.__file.write(samples[pos:pos + n])
+            else:
+                data = memoryview(samples[pos:pos + n]).cast("B")
+                while data:
+                    data = data[self.__file.write(data):]
+
+            pos += n
+            self.__file_samples += n
+            self.num_written_samples += n
+
+            if self.samples_per_file is not None and self.__file_samples >= self.samples_per_file:
+                self.__close_file()
+
+    def __open_file(self):
+        filename = self.__get_filename(len(self.filenames))
+        if self.compress:
+            self.__file = CompressedIQWriter(filename, self.dtype, self.codec)
+        else:
+            # Unbuffered, as the blocks are already large
+            self.__file = open(filename, "wb", buffering=0)
+        self.__file_samples = 0
+        self.filenames.append(filename)
+
+    def __close_file(self):
+        if self.__file is not None:
+            f, self.__file = self.__file, None
+            f.close()
+
+    def __get_filename(self, index: int) -> str:
+        name = self.filename
+        if self.compress and not name.endswith(".coco"):
+            name += ".coco"
+
+        if self.samples_per_file is None:
+            return name
+
+        base, ext = os.path.splitext(name)
+        return "{}_{:04d}{}".format(base, index, ext)
@@ -0,0 +1,158 @@
+import numpy as np
+
+from urh.signalprocessing.CompressedIQFile import CompressedIQFile
+from urh.signalprocessing.IQArray import IQArray
+
+
+class SampleSource(object):
+    """
+    Pull based source of IQ samples for transmission.
+
+    The send process reads the samples chunk by chunk while sending and converts
+    only the current chunk to the data type of the device, so no converted copy of the whole sequence is required.
+    Sources are passed to the send process, so they must be picklable.
+    """
+
+    def __len__(self):
+        raise NotImplementedError("Overwrite this method in subclass!")
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            return self.read(start, max(start, stop))[::step]
+        raise TypeError("{} only supports slices".format(self.__class__.__name__))
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """
+        Read the samples in range [start, stop)
+
+        :return: array of shape (n, 2), which is shorter than requested at the end of the source
+        """
+        raise NotImplementedError("Overwrite this method in subclass!")
+
+
+class ArraySampleSource(SampleSource):
+    """
+    Samples that are already in memory, e.g. a modulated signal
+    """
+
+    def __init__(self, samples):
+        """
+
+        :param samples: IQArray or numpy array of interleaved or complex samples
+        """
+        self.samples = samples.data if isinstance(samples, IQArray) else IQArray.convert_array_to_iq(samples)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        return self.samples[start:stop]
+
+
+class FileSampleSource(SampleSource):
+    """
+    Samples of a raw complex file, which is memory mapped, or of a chunked compressed .coco file
+    """
+
+    def __init__(self, filename: str, dtype=None):
+        """
+
+        :param dtype: data type of a raw file, derived from the file extension if not given
+        """
+        self.filename = filename
+        self.dtype = IQArray.get_dtype_for_filename(filename) if dtype is None else np.dtype(dtype)
+        self.__samples = None
+        self.__open()
+
+    def __getstate__(self):
+        return {"filename": self.filename, "dtype": self.dtype}
+
+    def __setstate__(self, state):
+        self.__init__(state["filename"], state["dtype"])
+
+    def __len__(self):
+        return len(self.__samples)
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        if isinstance(self.__samples, CompressedIQFile):
+            return self.__samples.read(start, stop)
+        return np.asarray(self.__samples[start:stop])
+
+    def __open(self):
+        if CompressedIQFile.is_chunked_file(self.filename):
+            self.__samples = CompressedIQFile(self.filename)
+            self.dtype = self.__samples.dtype
+        else:
+            self.__samples = np.memmap(self.filename, dtype=self.dtype, mode="r").reshape((-1, 2))
+
+
+class GeneratorSampleSource(SampleSource):
+    """
+    Samples that are produced on demand, e.g. by modulating message after message.
+
+    The generator function is called with the given arguments and must return an iterable of IQ chunks.
+    It is called again if samples are read from the beginning, e.g. for a repetition,
+    so it must be picklable like a module level function.
+    If the generator ends before num_samples are produced, the rest is filled with zeros.
+    """
+
+    def __init__(self, generator_function: callable, num_samples: int, *args, dtype=np.float32):
+        """
+
+        :param num_samples: total number of samples the generator produces
+        :param dtype: data type of the zeros used for filling
+        """
+        self.generator_function = generator_function
+        self.num_samples = num_samples
+        self.args = args
+        self.dtype = np.dtype(dtype)
+
+        self.__iterator = None
+        self.__buffer = np.empty((0, 2), dtype=self.dtype)
+        self.__buffer_start = 0  # sample index of the first sample in buffer
+
+    def __getstate__(self):
+        return {"generator_function": self.generator_function, "num_samples": self.num_samples,
+                "args": self.args, "dtype": self.dtype}
+
+    def __setstate__(self, state):
+        self.__init__(state["generator_function"], state["num_samples"], *state["args"], dtype=state["dtype"])
+
+    def __len__(self):
+        return self.num_samples
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        start, stop = max(0, start), min(stop, self.num_samples)
+        if self.__iterator is None or start < self.__buffer_start:
+            self.__restart()
+
+        parts = []
+        pos = start
+        while pos < stop:
+            buffer_end = self.__buffer_start + len(self.__buffer)
+            if pos >= buffer_end:
+                # Samples before pos are skipped, if they were not requested
+                self.__buffer = self.__next_chunk(stop - buffer_end)
+                self.__buffer_start = buffer_end
+                continue
+
+            part = self.__buffer[pos - self.__buffer_start:stop - self.__buffer_start]
+            parts.append(part)
+            pos += len(part)
+
+        if len(parts) == 0:
+            return np.empty((0, 2), dtype=self.dtype)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def __restart(self):
+        self.__iterator = iter(self.generator_function(*self.args))
+        self.__buffer = np.empty((0, 2), dtype=self.dtype)
+        self.__buffer_start = 0
+
+    def __next_chunk(self, num_missing: int) -> np.ndarray:
+        for chunk in self.__iterator:
+            chunk = chunk.data if isinstance(chunk, IQArray) else IQArray.convert_array_to_iq(np.asarray(chunk))
+            if len(chunk) > 0:
+                return chunk
+        return np.zeros((num_missing, 2), dtype=self.dtype)
@@ -217,6 +217,21 @@ class VirtualDevice(QObject):
         if self.backend == Backends.native:
             self.__dev.apply_dc_correction = bool(value)
 
+    @property
+    def recording_sink(self):
+        if self.backend == Backends.native:
+            return self.__dev.recording_sink
+        else:
+            return None
+
+    @recording_sink.setter
+    def recording_sink(self, value):
+        if self.backend == Backends.native:
+            self.__dev.recording_sink = value
+        else:
+            logger.warning("{}:{} does not support recording to disk".format(self.__class__.__name__,
+                                                                           self.backend.name))
+
     @property
     def bias_tee_enabled(self):
         if self.backend_is_native:
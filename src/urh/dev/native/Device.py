@@ -10,10 +10,13 @@ import numpy as np
 from urh.util.Formatter import Formatter
 
 from urh import settings
+from urh.dev.RecordingSink import RecordingSink
+from urh.dev.SampleSource import SampleSource, ArraySampleSource
 from urh.dev.native.SendConfig import SendConfig
 from urh.signalprocessing.IQArray import IQArray
 from urh.util import util
 from urh.util.Logger import logger
+from urh.util.SharedMemoryRing import SharedMemoryRing
 
 # set shared library path when processes spawn so they can also find the .so's in bundled case
 util.set_shared_library_path()
@@ -21,6 +24,10 @@ util.set_shared_library_path()
 
 class Device(object):
     JOIN_TIMEOUT = 1.0
+    # The shared memory ring for received samples buffers this many seconds of samples within the size limits
+    RECEIVE_RING_SECONDS = 1
+    RECEIVE_RING_MIN_SIZE = 4 * 1024 ** 2
+    RECEIVE_RING_MAX_SIZE = 64 * 1024 ** 2
 
     SYNC_TX_CHUNK_SIZE = 0
     CONTINUOUS_TX_CHUNK_SIZE = 0
@@ -271,7 +278,6 @@ class Device(object):
 
         self.parent_data_conn, self.child_data_conn = Pipe(duplex=False)
         self.parent_ctrl_conn, self.child_ctrl_conn = Pipe()
-        self.send_buffer = None
         self.send_buffer_reader = None
 
         self.device_serial = None
@@ -288,6 +294,8 @@ class Device(object):
         self.device_ip = "192.168.10.2"  # For USRP and RTLSDRTCP
 
         self.receive_buffer = None
+        self.receive_ring = None  # type: SharedMemoryRing
+        self.recording_sink = None  # type: RecordingSink # Streams received samples to disk if set
 
         self.spectrum_x = None
         self.spectrum_y = None
@@ -334,20 +342,40 @@ class Device(object):
                             (self.Command.SET_BB_GAIN.name, self.baseband_gain),
                             ("identifier", self.device_serial)])
 
+    @property
+    def sample_source(self) -> SampleSource:
+        if isinstance(self.samples_to_send, SampleSource):
+            return self.samples_to_send
+        elif self.samples_to_send is None:
+            return ArraySampleSource(np.empty((0, 2), dtype=self.DATA_TYPE))
+        else:
+            return ArraySampleSource(self.samples_to_send)
+
     @property
     def send_config(self) -> SendConfig:
+        sample_source = self.sample_source
         if self.num_samples_to_send is None:
-            total_samples = len(self.send_buffer)
+            total_samples = 2 * len(sample_source)
         else:
             total_samples = 2 * self.num_samples_to_send
-        return SendConfig(self.send_buffer, self._current_sent_sample, self._current_sending_repeat,
+        return SendConfig(sample_source, self._current_sent_sample, self._current_sending_repeat,
                           total_samples, self.sending_repeats, continuous=self.sending_is_continuous,
                           iq_to_bytes_method=self.iq_to_bytes,
-                          continuous_send_ring_buffer=self.continuous_send_ring_buffer)
+                          continuous_send_ring_buffer=self.continuous_send_ring_buffer,
+                          data_type=self.DATA_TYPE)
 
     @property
     def receive_process_arguments(self):
-        return self.child_data_conn, self.child_ctrl_conn, self.device_parameters
+        return self.receive_data_connection, self.child_ctrl_conn, self.device_parameters
+
+    @property
+    def receive_data_connection(self):
+        """
+        Connection the receive process sends samples to:
+        the shared memory ring if it is available, otherwise the data pipe
+
+        """
+        return self.receive_ring if self.receive_ring is not None else self.child_data_conn
 
     @property
     def send_process_arguments(self):
@@ -574,10 +602,31 @@ class Device(object):
         except (BrokenPipeError, OSError):
             pass
 
+    def get_receive_ring_size(self) -> int:
+        """
+        Size of the shared memory ring for the current sample rate,
+        using at most half of the free shared memory, as e.g. Docker only provides 64 MiB by default
+        """
+        bytes_per_second = 2 * np.dtype(self.DATA_TYPE).itemsize * self.sample_rate
+        size = int(min(max(self.RECEIVE_RING_SECONDS * bytes_per_second, self.RECEIVE_RING_MIN_SIZE),
+                       self.RECEIVE_RING_MAX_SIZE))
+        free_memory = SharedMemoryRing.get_free_memory()
+        if free_memory is not None:
+            size = min(size, free_memory // 2)
+        return size
+
     def start_rx_mode(self):
         self.init_recv_buffer()
         self.parent_data_conn, self.child_data_conn = Pipe(duplex=False)
         self.parent_ctrl_conn, self.child_ctrl_conn = Pipe()
+        try:
+            ring_size = self.get_receive_ring_size()
+            if ring_size < self.RECEIVE_RING_MIN_SIZE:
+                raise OSError("Only {} bytes of shared memory are free".format(2 * ring_size))
+            self.receive_ring = SharedMemoryRing(ring_size)
+        except OSError as e:
+            logger.warning("Could not create shared memory ring, receiving through pipe: {}".format(e))
+            self.receive_ring = None
 
         self.is_receiving = True
         logger.info("{0}: Starting RX Mode".format(self.__class__.__name__))
@@ -608,6 +657,11 @@ class Device(object):
                 self.receive_process.join()
 
         self.is_receiving = False
+        if self.recording_sink is not None and hasattr(self, "read_recv_buffer_thread") \
+                and self.read_recv_buffer_thread is not threading.current_thread():
+            # Ensure no samples are passed to the recording after stopping, so it can be closed safely
+            self.read_recv_buffer_thread.join(self.JOIN_TIMEOUT)
+
         for connection in (self.parent_ctrl_conn, self.parent_data_conn, self.child_ctrl_conn, self.child_data_conn):
             try:
                 connection.close()
@@ -681,9 +735,17 @@ class Device(object):
         logger.debug("Exiting read device errors thread")
 
     def read_receiving_queue(self):
+        # The ring is closed by this thread when it ends, so a new receive session can not interfere with it
+        ring = self.receive_ring
         while self.is_receiving:
             try:
-                byte_buffer = self.parent_data_conn.recv_bytes()
+                if ring is not None:
+                    # A view of the ring, so the samples are only copied once into the receive buffer
+                    byte_buffer = ring.recv_view(timeout=0.1)
+                    if byte_buffer is None:
+                        continue
+                else:
+                    byte_buffer = self.parent_data_conn.recv_bytes()
                 samples = self.bytes_to_iq(byte_buffer)
                 n_samples = len(samples)
                 if n_samples == 0:
@@ -699,37 +761,46 @@ class Device(object):
                 logger.info("EOF Error: Ending receive thread")
                 break
 
+            if ring is not None and ring.num_dropped > 0:
+                logger.warning("{}: Receive ring overrun, dropped {} chunks".format(self.__class__.__name__,
+                                                                                   ring.num_dropped))
+                self.device_messages.append("{}: Dropped {} chunks of received samples as processing did not keep "
+                                            "up".format(self.__class__.__name__, ring.num_dropped))
+                ring.num_dropped = 0
+
+            if self.recording_sink is not None:
+                self.recording_sink.write(samples)
+
             if self.current_recv_index + n_samples >= len(self.receive_buffer):
-                if self.resume_on_full_receive_buffer:
+                # When recording to disk, the receive buffer only holds the latest samples
+                if self.resume_on_full_receive_buffer or self.recording_sink is not None:
                     self.current_recv_index = 0
                     if n_samples >= len(self.receive_buffer):
                         n_samples = len(self.receive_buffer) - 1
                 else:
+                    del samples, byte_buffer
                     self.stop_rx_mode(
                         "Receiving buffer is full {0}/{1}".format(self.current_recv_index + n_samples,
                                                                   len(self.receive_buffer)))
-                    return
+                    break
 
             self.receive_buffer[self.current_recv_index:self.current_recv_index + n_samples] = samples[:n_samples]
             self.current_recv_index += n_samples
 
+        if ring is not None:
+            samples = byte_buffer = None
+            ring.close()
+
         logger.debug("Exiting read_receive_queue thread.")
 
-    def init_send_parameters(self, samples_to_send: IQArray = None, repeats: int = None, resume=False):
-        if samples_to_send is not None:
-            if isinstance(samples_to_send, IQArray):
-                samples_to_send = samples_to_send.convert_to(self.DATA_TYPE)
-            else:
-                samples_to_send = IQArray(samples_to_send).convert_to(self.DATA_TYPE)
+    def init_send_parameters(self, samples_to_send=None, repeats: int = None, resume=False):
+        """
 
+        :param samples_to_send: IQArray, numpy array or SampleSource. Samples are not converted here,
+                                but chunkwise by the send process, so no copy of the whole sequence is needed.
+        """
+        if samples_to_send is not None:
             self.samples_to_send = samples_to_send
-            self.send_buffer = None
-
-        if self.send_buffer is None:
-            if isinstance(self.samples_to_send, IQArray):
-                self.send_buffer = self.iq_to_bytes(self.samples_to_send.data)
-            else:
-                self.send_buffer = self.iq_to_bytes(self.samples_to_send)
         elif not resume:
             self.current_sending_repeat = 0
 
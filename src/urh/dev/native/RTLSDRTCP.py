@@ -1,14 +1,17 @@
-import select
 import socket
 
 import numpy as np
 
 from urh.dev.native.Device import Device
 from urh.util.Logger import logger
+from urh.util.SocketReader import SocketReader
 
 
 class RTLSDRTCP(Device):
-    MAXDATASIZE = 65536
+    # Samples are read into a ring of preallocated buffers of READ_SIZE bytes, which is ~50ms at 2.4 MSps
+    READ_SIZE = 2 ** 18
+    NUM_READ_BUFFERS = 4
+    HEADER_SIZE = 12
     ENDIAN = "big"
     RTL_TCP_CONSTS = ["NULL", "centerFreq", "sampleRate", "tunerGainMode", "tunerGain", "freqCorrection", "tunerIFGain",
                       "testMode", "agcMode", "directSampling", "offsetTuning", "rtlXtalFreq", "tunerXtalFreq",
@@ -37,12 +40,18 @@ class RTLSDRTCP(Device):
             while not exit_requested:
                 while ctrl_connection.poll():
                     result = sdr.process_command(ctrl_connection.recv(), ctrl_connection)
-                    if result == "stop":
+                    if result == RTLSDRTCP.Command.STOP:
                         exit_requested = True
                         break
 
                 if not exit_requested:
-                    data_connection.send_bytes(sdr.read_sync())
+                    data = sdr.read_sync()
+                    if len(data) > 0:
+                        data_connection.send_bytes(data)
+                    elif sdr.reader.is_closed:
+                        # The socket stays readable after rtl_tcp closed it, so stop instead of polling it endlessly
+                        ctrl_connection.send("rtl_tcp closed the connection:1")
+                        exit_requested = True
 
             logger.debug("RTLSDRTCP: closing device")
             sdr.close()
@@ -96,10 +105,11 @@ class RTLSDRTCP(Device):
         self.device_number = device_number
         self.socket_is_open = False
         self.success = 0
+        self.reader = None  # type: SocketReader
 
     @property
     def receive_process_arguments(self):
-        return self.child_data_conn, self.child_ctrl_conn, self.device_number, self.frequency, self.sample_rate, \
+        return self.receive_data_connection, self.child_ctrl_conn, self.device_number, self.frequency, self.sample_rate, \
                self.bandwidth, self.gain, self.freq_correction, self.direct_sampling_mode, self.device_ip, self.port
 
     def open(self, ctrl_connection, hostname="127.0.0.1", port=1234):
@@ -108,6 +118,8 @@ class RTLSDRTCP(Device):
                 # Create socket and connect
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
                 # self.sock.settimeout(1.0)  # Timeout 1s
+                # Buffer some reads in the kernel, so short stalls of the receive process do not stall rtl_tcp
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.NUM_READ_BUFFERS * self.READ_SIZE)
                 self.sock.connect((hostname, port))
             except Exception as e:
                 self.socket_is_open = False
@@ -116,11 +128,10 @@ class RTLSDRTCP(Device):
                 return False
 
             try:
-                # Receive rtl_tcp initial data
-                init_data = self.sock.recv(self.MAXDATASIZE)
+                # Receive rtl_tcp initial data. Samples may follow in the same segment, so read the header only
+                self.reader = SocketReader(self.sock, self.READ_SIZE, self.NUM_READ_BUFFERS, alignment=2)
+                init_data = bytes(self.reader.read_exactly(self.HEADER_SIZE))
 
-                if len(init_data) != 12:
-                    return False
                 if init_data[0:4] != b'RTL0':
                     return False
 
@@ -181,11 +192,13 @@ class RTLSDRTCP(Device):
         return False
 
     def read_sync(self):
-        s_read, _, _ = select.select([self.sock], [], [], .1)
-        if self.sock in s_read:
-            return self.sock.recv(self.MAXDATASIZE)
-        else:
-            return b''
+        """
+        Read the available samples without copying them.
+        The returned view is valid until NUM_READ_BUFFERS - 1 further reads.
+
+        :return: view of interleaved I/Q bytes, which is empty if no samples arrived within 100ms
+        """
+        return self.reader.read(timeout=.1)
 
     @staticmethod
     def bytes_to_iq(buffer):
@@ -2,14 +2,17 @@ from multiprocessing import Value
 
 import numpy as np
 
+from urh.dev.SampleSource import SampleSource
+from urh.signalprocessing.IQArray import IQArray
 from urh.util.RingBuffer import RingBuffer
 
 
 class SendConfig(object):
-    def __init__(self, send_buffer, current_sent_index: Value, current_sending_repeat: Value,
+    def __init__(self, sample_source: SampleSource, current_sent_index: Value, current_sending_repeat: Value,
                  total_samples: int, sending_repeats: int, continuous: bool = False,
-                 iq_to_bytes_method: callable = None, continuous_send_ring_buffer: RingBuffer = None):
-        self.send_buffer = send_buffer
+                 iq_to_bytes_method: callable = None, continuous_send_ring_buffer: RingBuffer = None,
+                 data_type=np.float32):
+        self.sample_source = sample_source
         self.current_sent_index = current_sent_index
         self.current_sending_repeat = current_sending_repeat
         self.total_samples = total_samples
@@ -17,26 +20,44 @@ class SendConfig(object):
         self.continuous = continuous
         self.iq_to_bytes_method = iq_to_bytes_method
         self.continuous_send_ring_buffer = continuous_send_ring_buffer
+        self.data_type = data_type
+        self.__empty_data = None
+        self.__pop_buffer = None
 
     def get_data_to_send(self, buffer_length: int):
         try:
             if self.sending_is_finished():
-                return np.zeros(1, dtype=self.send_buffer._type_._type_)
+                return self.empty_data
 
             if self.continuous:
-                result = self.iq_to_bytes_method(self.continuous_send_ring_buffer.pop(buffer_length // 2))
-                if len(result) == 0:
-                    # avoid empty arrays which will not work with cython API
-                    return np.zeros(1, dtype=self.send_buffer._type_._type_)
+                n = self.continuous_send_ring_buffer.pop_into(self.__get_pop_buffer(buffer_length // 2))
+                result = self.iq_to_bytes_method(self.__pop_buffer[:n])
             else:
-                index = self.current_sent_index.value
-                np_view = np.frombuffer(self.send_buffer, dtype=self.send_buffer._type_._type_)
-                result = np_view[index:index + buffer_length]
+                # Only the chunk to send is read and converted to the data type of the device
+                start = self.current_sent_index.value // 2
+                samples = self.sample_source.read(start, start + buffer_length // 2)
+                result = self.iq_to_bytes_method(IQArray(samples, skip_conversion=True).convert_to(self.data_type))
+
+            if len(result) == 0:
+                # avoid empty arrays which will not work with cython API
+                return self.empty_data
 
             self.progress_send_status(len(result))
             return result
         except (BrokenPipeError, EOFError):
-            return np.zeros(1, dtype=self.send_buffer._type_._type_)
+            return self.empty_data
+
+    @property
+    def empty_data(self):
+        if self.__empty_data is None:
+            self.__empty_data = self.iq_to_bytes_method(np.zeros((1, 2), dtype=self.data_type))
+        return self.__empty_data
+
+    def __get_pop_buffer(self, num_samples: int) -> np.ndarray:
+        # Reuse the buffer for values popped from the ring buffer, as it is called for every chunk
+        if self.__pop_buffer is None or len(self.__pop_buffer) < num_samples:
+            self.__pop_buffer = np.empty((num_samples, 2), dtype=self.continuous_send_ring_buffer.dtype)
+        return self.__pop_buffer[:num_samples]
 
     def sending_is_finished(self):
         if self.sending_repeats == 0:  # 0 = infinity
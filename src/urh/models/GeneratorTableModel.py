@@ -39,26 +39,21 @@ class GeneratorTableModel(TableModel):
 
         self.data_edited.connect(self.on_data_edited)
 
-    def refresh_fonts(self):
-        self.italic_fonts.clear()
-        self.bold_fonts.clear()
-        self.text_colors.clear()
-        pac = self.protocol
-        assert isinstance(pac, ProtocolAnalyzerContainer)
-        for i, message in enumerate(pac.messages):
-            if message.fuzz_created:
-                for lbl in (lbl for lbl in message.message_type if lbl.fuzz_created):
-                    for j in range(*message.get_label_range(lbl=lbl, view=self.proto_view, decode=False)):
-                        self.bold_fonts[i, j] = True
-
-            for lbl in message.active_fuzzing_labels:
+    def refresh_fonts_for_row(self, row: int):
+        message = self.protocol.messages[row]
+        if message.fuzz_created:
+            for lbl in (lbl for lbl in message.message_type if lbl.fuzz_created):
                 for j in range(*message.get_label_range(lbl=lbl, view=self.proto_view, decode=False)):
-                    self.bold_fonts[i, j] = True
-                    self.text_colors[i, j] = QColor("orange")
+                    self.bold_fonts[row, j] = True
+
+        for lbl in message.active_fuzzing_labels:
+            for j in range(*message.get_label_range(lbl=lbl, view=self.proto_view, decode=False)):
+                self.bold_fonts[row, j] = True
+                self.text_colors[row, j] = QColor("orange")
 
-            for lbl in (lbl for lbl in message.message_type if isinstance(lbl, ChecksumLabel)):
-                if lbl not in self.edited_checksum_labels_by_row[i] and not lbl.fuzz_created:
-                    self.__set_italic_font_for_label_range(row=i, label=lbl, italic=True)
+        for lbl in (lbl for lbl in message.message_type if isinstance(lbl, ChecksumLabel)):
+            if lbl not in self.edited_checksum_labels_by_row[row] and not lbl.fuzz_created:
+                self.__set_italic_font_for_label_range(row=row, label=lbl, italic=True)
 
     def delete_range(self, msg_start: int, msg_end: int, index_start: int, index_end: int):
         if msg_start > msg_end:
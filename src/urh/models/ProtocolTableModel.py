@@ -1,9 +1,7 @@
-from collections import defaultdict
-
 from PyQt5.QtCore import pyqtSignal, QModelIndex, Qt
 
 from urh import settings
-from urh.models.TableModel import TableModel
+from urh.models.TableModel import TableModel, DifferenceMask
 from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
 from urh.ui.actions.DeleteBitsAndPauses import DeleteBitsAndPauses
 
@@ -20,7 +18,7 @@ class ProtocolTableModel(TableModel):
         self.active_group_ids = [0]
 
     @property
-    def diff_columns(self) -> defaultdict(set):
+    def diff_columns(self) -> DifferenceMask:
         return self._diffs
 
     @property
@@ -34,17 +32,10 @@ class ProtocolTableModel(TableModel):
             self.update()
             self.ref_index_changed.emit(self._refindex)
 
-    def refresh_fonts(self):
-        self.bold_fonts.clear()
-        self.text_colors.clear()
-        for i in self._diffs.keys():
-            for j in self._diffs[i]:
-                self.bold_fonts[i, j] = True
-                self.text_colors[i, j] = settings.DIFFERENCE_CELL_COLOR
-
-        if self._refindex >= 0:
+    def refresh_fonts_for_row(self, row: int):
+        if row == self._refindex:
             for j in range(self.col_count):
-                self.text_colors[self._refindex, j] = settings.SELECTED_ROW_COLOR
+                self.text_colors[row, j] = settings.SELECTED_ROW_COLOR
 
     def delete_range(self, min_row: int, max_row: int, start: int, end: int):
         if not self.is_writeable:
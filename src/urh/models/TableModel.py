@@ -1,7 +1,9 @@
 import array
 import math
+import re
 from collections import defaultdict
 
+import numpy as np
 from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QColor
 from PyQt5.QtWidgets import QUndoStack
@@ -9,11 +11,103 @@ from PyQt5.QtWidgets import QUndoStack
 from urh import settings
 from urh.signalprocessing.ChecksumLabel import ChecksumLabel
 from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
+from urh.signalprocessing.ProtocolSearchIndex import ProtocolSearchIndex
 from urh.ui.actions.InsertColumn import InsertColumn
 from urh.util import util
 from urh.util.Logger import logger
 
 
+class DisplayData(list):
+    """
+    Bits, hex or ascii symbols of the messages of a protocol with one entry per message.
+    A row is converted on first access together with the other rows of its block,
+    so for large protocols only the rows that get shown are converted.
+    """
+
+    BLOCK_SIZE = 1000
+
+    def __init__(self, protocol: ProtocolAnalyzer, view: int, decoded: bool):
+        super().__init__([None] * len(protocol.messages))
+        self.protocol = protocol
+        self.view = view
+        self.decoded = decoded
+
+    def __getitem__(self, index):
+        value = super().__getitem__(index)
+        if value is None and not isinstance(index, slice):
+            self.__convert_block(index if index >= 0 else index + len(self))
+            value = super().__getitem__(index)
+        return value
+
+    def __convert_block(self, row: int):
+        start = row - row % self.BLOCK_SIZE
+        end = min(start + self.BLOCK_SIZE, len(self))
+        view_arrays = self.protocol.get_view_arrays(self.view, decoded=self.decoded,
+                                                    messages=self.protocol.messages[start:end])
+        for i, view_array in enumerate(view_arrays, start=start):
+            if super().__getitem__(i) is None:
+                self[i] = view_array
+
+
+class DifferenceMask(object):
+    """
+    Columns in which the rows of a table model differ from its reference row.
+    The columns are stored as packed bitmask per row, so a single cell can be queried in O(1).
+    The masks of a block of rows are computed at once when the first row of the block gets queried.
+    """
+
+    BLOCK_SIZE = DisplayData.BLOCK_SIZE
+
+    def __init__(self, model):
+        self.model = model  # type: TableModel
+        self.__masks = dict()  # type: dict[int, np.ndarray]
+
+    def clear(self):
+        self.__masks.clear()
+
+    def __getitem__(self, row: int) -> np.ndarray:
+        """
+        :return: packed bitmask of the columns in which the given row differs from the reference row
+        """
+        try:
+            return self.__masks[row]
+        except KeyError:
+            start = row - row % self.BLOCK_SIZE
+            end = min(start + self.BLOCK_SIZE, len(self.model.display_data or []))
+            masks = np.packbits(self.model.get_difference_matrix(self.model._refindex, range(start, end)), axis=1)
+            for i, mask in enumerate(masks, start=start):
+                self.__masks.setdefault(i, mask)
+            return self.__masks.get(row, np.empty(0, dtype=np.uint8))
+
+    def is_different(self, row: int, column: int) -> bool:
+        if self.model._refindex < 0 or column < 0:
+            return False
+
+        mask = self[row]
+        return (column >> 3) < len(mask) and bool(mask[column >> 3] & (128 >> (column & 7)))
+
+    def columns(self, row: int) -> np.ndarray:
+        """
+        :return: indices of the columns in which the given row differs from the reference row
+        """
+        if self.model._refindex < 0:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(np.unpackbits(self[row]))
+
+    def columns_of_rows(self, rows) -> set:
+        """
+        :return: indices of the columns in which any of the given rows differs from the reference row
+        """
+        masks = [self[row] for row in rows] if self.model._refindex >= 0 else []
+        if len(masks) == 0:
+            return set()
+
+        result = np.zeros(max(len(mask) for mask in masks), dtype=np.uint8)
+        for mask in masks:
+            result[:len(mask)] |= mask
+        return set(np.flatnonzero(np.unpackbits(result)).tolist())
+
+
 class TableModel(QAbstractTableModel):
     ALIGNMENT_CHAR = " "
 
@@ -27,10 +121,13 @@ class TableModel(QAbstractTableModel):
 
         self.col_count = 0
         self.row_count = 0
-        self.display_data = None  # type: list[str]
+        self.display_data = None  # type: DisplayData
+        self.row_widths = np.empty(0, dtype=np.int64)  # number of columns each row needs including alignment
 
-        self.search_results = []
+        self.search_results = []  # type: list[tuple[int, int, int]]
         self.search_value = ""
+        self.search_regex = False
+        self.search_index = None  # type: ProtocolSearchIndex
         self._proto_view = 0
         self._refindex = -1
 
@@ -47,8 +144,13 @@ class TableModel(QAbstractTableModel):
         self.text_colors = defaultdict(lambda: None)
         self.vertical_header_text = defaultdict(lambda: None)
         self.vertical_header_colors = defaultdict(lambda: None)
+        self.vertical_header_uses_colors = False
 
-        self._diffs = defaultdict(set)  # type: dict[int, set[int]]
+        # Background colors and fonts are cached lazily for rows that get displayed
+        self.__bgcolor_rows = set()
+        self.__font_rows = set()
+
+        self._diffs = DifferenceMask(self)
 
         self.undo_stack = QUndoStack()
 
@@ -72,8 +174,6 @@ class TableModel(QAbstractTableModel):
     @proto_view.setter
     def proto_view(self, value):
         self._proto_view = value
-        if self._refindex >= 0:
-            self._diffs = self.find_differences(self._refindex)
         self.update()
 
     def get_alignment_offset_at(self, index: int):
@@ -95,6 +195,7 @@ class TableModel(QAbstractTableModel):
             msg = self.protocol.messages[row]
             self.display_data[
                 row] = msg.plain_bits if self.proto_view == 0 else msg.plain_hex_array if self.proto_view == 1 else msg.plain_ascii_array
+            self.row_widths[row] = max(self.row_widths[row], len(self.display_data[row]) + self.get_alignment_offset_at(row))
         except IndexError:
             return False
 
@@ -102,6 +203,9 @@ class TableModel(QAbstractTableModel):
 
     def headerData(self, section: int, orientation, role=Qt.DisplayRole):
         if orientation == Qt.Vertical:
+            if section not in self.vertical_header_text and 0 <= section < self.row_count:
+                self.refresh_vertical_header_for_row(section)
+
             if role == Qt.DisplayRole:
                 return self.vertical_header_text[section]
             elif role == Qt.BackgroundColorRole:
@@ -120,50 +224,93 @@ class TableModel(QAbstractTableModel):
         self.locked = True
 
         if self.protocol.num_messages > 0:
-            if self.decode:
-                if self.proto_view == 0:
-                    self.display_data = [msg.decoded_bits for msg in self.protocol.messages]
-                elif self.proto_view == 1:
-                    self.display_data = [msg.decoded_hex_array for msg in self.protocol.messages]
-                elif self.proto_view == 2:
-                    self.display_data = [msg.decoded_ascii_array for msg in self.protocol.messages]
-            else:
-                # Generator Model
-                if self.proto_view == 0:
-                    self.display_data = [msg.plain_bits for msg in self.protocol.messages]
-                elif self.proto_view == 1:
-                    self.display_data = [msg.plain_hex_array for msg in self.protocol.messages]
-                else:
-                    self.display_data = [msg.plain_ascii_array for msg in self.protocol.messages]
-
-            visible_messages = [msg for i, msg in enumerate(self.display_data) if i not in self.hidden_rows]
-            if len(visible_messages) == 0:
-                self.col_count = 0
-            else:
-                self.col_count = max(len(msg) + self.get_alignment_offset_at(i)
-                                     for i, msg in enumerate(self.display_data) if i not in self.hidden_rows)
-
-            if self._refindex >= 0:
-                self._diffs = self.find_differences(self._refindex)
-            else:
-                self._diffs.clear()
+            # Display data, colors, fonts and differences are computed lazily for the rows that get shown
+            self.display_data = DisplayData(self.protocol, self.proto_view, decoded=self.decode)
+            self.row_widths = self.__get_row_widths(self.protocol.messages)
+            self.col_count = self.__get_col_count()
+            self._diffs.clear()
+            self.search_index = None
 
             self.row_count = self.protocol.num_messages
-            self.find_protocol_value(self.search_value)
+            self.find_protocol_value(self.search_value, self.search_regex)
         else:
             self.col_count = 0
             self.row_count = 0
             self.display_data = None
+            self.row_widths = np.empty(0, dtype=np.int64)
+            self._diffs.clear()
+            self.search_index = None
 
-        # Cache background colors for performance
         self.refresh_bgcolors()
-        self.refresh_fonts()  # Will be overridden
+        self.refresh_fonts()
         self.refresh_vertical_header()
 
         self.beginResetModel()
         self.endResetModel()
         self.locked = False
 
+    def append_rows(self):
+        """
+        Fast path for messages that were appended to the end of the protocol, e.g. during live sniffing.
+        In contrast to update, only the new rows are inserted instead of resetting the whole model.
+        """
+        if self.display_data is None or len(self.display_data) > len(self.protocol.messages):
+            self.update()
+            return
+
+        messages = self.protocol.messages[len(self.display_data):]
+        if len(messages) == 0:
+            return
+
+        self.locked = True
+        widths = self.__get_row_widths(messages)
+        num_rows = sum(1 for msg in messages if msg)
+        first_row = len(self.display_data)
+
+        if num_rows > 0:
+            self.beginInsertRows(QModelIndex(), self.row_count, self.row_count + num_rows - 1)
+        self.display_data.extend([None] * len(messages))
+        self.row_widths = np.append(self.row_widths, widths)
+        self.row_count += num_rows
+        if num_rows > 0:
+            self.endInsertRows()
+
+        col_count = max(self.col_count, int(widths.max()))
+        if col_count > self.col_count:
+            self.beginInsertColumns(QModelIndex(), self.col_count, col_count - 1)
+            self.col_count = col_count
+            self.endInsertColumns()
+            # Fonts may span all columns e.g. for reference message
+            self.refresh_fonts()
+
+        if self.search_value:
+            self.search_results.extend(self.search_rows(self.search_value, self.search_regex, first_row))
+
+        if not self.vertical_header_uses_colors and any(msg.participant for msg in messages):
+            self.vertical_header_uses_colors = True
+            self.vertical_header_color_status_changed.emit(True)
+
+        self.locked = False
+
+    def __get_row_widths(self, messages) -> np.ndarray:
+        lengths = self.protocol.get_view_lengths(self.proto_view, decoded=self.decode, messages=messages)
+        f = 1 if self.proto_view == 0 else 4 if self.proto_view == 1 else 8
+        offsets = np.fromiter((msg.alignment_offset for msg in messages), dtype=np.int64, count=len(messages))
+        return lengths + (offsets + f - 1) // f
+
+    def __get_col_count(self) -> int:
+        if len(self.row_widths) == 0:
+            return 0
+
+        if self.hidden_rows:
+            visible = np.ones(len(self.row_widths), dtype=bool)
+            visible[[i for i in self.hidden_rows if i < len(visible)]] = False
+            widths = self.row_widths[visible]
+        else:
+            widths = self.row_widths
+
+        return int(widths.max()) if len(widths) > 0 else 0
+
     def insert_column(self, index: int, rows: list):
         if self.protocol is None or not self.is_writeable:
             return
@@ -178,18 +325,35 @@ class TableModel(QAbstractTableModel):
         return self.row_count
 
     def refresh_bgcolors(self):
+        """
+        Invalidate the cached background colors, they are recomputed when the rows are shown
+
+        """
         self.background_colors.clear()
+        self.__bgcolor_rows.clear()
+
+    def refresh_bgcolors_for_row(self, row: int):
         label_colors = settings.LABEL_COLORS
+        message = self.protocol.messages[row]
+        a = self.get_alignment_offset_at(row)
 
-        for i, message in enumerate(self.protocol.messages):
-            for lbl in message.message_type:
-                bg_color = label_colors[lbl.color_index]
-                a = self.get_alignment_offset_at(i)
-                start, end = message.get_label_range(lbl, self.proto_view, self.decode)
-                for j in range(start, end):
-                    self.background_colors[i, j + a] = bg_color
+        for lbl in message.message_type:
+            bg_color = label_colors[lbl.color_index]
+            start, end = message.get_label_range(lbl, self.proto_view, self.decode)
+            for j in range(start, end):
+                self.background_colors[row, j + a] = bg_color
 
     def refresh_fonts(self):
+        """
+        Invalidate the cached fonts, they are recomputed when the rows are shown
+
+        """
+        self.bold_fonts.clear()
+        self.italic_fonts.clear()
+        self.text_colors.clear()
+        self.__font_rows.clear()
+
+    def refresh_fonts_for_row(self, row: int):
         """
         Will be overridden
 
@@ -197,23 +361,33 @@ class TableModel(QAbstractTableModel):
         """
         pass
 
+    def __ensure_row_formatted(self, row: int, fonts: bool):
+        rows = self.__font_rows if fonts else self.__bgcolor_rows
+        if row in rows or not 0 <= row < len(self.protocol.messages):
+            return
+
+        rows.add(row)
+        if fonts:
+            self.refresh_fonts_for_row(row)
+        else:
+            self.refresh_bgcolors_for_row(row)
+
     def refresh_vertical_header(self):
         self.vertical_header_colors.clear()
         self.vertical_header_text.clear()
-        use_colors = False
-        for i in range(self.row_count):
-            try:
-                participant = self.protocol.messages[i].participant
-            except IndexError:
-                participant = None
-            if participant:
-                self.vertical_header_text[i] = "{0} ({1})".format(i + 1, participant.shortname)
-                self.vertical_header_colors[i] = settings.PARTICIPANT_COLORS[participant.color_index]
-                use_colors = True
-            else:
-                self.vertical_header_text[i] = str(i + 1)
+        self.vertical_header_uses_colors = any(msg.participant for msg in self.protocol.messages[:self.row_count])
+        self.vertical_header_color_status_changed.emit(self.vertical_header_uses_colors)
 
-        self.vertical_header_color_status_changed.emit(use_colors)
+    def refresh_vertical_header_for_row(self, row: int):
+        try:
+            participant = self.protocol.messages[row].participant
+        except IndexError:
+            participant = None
+        if participant:
+            self.vertical_header_text[row] = "{0} ({1})".format(row + 1, participant.shortname)
+            self.vertical_header_colors[row] = settings.PARTICIPANT_COLORS[participant.color_index]
+        else:
+            self.vertical_header_text[row] = str(row + 1)
 
     def data(self, index: QModelIndex, role=Qt.DisplayRole):
         if not index.isValid():
@@ -243,15 +417,20 @@ class TableModel(QAbstractTableModel):
                 return Qt.AlignCenter
 
         elif role == Qt.BackgroundColorRole:
+            self.__ensure_row_formatted(i, fonts=False)
             return self.background_colors[i, j]
 
         elif role == Qt.FontRole:
+            self.__ensure_row_formatted(i, fonts=True)
             font = QFont()
-            font.setBold(self.bold_fonts[i, j])
+            font.setBold(self.bold_fonts[i, j] or self._diffs.is_different(i, j))
             font.setItalic(self.italic_fonts[i, j])
             return font
 
         elif role == Qt.TextColorRole:
+            self.__ensure_row_formatted(i, fonts=True)
+            if self._diffs.is_different(i, j):
+                return settings.DIFFERENCE_CELL_COLOR
             return self.text_colors[i, j]
 
         elif role == Qt.ToolTipRole:
@@ -312,28 +491,52 @@ class TableModel(QAbstractTableModel):
         self.data_edited.emit(i, j)
         return True
 
-    def find_protocol_value(self, value):
+    def find_protocol_value(self, value, regex=False):
+        """
+        Search a value in the current view of all messages.
+        In bit and hex view ? matches any symbol and * any number of symbols.
+
+        :param value: substring, wildcard pattern or regular expression
+        :param regex: interpret value as regular expression
+        :return: number of search results
+        """
         self.search_results.clear()
-        if self.proto_view == 1:
+        if self.proto_view == 1 and not regex:
             value = value.lower()
 
         self.search_value = value
+        self.search_regex = regex
 
         if len(value) == 0:
             return 0
 
-        for i, message in enumerate(self.protocol.messages):
-            if i in self.hidden_rows:
-                continue
-
-            data = message.view_to_string(self.proto_view, self.decode)
-            j = data.find(value)
-            while j != -1:
-                self.search_results.append((i, j + self.get_alignment_offset_at(i)))
-                j = data.find(value, j + 1)
+        try:
+            self.search_results.extend(self.search_rows(value, regex))
+        except re.error as e:
+            logger.warning("Invalid regular expression {}: {}".format(value, e))
 
         return len(self.search_results)
 
+    def search_rows(self, value: str, regex=False, start_row=0):
+        """
+        Search value in the rows from start_row on
+
+        :return: list of (row, start column, end column) tuples
+        """
+        if self.protocol is None:
+            return []
+
+        if self.search_index is None:
+            self.search_index = ProtocolSearchIndex(self.protocol, self.proto_view, decoded=self.decode)
+
+        result = []
+        for i, start, end in self.search_index.find(value, regex=regex, start_message=start_row):
+            if i not in self.hidden_rows:
+                offset = self.get_alignment_offset_at(i)
+                result.append((i, start + offset, end + offset))
+
+        return result
+
     def find_differences(self, refindex: int):
         """
         Search all differences between protocol messages regarding a reference message
@@ -343,34 +546,51 @@ class TableModel(QAbstractTableModel):
         """
         differences = defaultdict(set)
 
-        if refindex >= len(self.protocol.messages):
-            return differences
-
-        if self.proto_view == 0:
-            proto = self.protocol.decoded_proto_bits_str
-        elif self.proto_view == 1:
-            proto = self.protocol.decoded_hex_str
-        elif self.proto_view == 2:
-            proto = self.protocol.decoded_ascii_str
-        else:
+        if self.display_data is None or not 0 <= refindex < len(self.display_data):
             return differences
 
-        ref_message = proto[refindex]
-        ref_offset = self.get_alignment_offset_at(refindex)
+        diff_matrix = self.get_difference_matrix(refindex, range(len(self.display_data)))
+        for i, columns in enumerate(diff_matrix):
+            if i != refindex:
+                differences[i] = set(np.flatnonzero(columns).tolist())
 
-        for i, message in enumerate(proto):
-            if i == refindex:
-                continue
+        return differences
 
-            msg_offset = self.get_alignment_offset_at(i)
-            short, long = sorted([len(ref_message) + ref_offset, len(message) + msg_offset])
+    def get_difference_matrix(self, refindex: int, rows) -> np.ndarray:
+        """
+        Compare the given rows with the reference row regarding the alignment offsets of the messages.
+        All rows are placed in one matrix and compared with the reference row in a single broadcast.
 
-            differences[i] = {
-                j for j in range(max(msg_offset, ref_offset), long)
-                if j >= short or message[j - msg_offset] != ref_message[j - ref_offset]
-            }
+        :param refindex: index of reference message
+        :param rows: indices of the rows to compare
+        :return: boolean matrix with one row per given row and True for each differing column
+        """
+        rows = list(rows)
+        if self.display_data is None or not 0 <= refindex < len(self.display_data) or len(rows) == 0:
+            return np.zeros((len(rows), 0), dtype=bool)
 
-        return differences
+        f = 1 if self.proto_view == 0 else 4 if self.proto_view == 1 else 8
+        offsets = np.fromiter((self.protocol.messages[i].alignment_offset for i in rows + [refindex]),
+                              dtype=np.int64, count=len(rows) + 1)
+        offsets = (offsets + f - 1) // f
+        lengths = np.fromiter((len(self.display_data[i]) for i in rows + [refindex]),
+                              dtype=np.int64, count=len(rows) + 1)
+        width = int((offsets + lengths).max())
+
+        # Cells that do not belong to a message (alignment, end of message) get -1
+        matrix = np.full((len(rows) + 1, width), -1, dtype=np.int16)
+        values = np.frombuffer(b"".join(self.display_data[i].tobytes() for i in rows + [refindex]), dtype=np.uint8)
+        starts = np.cumsum(lengths) - lengths
+        row_indices = np.repeat(np.arange(len(rows) + 1), lengths)
+        col_indices = np.arange(len(values)) + np.repeat(offsets - starts, lengths)
+        matrix[row_indices, col_indices] = values
+
+        ref_row, ref_offset = matrix[-1], offsets[-1]
+        result = matrix[:-1] != ref_row
+        # Columns before the end of both alignments never differ
+        result &= np.arange(width) >= np.maximum(offsets[:-1], ref_offset)[:, np.newaxis]
+        result[np.array(rows) == refindex] = False
+        return result
 
     def get_selected_label_index(self, row: int, column: int):
         if self.row_count == 0:
@@ -1,5 +1,6 @@
 import socket
 import socketserver
+import struct
 import threading
 import time
 
@@ -13,6 +14,7 @@ from urh.signalprocessing.Message import Message
 from urh.util.Errors import Errors
 from urh.util.Logger import logger
 from urh.util.RingBuffer import RingBuffer
+from urh.util.SocketReader import SocketReader
 
 
 class NetworkSDRInterfacePlugin(SDRPlugin):
@@ -28,35 +30,110 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
     receive_server_started = pyqtSignal()
     error_occurred = pyqtSignal(str)
 
-    class MyTCPHandler(socketserver.BaseRequestHandler):
-        def handle(self):
-            size = 2 * np.dtype(NetworkSDRInterfacePlugin.DATA_TYPE).itemsize
-            received = self.request.recv(65536 * size)
-            self.data = received
+    # Raw samples are sent as plain stream of interleaved I/Q values, which external applications expect.
+    # Framed transports prefix every batch of samples with a header holding magic, version, data type,
+    # sequence number and number of samples, so the receiver knows the data type and can account lost frames.
+    TRANSPORT_RAW_TCP, TRANSPORT_FRAMED_TCP, TRANSPORT_FRAMED_UDP = "Raw TCP", "Framed TCP", "Framed UDP"
+    TRANSPORTS = [TRANSPORT_RAW_TCP, TRANSPORT_FRAMED_TCP, TRANSPORT_FRAMED_UDP]
 
-            while received:
-                received = self.request.recv(65536 * size)
-                self.data += received
+    FRAME_MAGIC = b"URHF"
+    FRAME_VERSION = 1
+    FRAME_HEADER = struct.Struct("<4sBBHQI")
+    FRAME_DTYPES = {1: np.int8, 2: np.uint8, 3: np.int16, 4: np.uint16, 5: np.float32}
 
-            if len(self.data) == 0:
-                return
+    # Bytes per socket read of the receive server and per write when sending raw samples
+    READ_SIZE = 2 ** 20
+    SEND_BATCH_SIZE = 2 ** 20
+    # Payload of a UDP frame, so header and payload fit into the maximum UDP datagram of 65507 bytes
+    UDP_PAYLOAD_SIZE = 65472
 
+    class MyTCPHandler(socketserver.BaseRequestHandler):
+        def handle(self):
             if hasattr(self.server, "received_bits"):
-                for data in filter(None, self.data.split(b"\n")):
-                    self.server.received_bits.append(NetworkSDRInterfacePlugin.bytearray_to_bit_str(data))
-            else:
-                while len(self.data) % size != 0:
-                    self.data += self.request.recv(len(self.data) % size)
+                self.receive_bits()
+                return
+
+            reader = SocketReader(self.request, NetworkSDRInterfacePlugin.READ_SIZE)
+            try:
+                prefix = bytes(reader.read_exactly(len(NetworkSDRInterfacePlugin.FRAME_MAGIC)))
+            except ConnectionError:
+                prefix = b""
 
-                received = np.frombuffer(self.data, dtype=NetworkSDRInterfacePlugin.DATA_TYPE)
-                received = received.reshape((len(received)//2, 2))
+            if prefix == NetworkSDRInterfacePlugin.FRAME_MAGIC:
+                self.receive_frames(reader)
+            else:
+                self.receive_raw(prefix)
 
-                if len(received) + self.server.current_receive_index >= len(self.server.receive_buffer):
-                    self.server.current_receive_index = 0
+        def receive_bits(self):
+            data = bytearray()
+            received = self.request.recv(65536)
+            while received:
+                data += received
+                received = self.request.recv(65536)
+
+            for message in filter(None, data.split(b"\n")):
+                self.server.received_bits.append(NetworkSDRInterfacePlugin.bytearray_to_bit_str(message))
+
+        def receive_raw(self, prefix: bytes):
+            """
+            Receive a plain stream of float32 samples straight into the receive buffer
+            """
+            buffer = memoryview(self.server.receive_buffer.data).cast("B")
+            sample_size = 2 * np.dtype(NetworkSDRInterfacePlugin.DATA_TYPE).itemsize
+            if len(buffer) == 0:
+                return
 
-                self.server.receive_buffer[
-                self.server.current_receive_index:self.server.current_receive_index + len(received)] = received
-                self.server.current_receive_index += len(received)
+            # Bytes of an incomplete sample, which are written to the buffer again, as its index may be reset
+            partial = prefix
+            while True:
+                index = self.server.current_receive_index
+                if index * sample_size >= len(buffer):
+                    index = 0
+
+                start = index * sample_size
+                buffer[start:start + len(partial)] = partial
+                pos = start + len(partial)
+                n = self.request.recv_into(buffer[pos:], min(NetworkSDRInterfacePlugin.READ_SIZE, len(buffer) - pos))
+                if n == 0:
+                    return
+
+                num_samples = (len(partial) + n) // sample_size
+                partial = bytes(buffer[start + num_samples * sample_size:pos + n])
+                self.server.current_receive_index = index + num_samples
+
+        def receive_frames(self, reader: SocketReader):
+            header_size = NetworkSDRInterfacePlugin.FRAME_HEADER.size
+            magic_size = len(NetworkSDRInterfacePlugin.FRAME_MAGIC)
+            header = bytearray(NetworkSDRInterfacePlugin.FRAME_MAGIC) + bytearray(header_size - magic_size)
+            expected_sequence = None
+
+            while True:
+                try:
+                    reader.read_into(memoryview(header)[magic_size:])
+                    sequence, num_samples, dtype = NetworkSDRInterfacePlugin.unpack_frame_header(header)
+                    if expected_sequence is not None and sequence > expected_sequence:
+                        self.server.num_lost_frames += sequence - expected_sequence
+                    expected_sequence = sequence + 1
+
+                    target = NetworkSDRInterfacePlugin.get_receive_slice(self.server, num_samples)
+                    if dtype == NetworkSDRInterfacePlugin.DATA_TYPE and target is not None:
+                        # Receive straight into the receive buffer without copying
+                        index, view = target
+                        reader.read_into(view)
+                        self.server.current_receive_index = index + num_samples
+                    else:
+                        payload = reader.read_exactly(num_samples * 2 * np.dtype(dtype).itemsize)
+                        NetworkSDRInterfacePlugin.write_to_receive_buffer(self.server, payload, dtype)
+
+                    # Header of the next frame
+                    if bytes(reader.read_exactly(magic_size)) != NetworkSDRInterfacePlugin.FRAME_MAGIC:
+                        logger.error("NetworkSDRInterface: Invalid frame, closing connection")
+                        return
+                except ConnectionError:
+                    return
+                except ValueError as e:
+                    logger.error("NetworkSDRInterface: {}".format(e))
+                    return
 
     def __init__(self, raw_mode=False, resume_on_full_receive_buffer=False, spectrum=False, sending=False):
         """
@@ -71,6 +148,10 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
 
         self.client_port = self.qsettings.value("client_port", defaultValue=2222, type=int)
         self.server_port = self.qsettings.value("server_port", defaultValue=4444, type=int)
+        self.transport = self.qsettings.value("transport", defaultValue=self.TRANSPORT_RAW_TCP, type=str)
+        if self.transport not in self.TRANSPORTS:
+            self.transport = self.TRANSPORT_RAW_TCP
+        self.__send_sequence = 0
 
         self.is_in_spectrum_mode = spectrum
         self.resume_on_full_receive_buffer = resume_on_full_receive_buffer
@@ -141,6 +222,13 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
         else:
             pass
 
+    @property
+    def num_lost_frames(self) -> int:
+        """
+        Number of frames the receive server detected as lost from gaps in their sequence numbers
+        """
+        return getattr(self.server, "num_lost_frames", 0) if hasattr(self, "server") else 0
+
     def free_data(self):
         if self.raw_mode:
             self.receive_buffer = IQArray(None, dtype=self.DATA_TYPE, n=0)
@@ -151,11 +239,14 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
         self.settings_frame.lineEditClientIP.setText(self.client_ip)
         self.settings_frame.spinBoxClientPort.setValue(self.client_port)
         self.settings_frame.spinBoxServerPort.setValue(self.server_port)
+        self.settings_frame.comboBoxTransport.addItems(self.TRANSPORTS)
+        self.settings_frame.comboBoxTransport.setCurrentText(self.transport)
 
         self.settings_frame.lineEditClientIP.editingFinished.connect(self.on_linedit_client_ip_editing_finished)
         self.settings_frame.lineEditServerIP.editingFinished.connect(self.on_linedit_server_ip_editing_finished)
         self.settings_frame.spinBoxClientPort.editingFinished.connect(self.on_spinbox_client_port_editing_finished)
         self.settings_frame.spinBoxServerPort.editingFinished.connect(self.on_spinbox_server_port_editing_finished)
+        self.settings_frame.comboBoxTransport.currentTextChanged.connect(self.on_combobox_transport_current_text_changed)
 
         self.settings_frame.lOpenProtoSniffer.linkActivated.connect(self.on_lopenprotosniffer_link_activated)
 
@@ -165,6 +256,7 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
         if self.raw_mode:
             self.server.receive_buffer = self.receive_buffer
             self.server.current_receive_index = 0
+            self.server.num_lost_frames = 0
         else:
             self.server.received_bits = self.received_bits
 
@@ -172,6 +264,15 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
         self.server_thread.daemon = True
         self.server_thread.start()
 
+        if self.raw_mode and self.transport == self.TRANSPORT_FRAMED_UDP:
+            self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 16 * self.READ_SIZE)
+            self.udp_socket.bind((self.server_ip, self.server_port))
+            self.udp_socket.settimeout(0.1)
+            self.__udp_stop_requested = False
+            self.udp_thread = threading.Thread(target=self.receive_udp_frames, daemon=True)
+            self.udp_thread.start()
+
         logger.debug("Started TCP server for receiving")
 
         self.receive_server_started.emit()
@@ -183,6 +284,89 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
             self.server.server_close()
         if hasattr(self, "server_thread"):
             self.server_thread.join()
+        if hasattr(self, "udp_thread"):
+            self.__udp_stop_requested = True
+            self.udp_thread.join()
+            self.udp_socket.close()
+            del self.udp_thread
+
+    def receive_udp_frames(self):
+        datagram = bytearray(2 ** 16)
+        header_size = self.FRAME_HEADER.size
+        expected_sequence = None
+        while not self.__udp_stop_requested:
+            try:
+                n = self.udp_socket.recv_into(datagram)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                logger.error("NetworkSDRInterface: {}".format(e))
+                return
+
+            try:
+                sequence, num_samples, dtype = self.unpack_frame_header(datagram)
+            except ValueError as e:
+                logger.warning("NetworkSDRInterface: Dropped invalid datagram ({})".format(e))
+                continue
+
+            if expected_sequence is not None and sequence < expected_sequence and sequence != 0:
+                # Late datagram, which was already accounted as lost
+                continue
+            if expected_sequence is not None and sequence > expected_sequence:
+                self.server.num_lost_frames += sequence - expected_sequence
+            expected_sequence = sequence + 1
+
+            payload = memoryview(datagram)[header_size:n]
+            if len(payload) != num_samples * 2 * np.dtype(dtype).itemsize:
+                logger.warning("NetworkSDRInterface: Dropped truncated datagram")
+                continue
+            self.write_to_receive_buffer(self.server, payload, dtype)
+
+    @classmethod
+    def pack_frame_header(cls, sequence: int, num_samples: int, dtype) -> bytes:
+        codes = {np.dtype(dtype): code for code, dtype in cls.FRAME_DTYPES.items()}
+        return cls.FRAME_HEADER.pack(cls.FRAME_MAGIC, cls.FRAME_VERSION, codes[np.dtype(dtype)], 0,
+                                     sequence, num_samples)
+
+    @classmethod
+    def unpack_frame_header(cls, header) -> tuple:
+        """
+
+        :return: sequence number, number of samples and data type of the frame
+        :raises ValueError: if the header is invalid
+        """
+        if len(header) < cls.FRAME_HEADER.size:
+            raise ValueError("Frame header too short")
+        magic, version, dtype_code, _, sequence, num_samples = cls.FRAME_HEADER.unpack_from(header)
+        if magic != cls.FRAME_MAGIC or version != cls.FRAME_VERSION or dtype_code not in cls.FRAME_DTYPES:
+            raise ValueError("Invalid frame header")
+        return sequence, num_samples, cls.FRAME_DTYPES[dtype_code]
+
+    @classmethod
+    def get_receive_slice(cls, server, num_samples: int):
+        """
+        Get the position for num_samples in the receive buffer of the server.
+        The buffer is written from the beginning again, if the samples do not fit at the current index.
+
+        :return: index and writable byte view of the samples in the buffer or None if they do not fit at all
+        """
+        buffer = server.receive_buffer.data
+        if num_samples > len(buffer):
+            return None
+        index = server.current_receive_index
+        if index + num_samples > len(buffer):
+            index = 0
+        return index, memoryview(buffer[index:index + num_samples]).cast("B")
+
+    @classmethod
+    def write_to_receive_buffer(cls, server, payload, dtype):
+        samples = np.frombuffer(payload, dtype=dtype).reshape((-1, 2))
+        samples = IQArray(samples, skip_conversion=True).convert_to(cls.DATA_TYPE)
+        # Only the latest samples are kept, if they do not fit into the buffer
+        samples = samples[max(0, len(samples) - len(server.receive_buffer)):]
+        index, view = cls.get_receive_slice(server, len(samples))
+        np.frombuffer(view, dtype=cls.DATA_TYPE)[:] = samples.reshape(-1)
+        server.current_receive_index = index + len(samples)
 
     def send_data(self, data, sock: socket.socket) -> str:
         try:
@@ -191,8 +375,57 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
         except Exception as e:
             return str(e)
 
+    def send_samples(self, samples: np.ndarray, sock: socket.socket) -> str:
+        """
+        Send samples with the configured transport straight from their memory without copying them.
+
+        :param samples: C contiguous array of shape (n, 2)
+        :return: error message or empty string on success
+        """
+        if self.transport == self.TRANSPORT_RAW_TCP:
+            return self.send_data(memoryview(samples).cast("B"), sock)
+
+        sample_size = 2 * samples.dtype.itemsize
+        if self.transport == self.TRANSPORT_FRAMED_UDP:
+            frame_samples = self.UDP_PAYLOAD_SIZE // sample_size
+        else:
+            frame_samples = max(1, self.SEND_BATCH_SIZE // sample_size)
+
+        try:
+            for i in range(0, len(samples), frame_samples):
+                frame = samples[i:i + frame_samples]
+                header = self.pack_frame_header(self.__send_sequence, len(frame), samples.dtype)
+                self.__send_sequence += 1
+                self.send_buffers(sock, [header, memoryview(frame).cast("B")])
+            return ""
+        except Exception as e:
+            return str(e)
+
+    @staticmethod
+    def send_buffers(sock: socket.socket, buffers: list):
+        """
+        Send the buffers with a single gathering write if the platform supports it, otherwise one after another.
+        For datagram sockets, the buffers are sent as a single datagram.
+        """
+        if not hasattr(sock, "sendmsg"):
+            if sock.type == socket.SOCK_DGRAM:
+                sock.send(b"".join(buffers))
+            else:
+                for buffer in buffers:
+                    sock.sendall(buffer)
+            return
+
+        buffers = [memoryview(buffer).cast("B") for buffer in buffers]
+        while buffers:
+            sent = sock.sendmsg(buffers)
+            while buffers and sent >= len(buffers[0]):
+                sent -= len(buffers.pop(0))
+            if buffers:
+                buffers[0] = buffers[0][sent:]
+
     def send_raw_data(self, data: IQArray, num_repeats: int):
-        byte_data = data.to_bytes()
+        samples = data.data if isinstance(data, IQArray) else data
+        batch_size = max(1, self.SEND_BATCH_SIZE // (2 * samples.dtype.itemsize))
         rng = iter(int, 1) if num_repeats <= 0 else range(0, num_repeats)  # <= 0 = forever
 
         sock = self.prepare_send_connection()
@@ -201,19 +434,29 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
 
         try:
             for _ in rng:
+                for i in range(0, len(samples), batch_size):
+                    if self.__sending_interrupt_requested:
+                        break
+                    self.send_samples(samples[i:i + batch_size], sock)
+                    self.current_sent_sample = min(i + batch_size, len(samples))
+
                 if self.__sending_interrupt_requested:
                     break
-                self.send_data(byte_data, sock)
-                self.current_sent_sample = len(data)
                 self.current_sending_repeat += 1
         finally:
             self.shutdown_socket(sock)
 
-    def prepare_send_connection(self):
+    def prepare_send_connection(self, transport: str = None):
+        transport = transport or self.transport
+        self.__send_sequence = 0
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if transport == self.TRANSPORT_FRAMED_UDP:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            else:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * self.SEND_BATCH_SIZE)
             sock.connect((self.client_ip, self.client_port))
             return sock
         except Exception as e:
@@ -232,7 +475,7 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
 
     def send_raw_data_continuously(self, ring_buffer: RingBuffer, num_samples_to_send: int, num_repeats: int):
         rng = iter(int, 1) if num_repeats <= 0 else range(0, num_repeats)  # <= 0 = forever
-        samples_per_iteration = 65536 // 2
+        samples_per_iteration = self.SEND_BATCH_SIZE // (2 * np.dtype(ring_buffer.dtype).itemsize)
         sock = self.prepare_send_connection()
         if sock is None:
             return
@@ -244,8 +487,11 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
                     break
 
                 while num_samples_to_send is None or self.current_sent_sample < num_samples_to_send:
+                    # Wait shortly for the modulator, so a new batch is sent as soon as it is available
+                    sleep = 0.0001
                     while ring_buffer.is_empty and not self.__sending_interrupt_requested:
-                        time.sleep(0.1)
+                        time.sleep(sleep)
+                        sleep = min(2 * sleep, 0.01)
 
                     if self.__sending_interrupt_requested:
                         break
@@ -255,10 +501,13 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
                     else:
                         n = max(0, min(samples_per_iteration, num_samples_to_send - self.current_sent_sample))
 
-                    data = ring_buffer.pop(n, ensure_even_length=True)
-                    if len(data) > 0:
-                        self.send_data(data, sock)
-                        self.current_sent_sample += len(data)
+                    # Send the values straight from the ring buffer without copying them
+                    first, second = ring_buffer.peek(n - n % 2)
+                    for data in (first, second):
+                        if len(data) > 0:
+                            self.send_samples(data, sock)
+                    ring_buffer.consume(len(first) + len(second))
+                    self.current_sent_sample += len(first) + len(second)
 
                 self.current_sending_repeat += 1
                 self.current_sent_sample = 0
@@ -277,7 +526,8 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
         :return:
         """
         self.is_sending = True
-        sock = self.prepare_send_connection()
+        # Messages are sent as lines of bytes, which only works on a stream
+        sock = self.prepare_send_connection(self.TRANSPORT_RAW_TCP)
         if sock is None:
             return
         try:
@@ -366,6 +616,10 @@ class NetworkSDRInterfacePlugin(SDRPlugin):
         self.client_port = self.settings_frame.spinBoxClientPort.value()
         self.qsettings.setValue('client_port', str(self.client_port))
 
+    def on_combobox_transport_current_text_changed(self, transport: str):
+        self.transport = transport
+        self.qsettings.setValue('transport', self.transport)
+
     def on_spinbox_server_port_editing_finished(self):
         self.server_port = self.settings_frame.spinBoxServerPort.value()
         self.qsettings.setValue('server_port', str(self.server_port))
@@ -71,6 +71,21 @@ PROPERTY_NOT_FOUND_COLOR = QColor.fromRgb(124, 0, 0, 100)
 
 SEPARATION_ROW_HEIGHT = 30
 
+# Protocols with more messages store them in a binary file next to the XML
+BINARY_SIDECAR_MIN_MESSAGES = 10000
+
+# Captures with more samples get a burst index written next to them, see BurstIndex
+BURST_INDEX_MIN_SAMPLES = 10 ** 7
+
+# Maximum size of the analysis cache holding demodulated messages across sessions, see AnalysisCache
+ANALYSIS_CACHE_MAX_SIZE_MB = 512
+
+# Maximum size of the cache holding modulated waveforms of repeatedly sent messages, see ModulationCache
+MODULATION_CACHE_MAX_SIZE_MB = 128
+
+# Generated sequences with more samples are modulated while sending instead of before, see ContinuousSendDialog
+CONTINUOUS_SEND_MIN_SAMPLES = 10 ** 8
+
 PROJECT_FILE = "URHProject.xml"
 DECODINGS_FILE = "decodings.txt"
 FIELD_TYPE_SETTINGS = os.path.realpath(os.path.join(get_qt_settings_filename(), "..", "fieldtypes.xml"))
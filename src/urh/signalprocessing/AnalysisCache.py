@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+from PyQt5.QtCore import QStandardPaths
+
+from urh import settings
+from urh.util.Logger import logger
+from urh.version import VERSION
+
+
+class AnalysisCache(object):
+    """
+    Persistent cache for the demodulated messages of signals across sessions.
+
+    Entries are addressed by a hash of the samples, the demodulation parameters, the URH version and CACHE_FORMAT,
+    so they survive renaming a file but are never used for changed samples, parameters or URH versions.
+    The cache is bounded in size and evicts the least recently used entries.
+    """
+
+    FILE_EXTENSION = ".npz"
+
+    # Bump this whenever a change between releases alters the demodulated messages or the format of entries,
+    # e.g. in Signal, ProtocolAnalyzer, signal_functions, auto_interpretation, filters or decoders
+    CACHE_FORMAT = 1
+
+    __default = None
+
+    def __init__(self, directory: str = None, max_size: int = None):
+        """
+
+        :param directory: directory of the cache, defaults to the URH folder in the cache location of the user
+        :param max_size: maximum size of the cache in bytes
+        """
+        if directory is None:
+            directory = os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation),
+                                     "urh", "analysis_cache")
+        self.directory = directory
+        self.max_size = settings.ANALYSIS_CACHE_MAX_SIZE_MB * 1024 ** 2 if max_size is None else max_size
+        self.store_qad = False  # demodulated samples take four bytes per sample, so they are only stored on request
+
+    @classmethod
+    def get_default(cls):
+        if cls.__default is None:
+            cls.__default = cls()
+        return cls.__default
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, _, size in self.__list_entries())
+
+    def get_key(self, signal):
+        """
+        Get the key of a signal or None if its samples may differ from its file and must not be cached
+
+        """
+        content_hash = signal.content_hash
+        if content_hash is None:
+            return None
+
+        parameters = [signal.modulation_type, signal.samples_per_symbol, signal.center, signal.center_spacing,
+                      signal.tolerance, signal.noise_threshold, signal.bits_per_symbol, signal.pause_threshold,
+                      signal.message_length_divisor, signal.costas_loop_bandwidth]
+        key = hashlib.blake2b(digest_size=20)
+        key.update(content_hash.encode())
+        key.update(json.dumps(parameters).encode())
+        key.update("{}/{}".format(VERSION, self.CACHE_FORMAT).encode())
+        return key.hexdigest()
+
+    def get(self, signal) -> dict:
+        """
+        Get the cached analysis of a signal
+
+        :return: dict of arrays as written by put or None if nothing is cached for the signal
+        """
+        key = self.get_key(signal)
+        if key is None:
+            return None
+
+        filename = os.path.join(self.directory, key + self.FILE_EXTENSION)
+        try:
+            with np.load(filename, allow_pickle=False) as data:
+                result = {name: data[name] for name in data.files}
+            # Update modification time for least recently used eviction
+            os.utime(filename)
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read analysis cache entry {}: {}".format(filename, e))
+            return None
+
+    def put(self, signal, messages: list, qad: np.ndarray = None):
+        """
+        Store the demodulated messages of a signal and evict old entries if the cache gets too large
+
+        :param qad: demodulated samples, only stored if store_qad is enabled
+        """
+        key = self.get_key(signal)
+        if key is None:
+            return
+
+        lengths = np.fromiter((len(msg) for msg in messages), dtype=np.int64, count=len(messages))
+        bits = np.frombuffer(b"".join(msg.plain_bits.tobytes() for msg in messages), dtype=np.uint8)
+        bit_sample_pos = [msg.bit_sample_pos for msg in messages]
+        arrays = {
+            "bits": np.packbits(bits),
+            "bit_offsets": np.concatenate(([0], np.cumsum(lengths))),
+            "pauses": np.array([msg.pause for msg in messages], dtype=np.int64),
+            "rssis": np.array([msg.rssi for msg in messages], dtype=np.float64),
+            "bit_sample_pos": np.concatenate([np.array(pos, dtype=np.int64) for pos in bit_sample_pos] +
+                                             [np.zeros(0, dtype=np.int64)]),
+            "bit_sample_pos_offsets": np.concatenate(([0], np.cumsum([len(pos) for pos in bit_sample_pos],
+                                                                    dtype=np.int64)))
+        }
+        if self.store_qad and qad is not None:
+            arrays["qad"] = qad
+
+        filename = os.path.join(self.directory, key + self.FILE_EXTENSION)
+        tmp_filename = "{}.{}.tmp{}".format(filename, os.getpid(), self.FILE_EXTENSION)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            np.savez(tmp_filename, **arrays)
+            os.replace(tmp_filename, filename)
+        except OSError as e:
+            logger.warning("Could not write analysis cache entry {}: {}".format(filename, e))
+            if os.path.isfile(tmp_filename):
+                os.remove(tmp_filename)
+            return
+
+        self.prune()
+
+    def prune(self, max_size: int = None) -> tuple:
+        """
+        Remove the least recently used entries until the cache is not larger than max_size
+
+        :param max_size: maximum size in bytes, defaults to the maximum size of the cache
+        :return: number of removed entries and freed bytes
+        """
+        max_size = self.max_size if max_size is None else max_size
+        entries = sorted(self.__list_entries())
+        total_size = sum(size for _, _, size in entries)
+
+        removed, freed = 0, 0
+        for _, filename, size in entries:
+            if total_size - freed <= max_size:
+                break
+            try:
+                os.remove(filename)
+                removed += 1
+                freed += size
+            except OSError as e:
+                logger.warning("Could not remove analysis cache entry {}: {}".format(filename, e))
+
+        return removed, freed
+
+    def clear(self) -> tuple:
+        return self.prune(max_size=0)
+
+    def __list_entries(self):
+        """
+        :return: list of (modification time, filename, size) of all entries
+        """
+        try:
+            dir_entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return []
+
+        result = []
+        for entry in dir_entries:
+            if entry.name.endswith(self.FILE_EXTENSION) and entry.is_file():
+                try:
+                    stat = entry.stat()
+                    result.append((stat.st_mtime_ns, entry.path, stat.st_size))
+                except FileNotFoundError:
+                    pass
+        return result
@@ -0,0 +1,160 @@
+import os
+import zlib
+
+import numpy as np
+
+from urh.ainterpretation import AutoInterpretation
+from urh.signalprocessing.IQArray import IQArray
+from urh.signalprocessing.SampleOffsetMap import SampleOffsetMap
+from urh.util.Logger import logger
+
+
+class BurstIndex(object):
+    """
+    Sidecar file next to a capture holding its noise level and the positions and RSSIs of its bursts.
+
+    Sparse captures are mostly noise, so reopening them with an index skips the scan for noise and bursts.
+    The index is only used while size, modification time and checksum of the capture match the stored ones.
+    """
+
+    FILE_EXTENSION = ".bursts.npz"
+    VERSION = 1
+    CHECKSUM_BYTES = 2 ** 20
+
+    def __init__(self, noise_level: float, bursts: np.ndarray, rssis: np.ndarray, file_info=None):
+        """
+
+        :param noise_level: noise level of the capture as found by AutoInterpretation.detect_noise_level
+        :param bursts: array of shape (num_bursts, 2) with start and end sample of each burst
+        :param rssis: mean normalized magnitude of each burst
+        :param file_info: size, modification time and checksum of the capture
+        """
+        self.noise_level = noise_level
+        self.bursts = np.asarray(bursts, dtype=np.int64).reshape(-1, 2)
+        self.rssis = np.asarray(rssis, dtype=np.float32)
+        self.file_info = file_info
+
+    def __len__(self):
+        return len(self.bursts)
+
+    def find_burst(self, sample: int) -> int:
+        """
+        Get the index of the first burst ending after sample, e.g. to jump to the next burst
+
+        :return: index of the burst or len(self) if there is no burst after sample
+        """
+        return int(np.searchsorted(self.bursts[:, 1], sample, side="right"))
+
+    def extract(self, iq_array: IQArray, pre_padding=0, post_padding=0):
+        """
+        Create a compacted capture holding only the bursts of a capture.
+        Bursts whose padded regions overlap are kept as one region.
+
+        :param pre_padding: number of samples to keep before each burst
+        :param post_padding: number of samples to keep after each burst
+        :rtype: tuple of IQArray and SampleOffsetMap
+        """
+        num_samples = len(iq_array)
+        starts = np.maximum(self.bursts[:, 0] - int(pre_padding), 0)
+        ends = np.minimum(self.bursts[:, 1] + int(post_padding), num_samples)
+
+        if len(starts) > 0:
+            region_begins = np.flatnonzero(np.concatenate(([True], starts[1:] > np.maximum.accumulate(ends)[:-1])))
+            starts, ends = starts[region_begins], np.maximum.reduceat(ends, region_begins)
+
+        lengths = ends - starts
+        compact_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+
+        data = np.empty((int(lengths.sum()), 2), dtype=iq_array.dtype)
+        for compact_start, start, end in zip(compact_starts.tolist(), starts.tolist(), ends.tolist()):
+            data[compact_start:compact_start + end - start] = iq_array[start:end]
+
+        return IQArray(data, skip_conversion=True), SampleOffsetMap(compact_starts, starts, num_samples)
+
+    @classmethod
+    def from_iq_array(cls, iq_array: IQArray, noise_level: float = None):
+        magnitudes = iq_array.magnitudes
+        if noise_level is None:
+            noise_level = AutoInterpretation.detect_noise_level(magnitudes)
+
+        bursts = np.array(AutoInterpretation.segment_messages_from_magnitudes(magnitudes, noise_level),
+                          dtype=np.int64).reshape(-1, 2)
+
+        # Mean magnitude of all bursts at once from the cumulative sum of magnitudes
+        summed = np.concatenate(([0], np.cumsum(magnitudes, dtype=np.float64)))
+        lengths = np.maximum(bursts[:, 1] - bursts[:, 0], 1)
+        normalization = np.sqrt(iq_array.maximum ** 2.0 + iq_array.minimum ** 2.0)
+        rssis = (summed[bursts[:, 1]] - summed[bursts[:, 0]]) / lengths / normalization
+
+        return cls(noise_level, bursts, rssis)
+
+    @classmethod
+    def get_filename(cls, signal_filename: str) -> str:
+        return signal_filename + cls.FILE_EXTENSION
+
+    @classmethod
+    def get_file_info(cls, signal_filename: str) -> np.ndarray:
+        """
+        Size, modification time and CRC32 of the first and last MiB of a capture,
+        so validating an index does not need to read the whole file.
+
+        """
+        stat = os.stat(signal_filename)
+        with open(signal_filename, "rb") as f:
+            checksum = zlib.crc32(f.read(cls.CHECKSUM_BYTES))
+            if stat.st_size > cls.CHECKSUM_BYTES:
+                f.seek(max(cls.CHECKSUM_BYTES, stat.st_size - cls.CHECKSUM_BYTES))
+                checksum = zlib.crc32(f.read(), checksum)
+
+        return np.array([stat.st_size, stat.st_mtime_ns, checksum], dtype=np.int64)
+
+    @classmethod
+    def load(cls, signal_filename: str):
+        """
+        Load the index of a capture
+
+        :return: the index or None if there is no valid index for the capture
+        """
+        filename = cls.get_filename(signal_filename)
+        if not os.path.isfile(filename):
+            return None
+
+        try:
+            with np.load(filename, allow_pickle=False) as data:
+                if int(data["version"]) != cls.VERSION:
+                    return None
+                file_info = data["file_info"]
+                if not np.array_equal(file_info, cls.get_file_info(signal_filename)):
+                    return None
+                return cls(float(data["noise_level"]), data["bursts"], data["rssis"], file_info)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Could not read burst index {}: {}".format(filename, e))
+            return None
+
+    def save(self, signal_filename: str):
+        filename = self.get_filename(signal_filename)
+        self.file_info = self.get_file_info(signal_filename)
+
+        tmp_filename = "{}.{}.tmp.npz".format(filename, os.getpid())
+        try:
+            np.savez(tmp_filename, version=self.VERSION, noise_level=self.noise_level, bursts=self.bursts,
+                     rssis=self.rssis, file_info=self.file_info)
+            os.replace(tmp_filename, filename)
+        except OSError as e:
+            logger.warning("Could not write burst index {}: {}".format(filename, e))
+            if os.path.isfile(tmp_filename):
+                os.remove(tmp_filename)
+
+    @classmethod
+    def load_or_create(cls, signal_filename: str, iq_array: IQArray, save=True):
+        """
+        Load the index of a capture or create it by analyzing the samples.
+
+        :param save: write a newly created index next to the capture
+        """
+        index = cls.load(signal_filename)
+        if index is None:
+            index = cls.from_iq_array(iq_array)
+            if save and os.path.isfile(signal_filename):
+                index.save(signal_filename)
+        return index
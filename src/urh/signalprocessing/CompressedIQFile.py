@@ -0,0 +1,276 @@
+import json
+import lzma
+import os
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from urh.signalprocessing.IQArray import IQArray
+
+
+class CompressedIQFile(object):
+    """
+    Compressed complex file (.coco) consisting of independently compressed chunks of samples.
+
+    The file starts with a magic number followed by the compressed chunks.
+    A JSON index with the compressed position of every chunk is appended at the end of the file,
+    so any range of samples can be decompressed without touching the other chunks.
+    Chunks are compressed and decompressed in parallel threads as zlib and lzma release the GIL.
+    """
+
+    MAGIC = b"URHCOCO1"
+    CODECS = ("zlib", "lzma")
+    DEFAULT_CODEC = "zlib"
+    DEFAULT_CHUNK_SAMPLES = 2 ** 18
+    CACHED_CHUNKS = 8
+
+    def __init__(self, filename: str):
+        """
+        Open a chunked compressed file for reading
+
+        :raises ValueError: if the file is no chunked compressed file
+        """
+        self.filename = filename
+
+        with open(filename, "rb") as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError("{} is no chunked compressed complex file".format(filename))
+
+            f.seek(-len(self.MAGIC) - 8, os.SEEK_END)
+            index_length = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError("{} is incomplete".format(filename))
+
+            f.seek(-len(self.MAGIC) - 8 - index_length, os.SEEK_END)
+            index = json.loads(f.read(index_length).decode("utf-8"))
+
+        self.codec = index["codec"]
+        self.dtype = np.dtype(index["dtype"])
+        self.num_samples = index["num_samples"]
+        self.chunk_samples = index["chunk_samples"]
+        self.__chunks = index["chunks"]  # list of [file position, compressed length]
+
+        self.__cache = OrderedDict()
+
+    def __len__(self):
+        return self.num_samples
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self.num_samples)
+            return self.read(start, max(start, stop))[::step]
+
+        if item < 0:
+            item += self.num_samples
+        if not 0 <= item < self.num_samples:
+            raise IndexError("Sample index {} out of range".format(item))
+        return self.read(item, item + 1)[0]
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.__chunks)
+
+    @classmethod
+    def is_chunked_file(cls, filename: str) -> bool:
+        try:
+            with open(filename, "rb") as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+        except OSError:
+            return False
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """
+        Decompress the samples in range [start, stop)
+
+        :return: array of shape (stop - start, 2)
+        """
+        start, stop = max(0, start), min(stop, self.num_samples)
+        result = np.empty((max(0, stop - start), 2), dtype=self.dtype)
+        if len(result) == 0:
+            return result
+
+        first_chunk, last_chunk = start // self.chunk_samples, (stop - 1) // self.chunk_samples
+        with open(self.filename, "rb") as f:
+            for i in range(first_chunk, last_chunk + 1):
+                chunk = self.__get_cached_chunk(f, i)
+                chunk_start = i * self.chunk_samples
+                lower, upper = max(start, chunk_start), min(stop, chunk_start + len(chunk))
+                result[lower - start:upper - start] = chunk[lower - chunk_start:upper - chunk_start]
+
+        return result
+
+    def to_iq_array(self, num_threads=None) -> IQArray:
+        """
+        Decompress all chunks in parallel straight into a preallocated array
+
+        """
+        result = np.empty((self.num_samples, 2), dtype=self.dtype)
+
+        def decompress_into(i: int):
+            start = i * self.chunk_samples
+            chunk = self.__decompress(self.__read_chunk(i), i)
+            result[start:start + len(chunk)] = chunk
+
+        with ThreadPoolExecutor(num_threads) as executor:
+            list(executor.map(decompress_into, range(self.num_chunks)))
+
+        return IQArray(result, skip_conversion=True)
+
+    def __get_cached_chunk(self, f, index: int) -> np.ndarray:
+        try:
+            self.__cache.move_to_end(index)
+            return self.__cache[index]
+        except KeyError:
+            pass
+
+        position, length = self.__chunks[index]
+        f.seek(position)
+        chunk = self.__decompress(f.read(length), index)
+        self.__cache[index] = chunk
+        if len(self.__cache) > self.CACHED_CHUNKS:
+            self.__cache.popitem(last=False)
+        return chunk
+
+    def __read_chunk(self, index: int) -> bytes:
+        position, length = self.__chunks[index]
+        with open(self.filename, "rb") as f:
+            f.seek(position)
+            return f.read(length)
+
+    def __decompress(self, data: bytes, index: int) -> np.ndarray:
+        data = zlib.decompress(data) if self.codec == "zlib" else lzma.decompress(data)
+        chunk = np.frombuffer(data, dtype=self.dtype).reshape((-1, 2))
+
+        expected = min(self.chunk_samples, self.num_samples - index * self.chunk_samples)
+        if len(chunk) != expected:
+            raise ValueError("Chunk {} of {} is corrupted".format(index, self.filename))
+        return chunk
+
+    @classmethod
+    def write(cls, filename: str, iq_array: IQArray, codec=None, chunk_samples=None, num_threads=None):
+        """
+        Write samples to a chunked compressed file.
+        The samples keep their data type, so compressing is lossless.
+
+        :param codec: zlib or lzma
+        :param chunk_samples: number of samples per chunk
+        """
+        data = iq_array.data if isinstance(iq_array, IQArray) else IQArray(iq_array).data
+        with CompressedIQWriter(filename, data.dtype, codec, chunk_samples, num_threads) as writer:
+            writer.write(data)
+
+
+class CompressedIQWriter(object):
+    """
+    Write samples to a chunked compressed file incrementally, e.g. while recording.
+    Full chunks are compressed in parallel threads while further samples are written.
+    The file is written to a temporary file and only moved to its name on close.
+    """
+
+    def __init__(self, filename: str, dtype, codec=None, chunk_samples=None, num_threads=None):
+        """
+
+        :param dtype: data type of the samples
+        :param codec: zlib or lzma
+        :param chunk_samples: number of samples per chunk
+        """
+        self.codec = CompressedIQFile.DEFAULT_CODEC if codec is None else codec
+        if self.codec not in CompressedIQFile.CODECS:
+            raise ValueError("Unknown codec {}".format(codec))
+
+        self.filename = filename
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.chunk_samples = CompressedIQFile.DEFAULT_CHUNK_SAMPLES if chunk_samples is None else int(chunk_samples)
+        self.num_samples = 0
+
+        self.__compress = zlib.compress if self.codec == "zlib" else lzma.compress
+        self.__executor = ThreadPoolExecutor(num_threads)
+        # Limit the chunks in flight, so memory stays bounded if compressing is slower than writing
+        self.__max_pending = 2 * (num_threads or os.cpu_count() or 1)
+        self.__pending = deque()
+        self.__chunks = []  # list of [file position, compressed length]
+
+        self.__partial = np.empty((self.chunk_samples, 2), dtype=self.dtype)
+        self.__partial_length = 0
+
+        self.__tmp_filename = "{}.{}.tmp".format(filename, os.getpid())
+        self.__file = open(self.__tmp_filename, "wb")
+        self.__file.write(CompressedIQFile.MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, data: np.ndarray):
+        """
+        Append samples of shape (n, 2). The samples are copied, so the caller may reuse data afterwards.
+        """
+        data = np.asarray(data).reshape((-1, 2)).astype(self.dtype, copy=False)
+        self.num_samples += len(data)
+        pos = 0
+
+        if self.__partial_length > 0:
+            n = min(len(data), self.chunk_samples - self.__partial_length)
+            self.__partial[self.__partial_length:self.__partial_length + n] = data[:n]
+            self.__partial_length += n
+            pos = n
+            if self.__partial_length == self.chunk_samples:
+                self.__submit(self.__partial.tobytes())
+                self.__partial_length = 0
+
+        while len(data) - pos >= self.chunk_samples:
+            self.__submit(np.ascontiguousarray(data[pos:pos + self.chunk_samples]).tobytes())
+            pos += self.chunk_samples
+
+        n = len(data) - pos
+        if n > 0:
+            self.__partial[:n] = data[pos:]
+            self.__partial_length = n
+
+    def close(self):
+        """
+        Write the remaining samples and the index and move the file to its name
+        """
+        try:
+            if self.__partial_length > 0:
+                self.__submit(self.__partial[:self.__partial_length].tobytes())
+                self.__partial_length = 0
+            while self.__pending:
+                self.__write_chunk(self.__pending.popleft().result())
+
+            index = json.dumps({"codec": self.codec, "dtype": self.dtype.str, "num_samples": self.num_samples,
+                                "chunk_samples": self.chunk_samples, "chunks": self.__chunks}).encode("utf-8")
+            self.__file.write(index)
+            self.__file.write(np.uint64(len(index)).astype("<u8").tobytes())
+            self.__file.write(CompressedIQFile.MAGIC)
+            self.__file.close()
+            self.__executor.shutdown()
+            os.replace(self.__tmp_filename, self.filename)
+        except Exception:
+            self.abort()
+            raise
+
+    def abort(self):
+        """
+        Discard the file
+        """
+        self.__executor.shutdown(wait=True)
+        self.__file.close()
+        if os.path.isfile(self.__tmp_filename):
+            os.remove(self.__tmp_filename)
+
+    def __submit(self, raw: bytes):
+        self.__pending.append(self.__executor.submit(self.__compress, raw))
+        while len(self.__pending) > self.__max_pending or (self.__pending and self.__pending[0].done()):
+            self.__write_chunk(self.__pending.popleft().result())
+
+    def __write_chunk(self, compressed: bytes):
+        self.__chunks.append([self.__file.tell(), len(compressed)])
+        self.__file.write(compressed)
@@ -2,11 +2,28 @@ import time
 from multiprocessing import Process, Value
 
 from urh import settings
+from urh.signalprocessing.ModulationCache import ModulationCache
 from urh.signalprocessing.Modulator import Modulator
 from urh.util.Logger import logger
 from urh.util.RingBuffer import RingBuffer
 
 
+def modulate_messages(data: list, pauses: list, modulator_indices: list, modulators: list, dtype=None):
+    """
+    Modulate messages one after another, e.g. as generator function of a GeneratorSampleSource,
+    so only the currently sent message is held in memory instead of the whole sequence.
+
+    :param data: encoded bits of each message
+    :param pauses: pause in samples after each message
+    :param modulator_indices: modulator index of each message
+    :type modulators: list of Modulator
+    """
+    # Equal messages, e.g. of a fuzzing sequence, are only modulated once
+    modulation_cache = ModulationCache()
+    for bits, pause, modulator_index in zip(data, pauses, modulator_indices):
+        yield modulation_cache.modulate(modulators[modulator_index], bits, pause=pause, dtype=dtype)
+
+
 class ContinuousModulator(object):
     """
     This class is used in continuous sending mode.
@@ -61,6 +78,8 @@ class ContinuousModulator(object):
 
     def modulate_continuously(self, num_repeats):
         rng = iter(int, 1) if num_repeats <= 0 else range(0, num_repeats)  # <= 0 = forever
+        # Messages and modulators do not change between repeats, so every message is only modulated once
+        modulation_cache = ModulationCache()
         for _ in rng:
             if self.abort.value:
                 return
@@ -74,7 +93,7 @@ class ContinuousModulator(object):
                 message = self.messages[i]
                 self.current_message_index.value = i
                 modulator = self.modulators[message.modulator_index]  # type: Modulator
-                modulated = modulator.modulate(start=0, data=message.encoded_bits, pause=message.pause)
+                modulated = modulation_cache.modulate(modulator, message.encoded_bits, pause=message.pause)
                 while not self.ring_buffer.will_fit(len(modulated)):
                     if self.abort.value:
                         return
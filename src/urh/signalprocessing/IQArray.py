@@ -1,6 +1,3 @@
-import os
-import tarfile
-import tempfile
 import wave
 
 import numpy as np
@@ -187,20 +184,39 @@ class IQArray(object):
 
     @staticmethod
     def from_file(filename: str):
-        if filename.endswith(".complex16u") or filename.endswith(".cu8"):
+        return IQArray.from_buffer(np.fromfile(filename, dtype=IQArray.get_dtype_for_filename(filename)))
+
+    @staticmethod
+    def from_buffer(buffer, dtype=None):
+        """
+        Create an IQArray from raw interleaved samples. Unsigned samples are converted to signed ones.
+
+        :param buffer: numpy array or bytes like object
+        :param dtype: data type of the samples if buffer is no numpy array
+        """
+        data = buffer if isinstance(buffer, np.ndarray) else np.frombuffer(buffer, dtype=dtype)
+
+        if data.dtype == np.uint8:
             # two 8 bit unsigned integers
-            return IQArray(IQArray(data=np.fromfile(filename, dtype=np.uint8)).convert_to(np.int8))
+            return IQArray(IQArray(data=data).convert_to(np.int8))
+        elif data.dtype == np.uint16:
+            # two 16 bit unsigned integers
+            return IQArray(IQArray(data=data).convert_to(np.int16))
+        else:
+            return IQArray(data=data)
+
+    @staticmethod
+    def get_dtype_for_filename(filename: str):
+        if filename.endswith(".complex16u") or filename.endswith(".cu8"):
+            return np.uint8
         elif filename.endswith(".complex16s") or filename.endswith(".cs8"):
-            # two 8 bit signed integers
-            return IQArray(data=np.fromfile(filename, dtype=np.int8))
+            return np.int8
         elif filename.endswith(".complex32u") or filename.endswith(".cu16"):
-            # two 16 bit unsigned integers
-            return IQArray(IQArray(data=np.fromfile(filename, dtype=np.uint16)).convert_to(np.int16))
+            return np.uint16
         elif filename.endswith(".complex32s") or filename.endswith(".cs16"):
-            # two 16 bit signed integers
-            return IQArray(data=np.fromfile(filename, dtype=np.int16))
+            return np.int16
         else:
-            return IQArray(data=np.fromfile(filename, dtype=np.float32))
+            return np.float32
 
     @staticmethod
     def convert_array_to_iq(arr: np.ndarray) -> np.ndarray:
@@ -230,16 +246,15 @@ class IQArray(object):
         return IQArray(data=np.concatenate([arr.data if isinstance(arr, IQArray) else arr for arr in args[0]]))
 
     def save_compressed(self, filename):
-        with tarfile.open(filename, 'w:bz2') as tar_write:
-            tmp_name = tempfile.mkstemp()[1]
-            self.tofile(tmp_name)
-            tar_write.add(tmp_name)
-            os.remove(tmp_name)
+        from urh.signalprocessing.CompressedIQFile import CompressedIQFile
+        CompressedIQFile.write(filename, self)
 
-    def export_to_wav(self, filename, num_channels, sample_rate):
+    def export_to_wav(self, filename, num_channels, sample_rate, chunk_samples=2 ** 18):
         f = wave.open(filename, "w")
         f.setnchannels(num_channels)
         f.setsampwidth(2)
         f.setframerate(sample_rate)
-        f.writeframes(self.convert_to(np.int16))
+        # Convert chunk by chunk to avoid a full size int16 copy of the signal
+        for start in range(0, self.num_samples, chunk_samples):
+            f.writeframes(IQArray(self.__data[start:start + chunk_samples]).convert_to(np.int16).tobytes())
         f.close()
@@ -13,6 +13,9 @@ from urh.signalprocessing.ProtocoLabel import ProtocolLabel
 from urh.util.Formatter import Formatter
 from urh.util.Logger import logger
 
+BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+HEX_VALUES = bytes.maketrans(b"0123456789abcdef", bytes(range(16)))
+
 
 class Message(object):
     """
@@ -22,7 +25,7 @@ class Message(object):
     __slots__ = ["__plain_bits", "__bit_alignments", "pause", "modulator_index", "rssi", "participant", "message_type",
                  "absolute_time", "relative_time", "__decoder", "align_labels", "decoding_state", "timestamp",
                  "fuzz_created", "__decoded_bits", "__encoded_bits", "decoding_errors", "samples_per_symbol", "bit_sample_pos",
-                 "alignment_offset", "bits_per_symbol"]
+                 "alignment_offset", "bits_per_symbol", "__plain_bits_loader"]
 
     def __init__(self, plain_bits, pause: int, message_type: MessageType, rssi=0, modulator_index=0, decoder=None,
                  fuzz_created=False, bit_sample_pos=None, samples_per_symbol=100, participant=None, bits_per_symbol=1):
@@ -38,6 +41,7 @@ class Message(object):
         :return:
         """
         self.__plain_bits = array.array("B", plain_bits)
+        self.__plain_bits_loader = None
         self.pause = pause
         self.modulator_index = modulator_index
         self.rssi = rssi
@@ -79,11 +83,15 @@ class Message(object):
 
         :rtype: array.array
         """
+        if self.__plain_bits_loader is not None:
+            self.__plain_bits = self.__plain_bits_loader()
+            self.__plain_bits_loader = None
         return self.__plain_bits
 
     @plain_bits.setter
     def plain_bits(self, value: list):
         self.__plain_bits = array.array("B", value)
+        self.__plain_bits_loader = None
         self.clear_decoded_bits()
         self.clear_encoded_bits()
 
@@ -108,7 +116,7 @@ class Message(object):
         self.clear_encoded_bits()
 
     def __add__(self, other):
-        return self.__plain_bits + other.__plain_bits
+        return self.plain_bits + other.plain_bits
 
     def _remove_labels_for_range(self, index, instant_remove=True):
         if isinstance(index, int):
@@ -162,7 +170,7 @@ class Message(object):
         Return the length of this message in byte.
 
         """
-        end = len(self.decoded_bits) if decoded else len(self.__plain_bits)
+        end = len(self.decoded_bits) if decoded else len(self.plain_bits)
         end = self.convert_index(end, 0, 2, decoded=decoded)[0]
         return int(end)
 
@@ -170,7 +178,19 @@ class Message(object):
         return "".join(map(str, bits))
 
     def __len__(self):
-        return len(self.plain_bits)
+        if self.__plain_bits_loader is not None:
+            return len(self.__plain_bits_loader)
+        return len(self.__plain_bits)
+
+    def set_plain_bits_loader(self, loader):
+        """
+        Load the plain bits lazily on first access, e.g. from a memory mapped file
+
+        :param loader: callable returning the plain bits, len(loader) must give their number
+        """
+        self.__plain_bits_loader = loader
+        self.clear_decoded_bits()
+        self.clear_encoded_bits()
 
     def insert(self, index: int, item: bool):
         self.plain_bits.insert(index, item)
@@ -268,39 +288,35 @@ class Message(object):
 
     @property
     def plain_hex_array(self) -> array.array:
-        padded_bitchains = self.split(decode=False)
-        return self.__bit_chains_to_hex(padded_bitchains)
+        return array.array("B", self.__get_hex_str(decode=False).encode().translate(HEX_VALUES))
 
     @property
     def plain_hex_str(self) -> str:
-        return "".join(map(lambda h: "{0:x}".format(h), self.plain_hex_array))
+        return self.__get_hex_str(decode=False)
 
     @property
     def plain_ascii_array(self) -> array.array:
-        padded_bitchains = self.split(decode=False)
-        return self.__bit_chains_to_ascii(padded_bitchains)
+        return array.array("B", self.__get_ascii_bytes(decode=False))
 
     @property
     def plain_ascii_str(self) -> str:
-        return "".join(map(chr, self.plain_ascii_array))
+        return self.__get_ascii_bytes(decode=False).decode("latin-1")
 
     @property
     def decoded_hex_array(self) -> array.array:
-        padded_bitchains = self.split()
-        return self.__bit_chains_to_hex(padded_bitchains)
+        return array.array("B", self.__get_hex_str(decode=True).encode().translate(HEX_VALUES))
 
     @property
     def decoded_hex_str(self) -> str:
-        return "".join(map(lambda h: "{0:x}".format(h), self.decoded_hex_array))
+        return self.__get_hex_str(decode=True)
 
     @property
     def decoded_ascii_array(self) -> array.array:
-        padded_bitchains = self.split()
-        return self.__bit_chains_to_ascii(padded_bitchains)
+        return array.array("B", self.__get_ascii_bytes(decode=True))
 
     @property
     def decoded_ascii_str(self) -> str:
-        return "".join(map(chr, self.decoded_ascii_array))
+        return self.__get_ascii_bytes(decode=True).decode("latin-1")
 
     def __get_bit_range_from_hex_or_ascii_index(self, from_index: int, decoded: bool, is_hex: bool) -> tuple:
         bits = self.decoded_bits if decoded else self.plain_bits
@@ -384,33 +400,49 @@ class Message(object):
 
         return src_address
 
-    @staticmethod
-    def __bit_chains_to_hex(bit_chains) -> array.array:
+    def __get_padded_bit_chains(self, decode: bool, size: int):
         """
+        Yield the bit chains of this message as integers padded with zeros to a multiple of size bits.
+        Whole protocols should rather use ProtocolAnalyzer.get_view_arrays which converts all messages at once.
 
-        :type bit_chains: list of array.array
-        :return:
+        :return: tuples of value and number of symbols
         """
-        result = array.array("B", [])
-        for bc in bit_chains:
-            bc += array.array("B", [0] * ((4 - len(bc) % 4) % 4))  # pad hex view
-            result.extend((8*bc[i]+4*bc[i+1]+2*bc[i+2]+bc[i+3]) for i in range(0, len(bc), 4))
+        bits = self.decoded_bits if decode else self.plain_bits
+        bit_str = bits.tobytes().translate(BIT_CHARS).decode("ascii")
+        start = 0
+        for length in self.get_bit_chain_lengths(decode):
+            if length > 0:
+                num_symbols = (length + size - 1) // size
+                yield int(bit_str[start:start + length], 2) << (num_symbols * size - length), num_symbols
+                start += length
 
-        return result
+    def __get_hex_str(self, decode: bool) -> str:
+        return "".join("{0:0{1}x}".format(value, num_symbols)
+                       for value, num_symbols in self.__get_padded_bit_chains(decode, size=4))
+
+    def __get_ascii_bytes(self, decode: bool) -> bytes:
+        return b"".join(value.to_bytes(num_symbols, "big")
+                        for value, num_symbols in self.__get_padded_bit_chains(decode, size=8))
 
     @staticmethod
-    def __bit_chains_to_ascii(bit_chains) -> array.array:
+    def get_label_alignments(message_type: MessageType) -> list:
         """
+        Return the sorted bit positions the hex and ascii view get aligned to when labels shall be aligned
 
-        :type bit_chains: list of array.array
-        :return:
+        :rtype: list of int
         """
-        result = array.array("B", [])
-        for bc in bit_chains:
-            bc += array.array("B", [0] * ((8 - len(bc) % 8) % 8))  # pad ascii view
-            result.extend((128*bc[i]+64*bc[i+1]+32*bc[i+2]+16*bc[i+3]+8*bc[i+4]+4*bc[i+5]+2*bc[i+6]+bc[i+7])
-                          for i in range(0, len(bc), 8))
-        return result
+        return sorted(set(pos for lbl in message_type for pos in (lbl.start, lbl.end)))
+
+    def __update_bit_alignments(self):
+        self.__bit_alignments = self.get_label_alignments(self.message_type) if self.align_labels else []
+        return self.__bit_alignments
+
+    def set_bit_alignments(self, bit_alignments: list):
+        """
+        Set bit alignments that were calculated for many messages at once, see get_label_alignments
+
+        """
+        self.__bit_alignments = bit_alignments
 
     def split(self, decode=True):
         """
@@ -421,21 +453,31 @@ class Message(object):
         start = 0
         result = []
         message = self.decoded_bits if decode else self.plain_bits
-        bit_alignments = set()
-        if self.align_labels:
-            for l in self.message_type:
-                bit_alignments.add(l.start)
-                bit_alignments.add(l.end)
 
-        self.__bit_alignments = sorted(bit_alignments)
-
-        for pos in self.__bit_alignments:
+        for pos in self.__update_bit_alignments():
             result.append(message[start:pos])
             start = pos
 
         result.append(message[start:])
         return result
 
+    def get_bit_chain_lengths(self, decode=True) -> list:
+        """
+        Return the lengths of the bit chains that split would return without copying the bits.
+
+        :rtype: list of int
+        """
+        start = 0
+        result = []
+        positions = range(len(self.decoded_bits if decode else self.plain_bits))
+
+        for pos in self.__update_bit_alignments():
+            result.append(len(positions[start:pos]))
+            start = pos
+
+        result.append(len(positions[start:]))
+        return result
+
     def view_to_string(self, view: int, decoded: bool, show_pauses=True, sample_rate: float = None) -> str:
         """
 
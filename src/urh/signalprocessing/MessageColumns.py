@@ -0,0 +1,129 @@
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+
+class MessageColumns(object):
+    """
+    Columnar export of messages for bulk processing, e.g. with NumPy or pandas.
+
+    Every column is a NumPy array with one entry per message. The bits of all messages are stored
+    as zero padded matrix of packed bytes together with the bit length of each message.
+    Participants, message types and labels are stored as lookup tables the message columns refer to by index.
+
+    Columns are written to a directory of .npy files, which can be memory mapped with np.load(mmap_mode="r"),
+    or to a single .npz file. Messages are processed in chunks, so no per message strings are built.
+    """
+
+    FILE_EXTENSION = ".npz"
+    CHUNK_MESSAGES = 2 ** 14
+
+    @classmethod
+    def write_directory(cls, directory: str, messages: list, message_types: list, participants: list,
+                        decoded=True):
+        """
+        Write the columns of messages to a directory with a .npy file per column
+
+        :param message_types: message types the message type indices refer to
+        :param participants: participants the participant indices refer to, -1 means no participant
+        :param decoded: export decoded instead of plain bits
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        message_type_indices = {id(message_type): i for i, message_type in enumerate(message_types)}
+        participant_indices = {participant: i for i, participant in enumerate(participants)}
+
+        bit_lengths = np.fromiter((len(msg.decoded_bits if decoded else msg.plain_bits) for msg in messages),
+                                  dtype=np.int64, count=len(messages))
+        max_bits = int(bit_lengths.max()) if len(bit_lengths) > 0 else 0
+
+        data = np.lib.format.open_memmap(os.path.join(directory, "data.npy"), mode="w+", dtype=np.uint8,
+                                         shape=(len(messages), (max_bits + 7) // 8))
+        for start in range(0, len(messages), cls.CHUNK_MESSAGES):
+            chunk = messages[start:start + cls.CHUNK_MESSAGES]
+            data[start:start + len(chunk)] = cls.__pack_bits(chunk, bit_lengths[start:start + len(chunk)],
+                                                             max_bits, decoded)
+        data.flush()
+        del data
+
+        labels = [(i, lbl) for i, message_type in enumerate(message_types) for lbl in message_type]
+
+        columns = {
+            "bit_lengths": bit_lengths,
+            "timestamps": np.fromiter((msg.timestamp for msg in messages), dtype=np.float64, count=len(messages)),
+            "pauses": np.fromiter((msg.pause for msg in messages), dtype=np.int64, count=len(messages)),
+            "rssis": np.fromiter((msg.rssi for msg in messages), dtype=np.float64, count=len(messages)),
+            "participant_indices": np.fromiter((participant_indices.get(msg.participant, -1) for msg in messages),
+                                               dtype=np.int32, count=len(messages)),
+            "message_type_indices": np.fromiter((message_type_indices.get(id(msg.message_type), -1)
+                                                 for msg in messages), dtype=np.int32, count=len(messages)),
+            "participant_names": np.array([p.name for p in participants], dtype=np.str_),
+            "participant_addresses": np.array([p.address_hex for p in participants], dtype=np.str_),
+            "message_type_names": np.array([mt.name for mt in message_types], dtype=np.str_),
+            "label_message_type_indices": np.array([i for i, _ in labels], dtype=np.int32),
+            "label_names": np.array([lbl.name for _, lbl in labels], dtype=np.str_),
+            "label_starts": np.array([lbl.start for _, lbl in labels], dtype=np.int64),
+            "label_ends": np.array([lbl.end for _, lbl in labels], dtype=np.int64),
+        }
+
+        for name, column in columns.items():
+            np.save(os.path.join(directory, name + ".npy"), column)
+
+    @classmethod
+    def write_npz(cls, filename: str, messages: list, message_types: list, participants: list, decoded=True):
+        """
+        Write the columns of messages to a .npz file that can be read with np.load.
+        The columns are written to a temporary directory first and then copied into the file,
+        so the bit matrix never needs to be in memory completely.
+
+        """
+        directory = os.path.dirname(os.path.abspath(filename))
+        tmp_filename = "{}.{}.tmp".format(filename, os.getpid())
+        try:
+            with tempfile.TemporaryDirectory(dir=directory) as tmp_dir:
+                cls.write_directory(tmp_dir, messages, message_types, participants, decoded)
+                with zipfile.ZipFile(tmp_filename, mode="w", compression=zipfile.ZIP_STORED,
+                                     allowZip64=True) as zf:
+                    for name in sorted(os.listdir(tmp_dir)):
+                        zf.write(os.path.join(tmp_dir, name), arcname=name)
+            os.replace(tmp_filename, filename)
+        except Exception:
+            if os.path.isfile(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """
+        Load exported columns. Columns of a directory are memory mapped.
+
+        :param path: .npz file or directory written by write_directory
+        """
+        if os.path.isdir(path):
+            return {name[:-len(".npy")]: np.load(os.path.join(path, name), mmap_mode="r", allow_pickle=False)
+                    for name in os.listdir(path) if name.endswith(".npy")}
+
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+
+    @staticmethod
+    def unpack_bits(columns: dict, index: int) -> np.ndarray:
+        """
+        Get the bits of a single message from exported columns
+        """
+        return np.unpackbits(columns["data"][index])[:int(columns["bit_lengths"][index])]
+
+    @staticmethod
+    def __pack_bits(messages: list, bit_lengths: np.ndarray, max_bits: int, decoded: bool) -> np.ndarray:
+        bits = np.frombuffer(b"".join((msg.decoded_bits if decoded else msg.plain_bits).tobytes()
+                                      for msg in messages), dtype=np.uint8)
+
+        # Scatter the concatenated bits into a zero padded matrix with a row per message
+        starts = np.cumsum(bit_lengths) - bit_lengths
+        rows = np.repeat(np.arange(len(messages)), bit_lengths)
+        cols = np.arange(len(bits)) - np.repeat(starts, bit_lengths)
+        matrix = np.zeros((len(messages), max_bits), dtype=np.uint8)
+        matrix[rows, cols] = bits
+        return np.packbits(matrix, axis=1)
@@ -0,0 +1,187 @@
+import array
+import json
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+from urh.util.Logger import logger
+
+
+class MessageSidecar(object):
+    """
+    Binary file next to a protocol or fuzzing profile XML holding the bits and per message values of all messages.
+
+    The file consists of a magic number, a JSON header describing the arrays and the raw arrays themselves,
+    so it can be memory mapped and the bits of a message are only unpacked when the message gets accessed.
+    Message types, participants and decodings are stored as indices into the lists saved in the XML.
+    """
+
+    MAGIC = b"URHMSGS1"
+    ALIGNMENT = 64
+    FILE_EXTENSION = ".msgs"
+
+    # Sidecars that may still map their file, so they can be released before the file gets replaced
+    __open_sidecars = weakref.WeakSet()
+
+    FIELDS = [("bits", np.uint8), ("bit_offsets", np.int64), ("pauses", np.int64), ("timestamps", np.float64),
+              ("rssis", np.float64), ("modulator_indices", np.int32), ("decoding_indices", np.int32),
+              ("participant_indices", np.int32), ("message_type_indices", np.int32)]
+
+    def __init__(self, filename: str):
+        """
+        Open a sidecar file for reading
+
+        :raises ValueError: if the file is no message sidecar
+        """
+        self.filename = filename
+
+        with open(filename, "rb") as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError("{} is no message sidecar file".format(filename))
+            header_length = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+            header = json.loads(f.read(header_length).decode("utf-8"))
+
+        data_start = self.__align(len(self.MAGIC) + 8 + header_length)
+        self.num_messages = header["num_messages"]
+
+        self.__arrays = dict()
+        for name, dtype, offset, count in header["arrays"]:
+            if count == 0:
+                self.__arrays[name] = np.empty(0, dtype=dtype)
+            else:
+                self.__arrays[name] = np.memmap(filename, dtype=dtype, mode="r", offset=data_start + offset,
+                                                shape=(count,))
+        self.__open_sidecars.add(self)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.__arrays[name]
+
+    def __deepcopy__(self, memo):
+        # The file is read only, so copies of lazily loaded messages can share it
+        return self
+
+    def release(self):
+        """
+        Read the arrays into memory and unmap the file, e.g. so it can be replaced when saving to the same file.
+        Messages loading lazily from this sidecar keep working.
+        """
+        self.__arrays = {name: np.array(arr) for name, arr in self.__arrays.items()}
+        self.__open_sidecars.discard(self)
+
+    @classmethod
+    def release_file(cls, filename: str):
+        """
+        Release all sidecars mapping filename
+        """
+        filename = os.path.normcase(os.path.realpath(filename))
+        for sidecar in list(cls.__open_sidecars):
+            if os.path.normcase(os.path.realpath(sidecar.filename)) == filename:
+                sidecar.release()
+
+    def get_bit_length(self, index: int) -> int:
+        offsets = self.__arrays["bit_offsets"]
+        return int(offsets[index + 1] - offsets[index])
+
+    def get_bits(self, index: int) -> array.array:
+        offsets = self.__arrays["bit_offsets"]
+        start, end = int(offsets[index]), int(offsets[index + 1])
+        packed = self.__arrays["bits"][start // 8:(end + 7) // 8]
+        bits = np.unpackbits(packed)[start % 8:start % 8 + end - start]
+        return array.array("B", bits.tobytes())
+
+    def get_bits_loader(self, index: int):
+        return SidecarBits(self, index)
+
+    @classmethod
+    def get_filename(cls, xml_filename: str) -> str:
+        name = xml_filename[:-len(".xml")] if xml_filename.endswith(".xml") else xml_filename
+        return name + cls.FILE_EXTENSION
+
+    @classmethod
+    def write(cls, filename: str, messages: list, message_types: list, participants: list, decoders: list):
+        """
+        Write the bits and values of messages to a sidecar file.
+        The file is written to a temporary file first and then moved,
+        so messages still loading lazily from a previous version of the file are not affected.
+        Sidecars mapping the previous version get released first, as a mapped file cannot be replaced on Windows.
+
+        :param message_types: message types the message type indices refer to
+        :param participants: participants the participant indices refer to, -1 means no participant
+        :param decoders: decodings the decoding indices refer to
+        """
+        lengths = np.fromiter((len(msg) for msg in messages), dtype=np.int64, count=len(messages))
+        bits = np.frombuffer(b"".join(msg.plain_bits.tobytes() for msg in messages), dtype=np.uint8)
+
+        message_type_indices = {id(message_type): i for i, message_type in enumerate(message_types)}
+        participant_indices = {participant: i for i, participant in enumerate(participants)}
+
+        arrays = {
+            "bits": np.packbits(bits),
+            "bit_offsets": np.concatenate(([0], np.cumsum(lengths))),
+            "pauses": [msg.pause for msg in messages],
+            "timestamps": [msg.timestamp for msg in messages],
+            "rssis": [msg.rssi for msg in messages],
+            "modulator_indices": [msg.modulator_index for msg in messages],
+            "decoding_indices": [cls.__get_decoding_index(msg.decoder, decoders) for msg in messages],
+            "participant_indices": [participant_indices.get(msg.participant, -1) for msg in messages],
+            "message_type_indices": [message_type_indices.get(id(msg.message_type), 0) for msg in messages]
+        }
+
+        header_arrays, offset = [], 0
+        for name, dtype in cls.FIELDS:
+            arrays[name] = np.ascontiguousarray(arrays[name], dtype=np.dtype(dtype).newbyteorder("<"))
+            header_arrays.append([name, arrays[name].dtype.str, offset, len(arrays[name])])
+            offset = cls.__align(offset + arrays[name].nbytes)
+
+        header = json.dumps({"num_messages": len(messages), "arrays": header_arrays}).encode("utf-8")
+        data_start = cls.__align(len(cls.MAGIC) + 8 + len(header))
+
+        fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), suffix=cls.FILE_EXTENSION)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(cls.MAGIC)
+                f.write(np.uint64(len(header)).astype("<u8").tobytes())
+                f.write(header)
+                for name, dtype, offset, count in header_arrays:
+                    f.write(b"\0" * (data_start + offset - f.tell()))
+                    f.write(arrays[name].tobytes())
+            cls.release_file(filename)
+            os.replace(tmp_filename, filename)
+        except Exception:
+            os.remove(tmp_filename)
+            raise
+
+    @staticmethod
+    def __get_decoding_index(decoder, decoders: list) -> int:
+        if not decoders:
+            return 0
+
+        try:
+            return decoders.index(decoder)
+        except ValueError:
+            logger.warning("Failed to find '{}' in list of decodings".format(decoder.name))
+            return 0
+
+    @classmethod
+    def __align(cls, position: int) -> int:
+        return -(-position // cls.ALIGNMENT) * cls.ALIGNMENT
+
+
+class SidecarBits(object):
+    """
+    Plain bits of a message that are read from a sidecar file on first access
+    """
+
+    __slots__ = ["sidecar", "index"]
+
+    def __init__(self, sidecar: MessageSidecar, index: int):
+        self.sidecar = sidecar
+        self.index = index
+
+    def __len__(self):
+        return self.sidecar.get_bit_length(self.index)
+
+    def __call__(self) -> array.array:
+        return self.sidecar.get_bits(self.index)
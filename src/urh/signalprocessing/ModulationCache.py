@@ -0,0 +1,105 @@
+import array
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from urh import settings
+from urh.signalprocessing.IQArray import IQArray
+from urh.signalprocessing.Modulator import Modulator
+
+
+class ModulationCache(object):
+    """
+    Memory bounded cache of modulated waveforms, so messages that are sent repeatedly are only modulated once.
+
+    Waveforms are cached without their pause, as a pause only appends zeros, and are addressed by
+    the encoded bits, the modulator parameters, the data type and the start sample.
+    The start sample determines the carrier phase the waveform begins with, so a waveform modulated phase
+    continuously after another one is never reused for a different position.
+    The cache evicts the least recently used waveforms.
+    """
+
+    __default = None
+
+    def __init__(self, max_size: int = None):
+        """
+
+        :param max_size: maximum size of the cached waveforms in bytes
+        """
+        self.max_size = settings.MODULATION_CACHE_MAX_SIZE_MB * 1024 ** 2 if max_size is None else max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def get_default(cls):
+        if cls.__default is None:
+            cls.__default = cls()
+        return cls.__default
+
+    def __len__(self):
+        return len(self.__entries)
+
+    @staticmethod
+    def get_key(modulator: Modulator, bits, start: int, dtype) -> tuple:
+        parameters = (modulator.modulation_type, modulator.samples_per_symbol, modulator.bits_per_symbol,
+                      modulator.carrier_freq_hz, modulator.carrier_amplitude, modulator.carrier_phase_deg,
+                      modulator.sample_rate, tuple(modulator.parameters), modulator.gauss_bt,
+                      modulator.gauss_filter_width)
+        return bytes(bits), parameters, np.dtype(dtype).str, start
+
+    def modulate(self, modulator: Modulator, data, pause=0, start=0, dtype=None) -> IQArray:
+        """
+        Modulate data like Modulator.modulate, but reuse the waveform if it was modulated before.
+        The returned samples must not be modified, as they may be part of the cache.
+
+        """
+        if isinstance(data, str):
+            data = array.array("B", map(int, data))
+        elif isinstance(data, list):
+            data = array.array("B", data)
+
+        dtype = dtype or modulator.get_dtype()
+        key = self.get_key(modulator, data, start, dtype)
+
+        with self.__lock:
+            waveform = self.__entries.get(key, None)
+            if waveform is not None:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if waveform is None:
+            waveform = modulator.modulate(data, pause=0, start=start, dtype=dtype).data
+            waveform.flags.writeable = False
+            self.__put(key, waveform)
+
+        if pause == 0:
+            return IQArray(waveform)
+
+        result = np.zeros((len(waveform) + pause, 2), dtype=waveform.dtype)
+        result[:len(waveform)] = waveform
+        return IQArray(result)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.size = 0
+
+    def __put(self, key, waveform: np.ndarray):
+        if waveform.nbytes > self.max_size:
+            return
+
+        with self.__lock:
+            if key in self.__entries:
+                return
+            self.__entries[key] = waveform
+            self.size += waveform.nbytes
+
+            while self.size > self.max_size:
+                _, evicted = self.__entries.popitem(last=False)
+                self.size -= evicted.nbytes
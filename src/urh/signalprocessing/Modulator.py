@@ -1,7 +1,10 @@
 import array
 import locale
 import math
+import os
+import threading
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import numpy as np
 from PyQt5.QtGui import QPen
@@ -234,6 +237,73 @@ class Modulator(object):
                                              self.gauss_bt, self.gauss_filter_width)
         return IQArray(result)
 
+    @staticmethod
+    def modulate_batch(modulators: list, data: list, pauses: list, modulator_indices: list = None,
+                       buffer: IQArray = None, dtype=None, num_threads: int = None, progress_callback: callable = None,
+                       cancel_event: threading.Event = None, modulation_cache=None) -> tuple:
+        """
+        Modulate many messages in parallel threads into a single buffer.
+        The positions of all messages are computed up front, so every thread writes straight to its positions.
+        Threads run in parallel while modulate_c does the heavy work without the GIL.
+
+        :param modulators: modulators the modulator indices refer to
+        :param data: encoded bits of each message
+        :param pauses: pause in samples after each message
+        :param modulator_indices: modulator index of each message, defaults to the first modulator
+        :param buffer: buffer initialized with zeros to write to, allocated if not given
+        :param num_threads: number of threads, defaults to the number of CPUs
+        :param progress_callback: called from the calling thread with the number of modulated messages
+        :param cancel_event: modulation stops when this event gets set
+        :param modulation_cache: ModulationCache to reuse the waveforms of equal messages
+        :return: buffer and end positions of the messages including their pause, both None if cancelled
+        """
+        if modulator_indices is None:
+            modulator_indices = [0] * len(data)
+        dtype = dtype or Modulator.get_dtype()
+
+        lengths = np.fromiter((len(bits) // modulators[i].bits_per_symbol * modulators[i].samples_per_symbol
+                               for bits, i in zip(data, modulator_indices)), dtype=np.int64, count=len(data))
+        pauses = np.asarray(pauses, dtype=np.int64)
+        ends = np.cumsum(lengths + pauses)
+        starts = ends - lengths - pauses
+        if buffer is None:
+            buffer = IQArray(None, dtype=dtype, n=int(ends[-1]) if len(ends) > 0 else 0)
+
+        def modulate_range(first: int, last: int):
+            for i in range(first, last):
+                if cancel_event.is_set():
+                    return
+                modulator = modulators[modulator_indices[i]]
+                if modulation_cache is not None:
+                    modulated = modulation_cache.modulate(modulator, data[i], dtype=dtype)
+                else:
+                    modulated = modulator.modulate(data[i], pause=0, dtype=dtype)
+                # We do not need to modulate the pause extra, as buffer is already initialized with zeros
+                buffer[starts[i]:starts[i] + len(modulated)] = modulated
+
+        num_threads = num_threads or os.cpu_count() or 1
+        # Several ranges per thread to report progress and balance messages of different length
+        range_size = max(1, min(1024, len(data) // (16 * num_threads)))
+        cancel_event = cancel_event or threading.Event()
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            futures = {executor.submit(modulate_range, first, min(first + range_size, len(data))):
+                           min(range_size, len(data) - first) for first in range(0, len(data), range_size)}
+            num_modulated = 0
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    num_modulated += futures[future]
+                    if progress_callback is not None:
+                        progress_callback(num_modulated)
+            except BaseException:
+                # Stop the threads early, e.g. on KeyboardInterrupt
+                cancel_event.set()
+                raise
+
+        if cancel_event.is_set():
+            return None, None
+        return buffer, ends
+
     def get_default_parameters(self) -> array.array:
         if self.is_amplitude_based:
             parameters = np.linspace(0, 100, self.modulation_order, dtype=np.float32)
@@ -1,5 +1,6 @@
 import array
 import copy
+import os
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 
@@ -8,12 +9,16 @@ from PyQt5.QtCore import QObject, pyqtSignal, Qt
 
 from urh import settings
 from urh.cythonext import signal_functions
+from urh.signalprocessing.AnalysisCache import AnalysisCache
 from urh.signalprocessing.Encoding import Encoding
 from urh.signalprocessing.Message import Message
+from urh.signalprocessing.MessageColumns import MessageColumns
+from urh.signalprocessing.MessageSidecar import MessageSidecar
 from urh.signalprocessing.MessageType import MessageType
 from urh.signalprocessing.Modulator import Modulator
 from urh.signalprocessing.Participant import Participant
 from urh.signalprocessing.ProtocoLabel import ProtocolLabel
+from urh.signalprocessing.Ruleset import RulesetView
 from urh.signalprocessing.Signal import Signal
 from urh.util import util as urh_util, util
 from urh.util.Logger import logger
@@ -57,6 +62,9 @@ class ProtocolAnalyzer(object):
 
         self.message_types = [MessageType("Default")]
 
+        self.__ruleset_view = None  # type: RulesetView
+        self.__ruleset_results = dict()  # type: dict[tuple, np.ndarray]
+
     @property
     def default_message_type(self) -> MessageType:
         if len(self.message_types) == 0:
@@ -108,15 +116,15 @@ class ProtocolAnalyzer(object):
 
     @property
     def plain_bits_str(self):
-        return [str(msg) for msg in self.messages]
+        return self.get_view_strings(view=0, decoded=False)
 
     @property
     def plain_hex_str(self):
-        return [msg.plain_hex_str for msg in self.messages]
+        return self.get_view_strings(view=1, decoded=False)
 
     @property
     def plain_ascii_str(self):
-        return [msg.plain_ascii_str for msg in self.messages]
+        return self.get_view_strings(view=2, decoded=False)
 
     @property
     def decoded_bits(self):
@@ -128,7 +136,7 @@ class ProtocolAnalyzer(object):
 
         :rtype: list of str
         """
-        return [msg.decoded_bits_str for msg in self.messages]
+        return self.get_view_strings(view=0, decoded=True)
 
     @property
     def decoded_hex_str(self):
@@ -136,7 +144,7 @@ class ProtocolAnalyzer(object):
 
         :rtype: list of str
         """
-        return [msg.decoded_hex_str for msg in self.messages]
+        return self.get_view_strings(view=1, decoded=True)
 
     @property
     def decoded_ascii_str(self):
@@ -144,7 +152,7 @@ class ProtocolAnalyzer(object):
 
         :rtype: list of str
         """
-        return [msg.decoded_ascii_str for msg in self.messages]
+        return self.get_view_strings(view=2, decoded=True)
 
     @property
     def num_messages(self):
@@ -161,6 +169,103 @@ class ProtocolAnalyzer(object):
         elif view_type == 2:
             return self.decoded_ascii_str
 
+    @staticmethod
+    def __get_bit_chain_lengths(messages, bit_lengths: np.ndarray):
+        """
+        Calculate the lengths of the bit chains (see Message.split) for all messages at once.
+        Messages sharing a message type share their label alignments, so these are only computed once per type.
+
+        :return: chain lengths of all messages and number of chains per message
+        """
+        groups = dict()
+        for i, msg in enumerate(messages):
+            key = (id(msg.message_type), msg.align_labels)
+            if key not in groups:
+                alignments = Message.get_label_alignments(msg.message_type) if msg.align_labels else []
+                groups[key] = (alignments, [])
+            alignments, indices = groups[key]
+            msg.set_bit_alignments(alignments)
+            indices.append(i)
+
+        num_chains = np.empty(len(messages), dtype=np.int64)
+        for alignments, indices in groups.values():
+            num_chains[indices] = len(alignments) + 1
+
+        chain_starts = np.cumsum(num_chains) - num_chains
+        chain_lengths = np.empty(int(num_chains.sum()), dtype=np.int64)
+        for alignments, indices in groups.values():
+            indices = np.array(indices, dtype=np.int64)
+            lengths = bit_lengths[indices, np.newaxis]
+            boundaries = np.clip(np.array([0] + alignments, dtype=np.int64), 0, lengths)
+            boundaries = np.hstack((boundaries, lengths))
+            positions = chain_starts[indices, np.newaxis] + np.arange(len(alignments) + 1)
+            chain_lengths[positions] = np.maximum(np.diff(boundaries, axis=1), 0)
+
+        return chain_lengths, num_chains
+
+    def __get_view_symbols(self, view: int, decoded: bool, messages):
+        """
+        Concatenate the bit, hex or ascii symbols of all given messages.
+        Hex and ascii symbols are calculated for all messages at once with respect to the label alignments.
+
+        :return: symbols of all messages and number of symbols per message
+        """
+        bits = [msg.decoded_bits if decoded else msg.plain_bits for msg in messages]
+        all_bits = np.frombuffer(b"".join(b.tobytes() for b in bits), dtype=np.uint8)
+        bit_lengths = np.fromiter(map(len, bits), dtype=np.int64, count=len(bits))
+
+        if view == 0 or len(messages) == 0:
+            return all_bits, bit_lengths
+
+        chain_lengths, num_chains = self.__get_bit_chain_lengths(messages, bit_lengths)
+        symbols, num_symbols = urh_util.aggregate_bit_chains(all_bits, chain_lengths, size=4 if view == 1 else 8)
+        return symbols, np.add.reduceat(num_symbols, np.cumsum(num_chains) - num_chains)
+
+    def get_view_lengths(self, view: int, decoded=True, messages=None) -> np.ndarray:
+        """
+        Get the number of symbols of all messages for given view (0 = bits, 1 = hex, 2 = ascii)
+        without converting the messages.
+
+        """
+        messages = self.messages if messages is None else messages
+        bit_lengths = np.fromiter((len(msg.decoded_bits if decoded else msg.plain_bits) for msg in messages),
+                                  dtype=np.int64, count=len(messages))
+        if view == 0 or len(messages) == 0:
+            return bit_lengths
+
+        size = 4 if view == 1 else 8
+        chain_lengths, num_chains = self.__get_bit_chain_lengths(messages, bit_lengths)
+        return np.add.reduceat((chain_lengths + size - 1) // size, np.cumsum(num_chains) - num_chains)
+
+    def get_view_arrays(self, view: int, decoded=True, messages=None) -> list:
+        """
+        Get the symbols of all messages for given view (0 = bits, 1 = hex, 2 = ascii).
+        For bit view the bit arrays of the messages are returned,
+        otherwise the symbols of all messages are computed at once.
+
+        :rtype: list of array.array
+        """
+        messages = self.messages if messages is None else messages
+        if view == 0:
+            return [msg.decoded_bits if decoded else msg.plain_bits for msg in messages]
+
+        symbols, lengths = self.__get_view_symbols(view, decoded, messages)
+        data = symbols.tobytes()
+        ends = np.cumsum(lengths).tolist()
+        return [array.array("B", data[end - length:end]) for end, length in zip(ends, lengths.tolist())]
+
+    def get_view_strings(self, view: int, decoded=True, messages=None) -> list:
+        """
+        Get the string representation of all messages for given view (0 = bits, 1 = hex, 2 = ascii)
+
+        :rtype: list of str
+        """
+        messages = self.messages if messages is None else messages
+        symbols, lengths = self.__get_view_symbols(view, decoded, messages)
+        data = urh_util.symbols_to_string(symbols, view)
+        ends = np.cumsum(lengths).tolist()
+        return [data[end - length:end] for end, length in zip(ends, lengths.tolist())]
+
     def plain_to_string(self, view: int, show_pauses=True) -> str:
         """
 
@@ -222,6 +327,23 @@ class ProtocolAnalyzer(object):
         else:
             self.messages = []
 
+        cache = AnalysisCache.get_default() if settings.read("use_analysis_cache", False, bool) else None
+        if cache is not None:
+            cache.store_qad = settings.read("analysis_cache_store_qad", False, bool)
+        cached = cache.get(signal) if cache is not None else None
+        if cached is not None:
+            self.messages.extend(self.__messages_from_analysis_cache(cached, signal))
+        else:
+            self.__demodulate_messages(signal)
+            if cache is not None:
+                cache.put(signal, self.messages, qad=signal._qad)
+
+        if signal.sample_offset_map is not None:
+            self.__map_messages_to_original_capture(signal.sample_offset_map, signal.sample_rate)
+
+        self.qt_signals.protocol_updated.emit()
+
+    def __demodulate_messages(self, signal: Signal):
         samples_per_symbol = signal.samples_per_symbol
 
         ppseq = signal_functions.grab_pulse_lens(signal.qad, signal.center, signal.tolerance,
@@ -245,7 +367,56 @@ class ProtocolAnalyzer(object):
             self.messages.append(message)
             i += 1
 
-        self.qt_signals.protocol_updated.emit()
+    def __messages_from_analysis_cache(self, cached: dict, signal: Signal) -> list:
+        bit_offsets, pos_offsets = cached["bit_offsets"], cached["bit_sample_pos_offsets"]
+        bits = np.unpackbits(cached["bits"])[:bit_offsets[-1]]
+        bit_sample_pos = cached["bit_sample_pos"]
+
+        if "qad" in cached and signal._qad is None:
+            signal._qad = cached["qad"]
+
+        result = []
+        for i, (pause, rssi) in enumerate(zip(cached["pauses"].tolist(), cached["rssis"].tolist())):
+            result.append(Message(array.array("B", bits[bit_offsets[i]:bit_offsets[i + 1]].tobytes()), pause,
+                                  message_type=self.default_message_type,
+                                  samples_per_symbol=signal.samples_per_symbol, rssi=rssi, decoder=self.decoder,
+                                  bit_sample_pos=array.array("L", bit_sample_pos[pos_offsets[i]:pos_offsets[i + 1]].tolist()),
+                                  bits_per_symbol=signal.bits_per_symbol))
+        return result
+
+    def __map_messages_to_original_capture(self, offset_map, sample_rate: float):
+        """
+        Messages of a compacted capture get the pauses and timestamps they had in the original capture.
+        Their bit sample positions stay relative to the compacted capture as it is the one that is shown.
+
+        """
+        messages = [msg for msg in self.messages if len(msg.bit_sample_pos) > 0]
+        if len(messages) == 0:
+            return
+
+        compact_starts = np.array([msg.bit_sample_pos[0] for msg in messages], dtype=np.int64)
+        original_starts = offset_map.to_original(compact_starts)
+
+        # Pauses grow by the samples that were removed between two messages
+        removed = np.diff(original_starts) - np.diff(compact_starts)
+        for msg, removed_samples in zip(messages, removed.tolist()):
+            msg.pause += removed_samples
+
+        first_timestamp = messages[0].timestamp
+        for msg, original_start in zip(messages, original_starts.tolist()):
+            msg.timestamp = first_timestamp + (original_start - original_starts[0]) / sample_rate
+
+    def get_original_bit_sample_pos(self, message_index: int) -> np.ndarray:
+        """
+        Get the bit sample positions of a message in the original capture,
+        if the signal of this protocol is a compacted capture created by BurstIndex.extract
+
+        """
+        bit_sample_pos = self.messages[message_index].bit_sample_pos
+        offset_map = self.signal.sample_offset_map if self.signal is not None else None
+        if offset_map is None:
+            return np.array(bit_sample_pos, dtype=np.int64)
+        return offset_map.to_original(np.array(bit_sample_pos, dtype=np.int64))
 
     @staticmethod
     def __ensure_message_length_multiple(bit_data, samples_per_symbol: int, pauses, bit_sample_pos, divisor: int):
@@ -546,6 +717,36 @@ class ProtocolAnalyzer(object):
                 aggregated = urh_util.aggregate_bits(bits, size=8)
                 f.write(bytes(aggregated))
 
+    def to_npz(self, filename: str, use_decoded=True, participants=None):
+        """
+        Export all messages column wise to a .npz file, see MessageColumns
+
+        :param participants: participants the participant indices refer to,
+                             defaults to the participants of the messages
+        """
+        MessageColumns.write_npz(filename, self.messages, *self.__get_column_lookups(participants),
+                                 decoded=use_decoded)
+
+    def to_column_directory(self, directory: str, use_decoded=True, participants=None):
+        """
+        Export all messages column wise to a directory of memory mappable .npy files, see MessageColumns
+
+        :param participants: participants the participant indices refer to,
+                             defaults to the participants of the messages
+        """
+        MessageColumns.write_directory(directory, self.messages, *self.__get_column_lookups(participants),
+                                       decoded=use_decoded)
+
+    def __get_column_lookups(self, participants=None) -> tuple:
+        message_types = {id(mt): mt for mt in self.message_types}
+        for msg in self.messages:
+            message_types.setdefault(id(msg.message_type), msg.message_type)
+
+        if participants is None:
+            participants = list(dict.fromkeys(msg.participant for msg in self.messages
+                                              if msg.participant is not None))
+        return list(message_types.values()), participants
+
     def from_binary(self, filename: str):
         aggregated = np.fromfile(filename, dtype=np.uint8)
         unaggregated = [int(b) for n in aggregated for b in "{0:08b}".format(n)]
@@ -580,10 +781,30 @@ class ProtocolAnalyzer(object):
         return root
 
     def to_xml_file(self, filename: str, decoders, participants, tag_name="protocol",
-                    include_message_types=False, write_bits=False, modulators=None):
+                    include_message_types=False, write_bits=False, modulators=None, binary_sidecar=None):
+        """
+        Save the protocol to a XML file
+
+        :param binary_sidecar: Store the messages in a binary sidecar file next to the XML file,
+                               the XML then only holds the metadata. If None, a sidecar is used for protocols with
+                               at least settings.BINARY_SIDECAR_MIN_MESSAGES messages when writing bits.
+        """
+        if binary_sidecar is None:
+            binary_sidecar = write_bits and len(self.messages) >= settings.BINARY_SIDECAR_MIN_MESSAGES
+
         tag = self.to_xml_tag(decodings=decoders, participants=participants, tag_name=tag_name,
                               include_message_type=include_message_types, write_bits=write_bits,
-                              modulators=modulators)
+                              messages=[] if binary_sidecar else None, modulators=modulators)
+
+        if binary_sidecar:
+            sidecar_filename = MessageSidecar.get_filename(filename)
+            message_types = list({id(msg.message_type): msg.message_type for msg in self.messages}.values())
+            MessageSidecar.write(sidecar_filename, self.messages, message_types, participants, decoders)
+
+            messages_tag = tag.find("messages")
+            messages_tag.set("sidecar", os.path.basename(sidecar_filename))
+            for message_type in message_types:
+                messages_tag.append(message_type.to_xml())
 
         xmlstr = minidom.parseString(ET.tostring(tag)).toprettyxml(indent="   ")
         with open(filename, "w") as f:
@@ -591,7 +812,8 @@ class ProtocolAnalyzer(object):
                 if line.strip():
                     f.write(line + "\n")
 
-    def from_xml_tag(self, root: ET.Element, read_bits=False, participants=None, decodings=None):
+    def from_xml_tag(self, root: ET.Element, read_bits=False, participants=None, decodings=None,
+                     sidecar: MessageSidecar = None):
         if not root:
             return None
 
@@ -614,6 +836,10 @@ class ProtocolAnalyzer(object):
             if message_type not in self.message_types:
                 self.message_types.append(message_type)
 
+        if sidecar is not None and root.find("messages") is not None:
+            self.__read_messages_from_sidecar(sidecar, root.find("messages"), read_bits, participants, decoders)
+            return
+
         try:
             message_tags = root.find("messages").findall("message")
             for i, message_tag in enumerate(message_tags):
@@ -643,7 +869,60 @@ class ProtocolAnalyzer(object):
             return
 
         root = tree.getroot()
-        self.from_xml_tag(root, read_bits=read_bits)
+        sidecar_name = root.find("messages").get("sidecar", None) if root.find("messages") is not None else None
+        if sidecar_name:
+            try:
+                sidecar = MessageSidecar(os.path.join(os.path.dirname(filename), sidecar_name))
+            except (OSError, ValueError) as e:
+                logger.error("Could not read messages from {}: {}".format(sidecar_name, e))
+                return
+        else:
+            sidecar = None
+
+        self.from_xml_tag(root, read_bits=read_bits, sidecar=sidecar)
+
+    def __read_messages_from_sidecar(self, sidecar: MessageSidecar, messages_tag: ET.Element, read_bits: bool,
+                                     participants, decoders):
+        message_types = []
+        for message_type_tag in messages_tag.findall("message_type"):
+            message_type = MessageType.from_xml(message_type_tag)
+            # Share message types already known to the protocol as loading from message tags does
+            message_types.append(next((mt for mt in self.message_types if mt == message_type), message_type))
+
+        pauses, timestamps, rssis = sidecar["pauses"].tolist(), sidecar["timestamps"].tolist(), sidecar["rssis"].tolist()
+        modulator_indices = sidecar["modulator_indices"].tolist()
+        decoding_indices = sidecar["decoding_indices"].tolist()
+        participant_indices = sidecar["participant_indices"].tolist()
+        message_type_indices = sidecar["message_type_indices"].tolist()
+
+        for i in range(sidecar.num_messages):
+            try:
+                decoder = decoders[decoding_indices[i]] if decoders else None
+            except IndexError:
+                decoder = None
+
+            if read_bits:
+                # Passing the decoder avoids creating a default decoding for each message
+                message = Message([], pauses[i], self.default_message_type, decoder=decoder)
+                message.set_plain_bits_loader(sidecar.get_bits_loader(i))
+                self.messages.append(message)
+            elif i < len(self.messages):
+                message = self.messages[i]
+                message.pause = pauses[i]
+                if decoder is not None:
+                    message.decoder = decoder
+            else:
+                break  # Part of signal was copied in last session but signal was not saved
+
+            message.timestamp = timestamps[i]
+            message.rssi = rssis[i]
+            message.modulator_index = modulator_indices[i]
+
+            if 0 <= participant_indices[i] < len(participants):
+                message.participant = participants[participant_indices[i]]
+
+            if 0 <= message_type_indices[i] < len(message_types):
+                message.message_type = message_types[message_type_indices[i]]
 
     def eliminate(self):
         self.message_types = None
@@ -653,11 +932,29 @@ class ProtocolAnalyzer(object):
         self.signal = None
 
     def update_auto_message_types(self):
-        for message in self.messages:
-            for message_type in filter(lambda m: m.assigned_by_ruleset and len(m.ruleset) > 0, self.message_types):
-                if message_type.ruleset.applies_for_message(message):
-                    message.message_type = message_type
-                    break
+        """
+        Assign the first message type whose ruleset applies to each message.
+        Rulesets are evaluated for all messages at once and the results are cached until rules or messages change.
+        """
+        message_types = [mt for mt in self.message_types if mt.assigned_by_ruleset and len(mt.ruleset) > 0]
+        if len(message_types) == 0 or len(self.messages) == 0:
+            return
+
+        if self.__ruleset_view is None or not self.__ruleset_view.is_up_to_date(self.messages):
+            self.__ruleset_view = RulesetView(self.messages,
+                                              lambda value_type: self.get_view_strings(value_type, decoded=True))
+            self.__ruleset_results.clear()
+
+        assigned = np.zeros(len(self.messages), dtype=bool)
+        for message_type in message_types:
+            key = message_type.ruleset.key
+            if key not in self.__ruleset_results:
+                self.__ruleset_results[key] = message_type.ruleset.applies_for_view(self.__ruleset_view)
+
+            applies = self.__ruleset_results[key] & ~assigned
+            for i in np.flatnonzero(applies):
+                self.messages[i].message_type = message_type
+            assigned |= applies
 
     def auto_assign_labels(self):
         from urh.awre.FormatFinder import FormatFinder
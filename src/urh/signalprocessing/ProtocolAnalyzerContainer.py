@@ -149,9 +149,10 @@ class ProtocolAnalyzerContainer(ProtocolAnalyzer):
         raise NotImplementedError("Encoding can't be set in Generator!")
 
     def to_xml_file(self, filename: str, decoders, participants, tag_name="fuzz_profile",
-                    include_message_types=True, write_bits=True, modulators=None):
+                    include_message_types=True, write_bits=True, modulators=None, binary_sidecar=None):
         super().to_xml_file(filename=filename, decoders=decoders, participants=participants, tag_name=tag_name,
-                            include_message_types=include_message_types, write_bits=write_bits, modulators=modulators)
+                            include_message_types=include_message_types, write_bits=write_bits, modulators=modulators,
+                            binary_sidecar=binary_sidecar)
 
     def from_xml_file(self, filename: str, read_bits=True):
         super().from_xml_file(filename=filename, read_bits=read_bits)
@@ -0,0 +1,109 @@
+import re
+
+import numpy as np
+
+from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
+
+
+class ProtocolSearchIndex(object):
+    """
+    Search index over the bit, hex or ascii view of the messages of a protocol.
+
+    The views of all messages are joined to a single text with one line per message.
+    This text is built once and only extended for appended messages, so a search is a single regex scan in C
+    and the matches are mapped back to their messages with a binary search over the line starts.
+    """
+
+    SEPARATOR = "\n"
+    WILDCARD_CHARS = "?*"
+
+    def __init__(self, protocol: ProtocolAnalyzer, view: int, decoded=True):
+        self.protocol = protocol
+        self.view = view
+        self.decoded = decoded
+
+        self.__text = ""
+        self.__line_starts = np.zeros(1, dtype=np.int64)
+
+    @property
+    def num_indexed_messages(self) -> int:
+        return len(self.__line_starts) - 1
+
+    def update(self):
+        """
+        Index the messages that were appended to the protocol since the last update
+
+        """
+        messages = self.protocol.messages[self.num_indexed_messages:]
+        if len(messages) == 0:
+            return
+
+        lines = self.protocol.get_view_strings(self.view, decoded=self.decoded, messages=messages)
+        lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines)) + len(self.SEPARATOR)
+        self.__line_starts = np.append(self.__line_starts, self.__line_starts[-1] + np.cumsum(lengths))
+        self.__text += self.SEPARATOR.join(lines) + self.SEPARATOR
+
+    def supports_wildcards(self) -> bool:
+        # ASCII messages may contain the wildcard characters themselves
+        return self.view in (0, 1)
+
+    def compile(self, value: str, regex=False):
+        """
+        Compile a search value to a regular expression.
+        In wildcard patterns ? matches one symbol and * any number of symbols.
+
+        :raises re.error: if value is no valid regular expression
+        """
+        if regex:
+            # ^ and $ refer to the start and end of each message
+            return re.compile(value, re.MULTILINE)
+
+        return re.compile("".join(".*?" if c == "*" else "." if c == "?" else re.escape(c) for c in value))
+
+    def __find_spans(self, value: str, regex: bool, pos: int):
+        text = self.__text
+        if not regex and not (self.supports_wildcards() and any(c in value for c in self.WILDCARD_CHARS)):
+            # Plain substrings are found with str.find which is considerably faster than a regex search
+            start = text.find(value, pos)
+            while start != -1:
+                yield start, start + len(value)
+                start = text.find(value, start + 1)
+            return
+
+        pattern = self.compile(value, regex)
+        match = pattern.search(text, pos)
+        while match is not None:
+            start, end = match.span()
+            if end > start:
+                yield start, end
+            # Wildcard matches may overlap like plain substring matches do
+            match = pattern.search(text, start + 1 if not regex or end == start else end)
+
+    def find(self, value: str, regex=False, start_message=0) -> list:
+        """
+        Find a substring, wildcard pattern or regular expression in the indexed messages.
+        Substring and wildcard matches may overlap.
+
+        :param value: value to search
+        :param regex: interpret value as regular expression
+        :param start_message: only return matches from this message on
+        :return: list of (message index, start, end) tuples with positions relative to the message view
+        :raises re.error: if value is no valid regular expression
+        """
+        if len(value) == 0:
+            return []
+
+        self.update()
+        spans = np.array(list(self.__find_spans(value, regex, int(self.__line_starts[start_message]))),
+                         dtype=np.int64).reshape(-1, 2)
+        if len(spans) == 0:
+            return []
+
+        starts, ends = spans[:, 0], spans[:, 1]
+        messages = np.searchsorted(self.__line_starts, starts, side="right") - 1
+        line_starts = self.__line_starts[messages]
+
+        # Drop matches of regular expressions that span multiple messages
+        valid = ends < self.__line_starts[messages + 1]
+        return list(zip(messages[valid].tolist(), (starts - line_starts)[valid].tolist(),
+                        (ends - line_starts)[valid].tolist()))
@@ -2,6 +2,8 @@ import operator
 from enum import Enum
 import xml.etree.ElementTree as ET
 
+import numpy as np
+
 from urh.util.Logger import logger
 
 OPERATIONS = {
@@ -67,6 +69,44 @@ class Rule(object):
         data = message.decoded_bits_str if self.value_type == 0 else message.decoded_hex_str if self.value_type == 1 else message.decoded_ascii_str
         return OPERATIONS[self.operator](data[self.start:self.end], self.target_value)
 
+    @property
+    def key(self) -> tuple:
+        return self.start, self.end, self.operator, self.target_value, self.value_type
+
+    def applies_for_view(self, view: "RulesetView") -> np.ndarray:
+        """
+        Evaluate the rule for all messages at once.
+        The slices of all messages are compared with the target value lexicographically like python strings.
+
+        :return: boolean array with one entry per message
+        """
+        try:
+            target = np.frombuffer(self.target_value.encode("latin-1"), dtype=np.uint8)
+        except UnicodeEncodeError:
+            target = None
+
+        if target is None or self.start < 0 or self.end < 0:
+            return np.fromiter(map(self.applies_for_message, view.messages), dtype=bool, count=len(view.messages))
+
+        data, starts, lengths = view[self.value_type]
+
+        # Slices of all messages in one matrix, messages ending before the rule give shorter slices
+        width = max(min(self.end, int(lengths.max(initial=0))) - self.start, 0)
+        lengths = np.clip(lengths - self.start, 0, width)
+        indices = np.minimum(starts[:, np.newaxis] + self.start + np.arange(width), max(len(data) - 1, 0))
+        values = data[indices] if len(data) > 0 else np.zeros(indices.shape, dtype=np.uint8)
+
+        # Compare at the first differing symbol or by length if one slice is a prefix of the other
+        comparison = lengths - len(target)
+        n = min(width, len(target))
+        if n > 0:
+            differs = (values[:, :n] != target[:n]) & (np.arange(n) < lengths[:, np.newaxis])
+            first = np.argmax(differs, axis=1)
+            rows = np.flatnonzero(differs[np.arange(len(first)), first])
+            comparison[rows] = values[rows, first[rows]].astype(np.int64) - target[first[rows]]
+
+        return OPERATIONS[self.operator](np.sign(comparison), 0)
+
     @property
     def operator_description(self):
         return OPERATION_DESCRIPTION[self.operator]
@@ -113,6 +153,29 @@ class Ruleset(list):
         else:
             raise ValueError("Unknown behavior " + str(self.mode))
 
+    @property
+    def key(self) -> tuple:
+        return (self.mode,) + tuple(rule.key for rule in self)
+
+    def applies_for_view(self, view: "RulesetView") -> np.ndarray:
+        """
+        Evaluate the ruleset for all messages of a view at once
+
+        :return: boolean array with one entry per message
+        """
+        napplied_rules = np.zeros(len(view.messages), dtype=np.int64)
+        for rule in self:
+            napplied_rules += rule.applies_for_view(view)
+
+        if self.mode == Mode.all_apply:
+            return napplied_rules == len(self)
+        elif self.mode == Mode.atleast_one_applies:
+            return napplied_rules > 0
+        elif self.mode == Mode.none_applies:
+            return napplied_rules == 0
+        else:
+            raise ValueError("Unknown behavior " + str(self.mode))
+
     def to_xml(self) -> ET.Element:
         root = ET.Element("ruleset")
         root.set("mode", str(self.mode.value))
@@ -131,3 +194,70 @@ class Ruleset(list):
             return result
         else:
             return Ruleset(mode=Mode.all_apply)
+
+
+class RulesetView(object):
+    """
+    Decoded bit, hex and ascii strings of messages, each joined to a single byte array,
+    so rulesets can be evaluated for all messages at once.
+    """
+
+    def __init__(self, messages: list, get_view_strings):
+        """
+
+        :param messages: messages to evaluate rulesets for
+        :param get_view_strings: function returning the decoded strings of the messages for a
+                                 value type (0 = Bit, 1 = Hex, 2 = ASCII)
+        """
+        self.messages = messages[:]
+        self.get_view_strings = get_view_strings
+        self.__decoded_bits = [msg.decoded_bits for msg in self.messages]
+        self.__label_layouts = self.get_label_layouts(self.messages)
+        self.__views = dict()
+
+    def __getitem__(self, value_type: int):
+        """
+        :return: joined strings of all messages as uint8 array, start index and length of each message
+        """
+        if value_type not in self.__views:
+            strings = self.get_view_strings(value_type)
+            lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+            data = np.frombuffer("".join(strings).encode("latin-1"), dtype=np.uint8)
+            self.__views[value_type] = data, np.cumsum(lengths) - lengths, lengths
+
+        return self.__views[value_type]
+
+    def is_up_to_date(self, messages: list) -> bool:
+        """
+        Check if the view still reflects the messages. Editing or re-decoding a message creates new decoded bits.
+        Hex and ascii strings are aligned to the labels, so they also change with the message type,
+        its labels and the label alignment of a message.
+        """
+        if len(messages) != len(self.messages) or \
+                not all(msg is other and msg.decoded_bits is bits
+                        for msg, other, bits in zip(messages, self.messages, self.__decoded_bits)):
+            return False
+
+        return all(message_type is other_message_type and alignments == other_alignments
+                   for (message_type, alignments), (other_message_type, other_alignments)
+                   in zip(self.get_label_layouts(messages), self.__label_layouts))
+
+    @staticmethod
+    def get_label_layouts(messages: list) -> list:
+        """
+        Get the message type and the bit positions the views of each message are aligned to
+
+        :return: list of (message type, alignments), alignments are None if labels are not aligned
+        """
+        alignments = dict()
+        result = []
+        for msg in messages:
+            message_type = msg.message_type
+            if not msg.align_labels:
+                result.append((message_type, None))
+                continue
+
+            if id(message_type) not in alignments:
+                alignments[id(message_type)] = tuple(msg.get_label_alignments(message_type))
+            result.append((message_type, alignments[id(message_type)]))
+        return result
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+
+from urh.util.Logger import logger
+
+
+class SampleOffsetMap(object):
+    """
+    Map sample positions of a compacted capture, which only holds the bursts of a capture,
+    back to the sample positions in the original capture.
+
+    The compacted capture is a concatenation of regions of the original capture.
+    For each region the map stores where it starts in the compacted and in the original capture.
+    The map is only used while size, modification time and checksum of the compacted capture match the stored ones.
+    """
+
+    FILE_EXTENSION = ".offsets.npz"
+
+    def __init__(self, compact_starts, original_starts, original_num_samples: int, original_filename=""):
+        self.compact_starts = np.asarray(compact_starts, dtype=np.int64)
+        self.original_starts = np.asarray(original_starts, dtype=np.int64)
+        self.original_num_samples = int(original_num_samples)
+        self.original_filename = original_filename
+
+    def __len__(self):
+        return len(self.compact_starts)
+
+    def to_original(self, positions):
+        """
+        Map sample positions of the compacted capture to the original capture
+
+        :param positions: single position or array of positions
+        """
+        if len(self.compact_starts) == 0:
+            return positions
+
+        positions = np.asarray(positions, dtype=np.int64)
+        regions = np.maximum(np.searchsorted(self.compact_starts, positions, side="right") - 1, 0)
+        result = self.original_starts[regions] + (positions - self.compact_starts[regions])
+        return int(result) if result.ndim == 0 else result
+
+    @classmethod
+    def get_filename(cls, signal_filename: str) -> str:
+        return signal_filename + cls.FILE_EXTENSION
+
+    @classmethod
+    def load(cls, signal_filename: str):
+        """
+        Load the offset map of a compacted capture
+
+        :return: the offset map or None if the capture is not compacted or was changed after the map was saved
+        """
+        from urh.signalprocessing.BurstIndex import BurstIndex
+
+        filename = cls.get_filename(signal_filename)
+        if not os.path.isfile(filename):
+            return None
+
+        try:
+            with np.load(filename, allow_pickle=False) as data:
+                if not np.array_equal(data["file_info"], BurstIndex.get_file_info(signal_filename)):
+                    logger.warning("Ignoring sample offset map {}, "
+                                   "because the capture changed after it was saved".format(filename))
+                    return None
+                return cls(data["compact_starts"], data["original_starts"], int(data["original_num_samples"]),
+                           str(data["original_filename"]))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Could not read sample offset map {}: {}".format(filename, e))
+            return None
+
+    def save(self, signal_filename: str):
+        """
+        Save the map next to the compacted capture, which must be written before
+
+        """
+        from urh.signalprocessing.BurstIndex import BurstIndex
+
+        np.savez(self.get_filename(signal_filename), compact_starts=self.compact_starts,
+                 original_starts=self.original_starts, original_num_samples=self.original_num_samples,
+                 original_filename=self.original_filename, file_info=BurstIndex.get_file_info(signal_filename))
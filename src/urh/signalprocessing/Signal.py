@@ -1,16 +1,21 @@
+import hashlib
 import math
 import os
 import tarfile
 import wave
 
 import numpy as np
-from PyQt5.QtCore import pyqtSignal, QObject, QDir, Qt
+from PyQt5.QtCore import pyqtSignal, QObject, Qt
 from PyQt5.QtWidgets import QApplication
 
 import urh.cythonext.signal_functions as signal_functions
+from urh import settings
 from urh.ainterpretation import AutoInterpretation
+from urh.signalprocessing.BurstIndex import BurstIndex
+from urh.signalprocessing.CompressedIQFile import CompressedIQFile
 from urh.signalprocessing.Filter import Filter
 from urh.signalprocessing.IQArray import IQArray
+from urh.signalprocessing.SampleOffsetMap import SampleOffsetMap
 from urh.util import FileOperator
 from urh.util.Logger import logger
 
@@ -56,6 +61,7 @@ class Signal(QObject):
 
         self.wav_mode = filename.endswith(".wav")
         self.__changed = False
+        self.__content_hash = None
         if modulation is None:
             modulation = "FSK"
         self.__modulation_type = modulation
@@ -66,6 +72,9 @@ class Signal(QObject):
 
         self.__already_demodulated = False
 
+        self.burst_index = None  # type: BurstIndex
+        self.sample_offset_map = None  # type: SampleOffsetMap
+
         if len(filename) > 0:
             if self.wav_mode:
                 self.__load_wav_file(filename)
@@ -75,14 +84,28 @@ class Signal(QObject):
                 self.__load_complex_file(filename)
 
             self.filename = filename
-            self.noise_threshold = AutoInterpretation.detect_noise_level(self.iq_array.magnitudes)
+            self.sample_offset_map = SampleOffsetMap.load(filename)
+            if self.num_samples >= settings.BURST_INDEX_MIN_SAMPLES and settings.read("use_burst_index", False, bool):
+                self.burst_index = BurstIndex.load_or_create(filename, self.iq_array)
+                self.noise_threshold = self.burst_index.noise_level
+            else:
+                self.noise_threshold = AutoInterpretation.detect_noise_level(self.iq_array.magnitudes)
         else:
             self.filename = ""
 
     def __load_complex_file(self, filename: str):
-        self.iq_array = IQArray.from_file(filename)
+        if FileOperator.is_streamed_archive_member(filename):
+            dtype = IQArray.get_dtype_for_filename(filename)
+            self.iq_array = IQArray.from_buffer(FileOperator.read_archive_member(filename, dtype))
+        else:
+            self.iq_array = IQArray.from_file(filename)
 
-    def __load_wav_file(self, filename: str):
+    def __load_wav_file(self, filename: str, chunk_frames=2 ** 18):
+        """
+        Load a WAV file chunk by chunk into a preallocated float32 IQArray,
+        so only the temporaries of a single chunk are needed during conversion.
+
+        """
         wav = wave.open(filename, "r")
         num_channels, sample_width, sample_rate, num_frames, comptype, compname = wav.getparams()
 
@@ -97,40 +120,52 @@ class Signal(QObject):
         else:
             raise ValueError("Can't handle sample width {0}".format(sample_width))
 
-        params["center"] = (params["min"] + params["max"]) / 2
+        if num_channels not in (1, 2):
+            raise ValueError("Can't handle {0} channels. Only 1 and 2 are supported.".format(num_channels))
 
-        byte_frames = wav.readframes(num_frames * num_channels)
-        if sample_width == 3:
-            num_samples = len(byte_frames) // (sample_width * num_channels)
-            arr = np.empty((num_samples, num_channels, 4), dtype=np.uint8)
-            raw_bytes = np.frombuffer(byte_frames, dtype=np.uint8)
-            arr[:, :, :sample_width] = raw_bytes.reshape(-1, num_channels, sample_width)
-            arr[:, :, sample_width:] = (arr[:, :, sample_width - 1:sample_width] >> 7) * 255
-            data = arr.view(np.int32).flatten()
-        else:
-            data = np.frombuffer(byte_frames, dtype=params["fmt"])
+        params["center"] = (params["min"] + params["max"]) / 2
 
         self.iq_array = IQArray(None, np.float32, n=num_frames)
-        if num_channels == 1:
-            self.iq_array.real = np.multiply(1 / params["max"], np.subtract(data, params["center"]))
-            self.__already_demodulated = True
-        elif num_channels == 2:
-            self.iq_array.real = np.multiply(1 / params["max"], np.subtract(data[0::2], params["center"]))
-            self.iq_array.imag = np.multiply(1 / params["max"], np.subtract(data[1::2], params["center"]))
-        else:
-            raise ValueError("Can't handle {0} channels. Only 1 and 2 are supported.".format(num_channels))
+        pos = 0
+        while pos < num_frames:
+            byte_frames = wav.readframes(chunk_frames)
+            if len(byte_frames) == 0:
+                break
+
+            if sample_width == 3:
+                raw_bytes = np.frombuffer(byte_frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+                data = raw_bytes[:, 0] | (raw_bytes[:, 1] << 8) | (raw_bytes[:, 2] << 16)
+                data = (data << 8) >> 8  # sign extension
+            else:
+                data = np.frombuffer(byte_frames, dtype=params["fmt"])
+
+            data = data.reshape(-1, num_channels)
+            n = min(len(data), num_frames - pos)
+            self.iq_array[pos:pos + n, :num_channels] = np.multiply(1 / params["max"],
+                                                                     np.subtract(data[:n], params["center"]))
+            pos += n
 
         wav.close()
 
+        if pos < num_frames:
+            # File is shorter than announced in its header
+            self.iq_array = IQArray(self.iq_array[:pos])
+
+        self.__already_demodulated = num_channels == 1
         self.sample_rate = sample_rate
 
     def __load_compressed_complex(self, filename: str):
-        obj = tarfile.open(filename, "r")
-        members = obj.getmembers()
-        obj.extract(members[0], QDir.tempPath())
-        extracted_filename = os.path.join(QDir.tempPath(), obj.getnames()[0])
-        self.__load_complex_file(extracted_filename)
-        os.remove(extracted_filename)
+        if CompressedIQFile.is_chunked_file(filename):
+            self.iq_array = CompressedIQFile(filename).to_iq_array()
+            return
+
+        # Legacy format: bz2 compressed tar holding a single complex file, read straight into memory
+        with tarfile.open(filename, "r") as obj:
+            member = obj.getmembers()[0]
+            dtype = np.dtype(IQArray.get_dtype_for_filename(member.name))
+            data = np.empty(member.size // dtype.itemsize, dtype=dtype)
+            obj.extractfile(member).readinto(data)
+            self.iq_array = IQArray.from_buffer(data)
 
     @property
     def already_demodulated(self) -> bool:
@@ -358,10 +393,28 @@ class Signal(QObject):
 
     @changed.setter
     def changed(self, val: bool):
+        if val:
+            self.__content_hash = None
         if val != self.__changed:
             self.__changed = val
             self.saved_status_changed.emit()
 
+    @property
+    def content_hash(self) -> str:
+        """
+        Hash of the samples of a signal that is loaded from a file and unchanged, otherwise None.
+
+        """
+        if self.changed or not self.filename or self.iq_array is None:
+            return None
+
+        if self.__content_hash is None:
+            content_hash = hashlib.blake2b(digest_size=20)
+            content_hash.update(self.iq_array.dtype.str.encode())
+            content_hash.update(np.ascontiguousarray(self.iq_array.data).reshape(-1).view(np.uint8))
+            self.__content_hash = content_hash.hexdigest()
+        return self.__content_hash
+
     def save(self):
         if self.changed:
             self.save_as(self.filename)
@@ -423,6 +476,13 @@ class Signal(QObject):
                   else "OOK" if self.bits_per_symbol == 1 and self.modulation_type == "ASK"
                   else self.modulation_type}
 
+        if self.burst_index is not None and not self.changed:
+            # Bursts of the index were segmented with its noise level, so they can only be used with it
+            if detect_noise:
+                kwargs["noise"] = self.burst_index.noise_level
+            if kwargs["noise"] == self.burst_index.noise_level:
+                kwargs["message_indices"] = [tuple(burst) for burst in self.burst_index.bursts.tolist()]
+
         estimated_params = AutoInterpretation.estimate(self.iq_array, **kwargs)
         if estimated_params is None:
             return False
@@ -518,7 +578,7 @@ class Signal(QObject):
 
     def filter_range(self, start: int, end: int, fir_filter: Filter):
         self.iq_array[start:end] = fir_filter.work(self.iq_array[start:end])
-        self._qad[start:end] = signal_functions.afp_demod(self.iq_array[start:end],
+        self.qad[start:end] = signal_functions.afp_demod(self.iq_array[start:end],
                                                           self.noise_threshold,
                                                           self.modulation_type,
                                                           self.modulation_order,
@@ -526,6 +586,9 @@ class Signal(QObject):
         self.__invalidate_after_edit()
 
     def __invalidate_after_edit(self):
+        # Index and offset map refer to the samples of the file, which no longer match the edited signal
+        self.burst_index = None
+        self.sample_offset_map = None
         self.clear_parameter_cache()
         self.changed = True
         self.data_edited.emit()
@@ -0,0 +1,228 @@
+import array
+import math
+
+import numpy as np
+
+from urh.cythonext import signal_functions
+from urh.signalprocessing.IQArray import IQArray
+from urh.signalprocessing.Modulator import Modulator
+
+
+def stream_messages(modulator: Modulator, messages: list, block_size: int = 2 ** 16, dtype=None):
+    """
+    Modulate messages phase continuously in blocks, e.g. as generator function of a GeneratorSampleSource,
+    whose total number of samples is given by StreamingModulator.get_num_samples
+
+    :param messages: list of (bits, pause) tuples
+    """
+    return StreamingModulator(modulator, dtype).stream(messages, block_size)
+
+
+class StreamingModulator(object):
+    """
+    Modulate long or endless transmissions chunk by chunk with constant memory.
+
+    Modulator.modulate begins every call from scratch. The streaming modulator instead keeps
+    the carrier phase, the bits of an incomplete symbol and, for GFSK, the frequencies the gaussian filter
+    still needs across calls, so modulating data in chunks gives the same samples as modulating it at once.
+    The carrier phase is integrated from the instantaneous frequency and wrapped to [0, 2pi) after every call,
+    so it stays precise for transmissions of any length. During pauses it keeps advancing with the carrier frequency.
+
+    A message ends with a pause. Like in Modulator.modulate, the gaussian filter of GFSK does not reach over
+    the pause and bits of an incomplete symbol are dropped.
+    """
+
+    def __init__(self, modulator: Modulator, dtype=None):
+        if modulator.modulation_type == "OQPSK":
+            raise ValueError("OQPSK is not supported for streaming modulation")
+
+        self.modulator = modulator
+        self.dtype = dtype or Modulator.get_dtype()
+        self.reset()
+
+    @staticmethod
+    def get_num_samples(modulator: Modulator, messages) -> int:
+        """
+        Get the number of samples streaming the messages gives
+
+        :param messages: iterable of (bits, pause) tuples
+        """
+        num_samples, num_pending_bits = 0, 0
+        for bits, pause in messages:
+            num_pending_bits += len(bits)
+            num_samples += num_pending_bits // modulator.bits_per_symbol * modulator.samples_per_symbol
+            num_pending_bits %= modulator.bits_per_symbol
+            if pause > 0:
+                # A pause ends the message, so bits of an incomplete symbol are dropped
+                num_samples += pause
+                num_pending_bits = 0
+        return num_samples
+
+    def reset(self):
+        """
+        Start a new transmission with the current parameters of the modulator
+        """
+        self.num_samples = 0  # number of samples modulated so far
+        self.__phase = 0.0  # carrier phase of the last sample without phase offset
+        self.__pending_bits = np.empty(0, dtype=np.uint8)
+
+        modulator = self.modulator
+        if modulator.modulation_type == "GFSK":
+            self.__gauss_taps = signal_functions.gauss_fir(modulator.sample_rate, modulator.samples_per_symbol,
+                                                           modulator.gauss_bt, modulator.gauss_filter_width)
+            # The filter needs len(taps)//2 frequencies before and after each sample, so the frequencies of the
+            # last len(taps)//2 samples are kept and so are the frequencies of pending samples the filter waits for
+            self.__gauss_history = np.zeros(len(self.__gauss_taps) // 2, dtype=np.float64)
+        else:
+            self.__gauss_taps = self.__gauss_history = None
+
+    def modulate(self, data, pause=0) -> IQArray:
+        """
+        Modulate data phase continuously to the previous calls.
+
+        For GFSK, the last samples depend on the following symbols, so they are held back
+        until the next call, unless a pause ends the message.
+
+        :param data: bits to modulate
+        :param pause: pause in samples after the data, which ends the message
+        """
+        assert pause >= 0
+        samples = self.__modulate_bits(data)
+        if pause == 0:
+            return IQArray(samples)
+
+        tail = self.__end_message()
+        result = np.zeros((len(samples) + len(tail) + pause, 2), dtype=self.dtype)
+        result[:len(samples)] = samples
+        result[len(samples):len(samples) + len(tail)] = tail
+        self.__pause(pause)
+        return IQArray(result)
+
+    def flush(self) -> IQArray:
+        """
+        End the current message without pause and return the samples that were held back
+        """
+        return IQArray(self.__end_message())
+
+    def stream(self, messages, block_size: int):
+        """
+        Modulate messages one after another and yield the samples in blocks of block_size,
+        only the last block may be shorter. Pauses are written to the blocks without allocating them.
+
+        :param messages: iterable of (bits, pause) tuples, which may be endless
+        """
+        def parts():
+            for bits, pause in messages:
+                yield self.__modulate_bits(bits)
+                if pause > 0:
+                    yield self.__end_message()
+                    yield pause
+            yield self.__end_message()
+
+        block, filled = np.zeros((block_size, 2), dtype=self.dtype), 0
+        for samples in parts():
+            if not isinstance(samples, np.ndarray):
+                # The block is initialized with zeros, so only the phase advances for the pause
+                self.__pause(samples)
+                num_samples, samples = samples, None
+            else:
+                num_samples = len(samples)
+
+            pos = 0
+            while pos < num_samples:
+                n = min(block_size - filled, num_samples - pos)
+                if samples is not None:
+                    block[filled:filled + n] = samples[pos:pos + n]
+                filled += n
+                pos += n
+                if filled == block_size:
+                    yield IQArray(block)
+                    block, filled = np.zeros((block_size, 2), dtype=self.dtype), 0
+
+        if filled > 0:
+            yield IQArray(block[:filled])
+
+    def __modulate_bits(self, data) -> np.ndarray:
+        if isinstance(data, str):
+            data = array.array("B", map(int, data))
+
+        modulator = self.modulator
+        bits_per_symbol = modulator.bits_per_symbol
+        bits = np.concatenate((self.__pending_bits, np.asarray(data, dtype=np.uint8)))
+        num_symbols = len(bits) // bits_per_symbol
+        self.__pending_bits = bits[num_symbols * bits_per_symbol:]
+
+        weights = 1 << np.arange(bits_per_symbol - 1, -1, -1, dtype=np.int64)
+        indices = bits[:num_symbols * bits_per_symbol].reshape((num_symbols, bits_per_symbol)).dot(weights)
+        parameters = np.array(modulator.parameters, dtype=np.float64)[indices]
+
+        sps = modulator.samples_per_symbol
+        amplitude = modulator.carrier_amplitude * IQArray.min_max_for_dtype(self.dtype)[1]
+        frequencies, offsets = modulator.carrier_freq_hz, modulator.carrier_phase_deg * (math.pi / 180)
+
+        if modulator.modulation_type == "ASK":
+            amplitude = np.repeat(amplitude * parameters / 100, sps)
+        elif modulator.modulation_type == "FSK":
+            frequencies = np.repeat(parameters, sps)
+        elif modulator.modulation_type == "PSK":
+            offsets = np.repeat(parameters * (math.pi / 180), sps)
+        elif modulator.modulation_type == "GFSK":
+            return self.__synthesize(self.__gauss_filter(np.repeat(parameters, sps)), amplitude, offsets)
+
+        return self.__synthesize(frequencies, amplitude, offsets, num_symbols * sps)
+
+    def __gauss_filter(self, frequencies: np.ndarray) -> np.ndarray:
+        """
+        Filter the frequencies of new samples and return the filtered frequencies of all samples,
+        whose following frequencies are known
+        """
+        half_width = len(self.__gauss_taps) // 2
+        frequencies = np.concatenate((self.__gauss_history, frequencies))
+        num_filtered = max(0, len(frequencies) - 2 * half_width)
+        self.__gauss_history = frequencies[num_filtered:]
+        if num_filtered == 0:
+            return np.empty(0, dtype=np.float64)
+        return np.convolve(frequencies, self.__gauss_taps, mode="valid")
+
+    def __end_message(self) -> np.ndarray:
+        self.__pending_bits = self.__pending_bits[:0]
+        if self.__gauss_taps is None:
+            return np.empty((0, 2), dtype=self.dtype)
+
+        # Frequencies after the message are zero like for Modulator.modulate
+        half_width = len(self.__gauss_taps) // 2
+        frequencies = self.__gauss_filter(np.zeros(half_width, dtype=np.float64))
+        self.__gauss_history = np.zeros(half_width, dtype=np.float64)
+        return self.__synthesize(frequencies, self.modulator.carrier_amplitude *
+                                 IQArray.min_max_for_dtype(self.dtype)[1],
+                                 self.modulator.carrier_phase_deg * (math.pi / 180))
+
+    def __pause(self, num_samples: int):
+        self.__phase = (self.__phase + 2 * math.pi * self.modulator.carrier_freq_hz *
+                        num_samples / self.modulator.sample_rate) % (2 * math.pi)
+        self.num_samples += num_samples
+
+    def __synthesize(self, frequencies, amplitude, offsets, num_samples: int = None) -> np.ndarray:
+        if num_samples is None:
+            num_samples = len(frequencies)
+
+        result = np.empty((num_samples, 2), dtype=self.dtype)
+        if num_samples == 0:
+            return result
+
+        # Integrate the phase from the frequency of each sample
+        phases = np.empty(num_samples, dtype=np.float64)
+        phases[:] = frequencies
+        phases *= 2 * math.pi / self.modulator.sample_rate
+        if self.num_samples == 0:
+            # The first sample of the transmission starts with the carrier phase
+            phases[0] = 0
+        phases[0] += self.__phase
+        np.cumsum(phases, out=phases)
+        self.__phase = phases[-1] % (2 * math.pi)
+        self.num_samples += num_samples
+
+        phases += offsets
+        result[:, 0] = amplitude * np.cos(phases)
+        result[:, 1] = amplitude * np.sin(phases)
+        return result
@@ -12,6 +12,7 @@ from urh.dev.BackendHandler import BackendHandler, Backends
 from urh.dev.EndlessSender import EndlessSender
 from urh.signalprocessing.ChecksumLabel import ChecksumLabel
 from urh.signalprocessing.Message import Message
+from urh.signalprocessing.ModulationCache import ModulationCache
 from urh.signalprocessing.Modulator import Modulator
 from urh.signalprocessing.Participant import Participant
 from urh.signalprocessing.ProtocolSniffer import ProtocolSniffer
@@ -451,7 +452,8 @@ class Simulator(QObject):
 
     def send_message(self, message, repeat, sender, modulator_index):
         modulator = self.modulators[modulator_index]
-        modulated = modulator.modulate(message.encoded_bits, pause=message.pause, dtype=self.sender.device.data_type)
+        modulated = ModulationCache.get_default().modulate(modulator, message.encoded_bits, pause=message.pause,
+                                                          dtype=self.sender.device.data_type)
 
         curr_repeat = 0
 
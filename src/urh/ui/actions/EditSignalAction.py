@@ -58,8 +58,9 @@ class EditSignalAction(QUndoCommand):
             self.pre_crop_data = self.signal.iq_array[0:self.start]
             self.post_crop_data = self.signal.iq_array[self.end:]
             if self.cache_qad:
-                self.pre_crop_qad = self.signal._qad[0:self.start]
-                self.post_crop_qad = self.signal._qad[self.end:]
+                # Demodulated samples may not be available yet if the protocol was read from the analysis cache
+                self.pre_crop_qad = self.signal.qad[0:self.start]
+                self.post_crop_qad = self.signal.qad[self.end:]
         elif self.mode == EditAction.mute or self.mode == EditAction.filter:
             if self.mode == EditAction.mute:
                 self.setText("Mute Signal")
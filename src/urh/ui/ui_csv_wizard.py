@@ -67,7 +67,7 @@ class Ui_DialogCSVImport(object):
         self.tableWidgetPreview.horizontalHeader().setStretchLastSection(False)
         self.tableWidgetPreview.verticalHeader().setStretchLastSection(False)
         self.verticalLayout_2.addWidget(self.tableWidgetPreview)
-        self.gridLayout.addWidget(self.groupBox, 7, 0, 1, 3)
+        self.gridLayout.addWidget(self.groupBox, 9, 0, 1, 3)
         self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_2.setObjectName("horizontalLayout_2")
         self.lineEditFilename = QtWidgets.QLineEdit(DialogCSVImport)
@@ -91,7 +91,7 @@ class Ui_DialogCSVImport(object):
         self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
         self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
         self.buttonBox.setObjectName("buttonBox")
-        self.gridLayout.addWidget(self.buttonBox, 9, 2, 1, 1)
+        self.gridLayout.addWidget(self.buttonBox, 11, 2, 1, 1)
         self.groupBoxFilePreview = QtWidgets.QGroupBox(DialogCSVImport)
         self.groupBoxFilePreview.setObjectName("groupBoxFilePreview")
         self.verticalLayout = QtWidgets.QVBoxLayout(self.groupBoxFilePreview)
@@ -108,7 +108,27 @@ class Ui_DialogCSVImport(object):
         self.btnAutoDefault = QtWidgets.QPushButton(DialogCSVImport)
         self.btnAutoDefault.setDefault(True)
         self.btnAutoDefault.setObjectName("btnAutoDefault")
-        self.gridLayout.addWidget(self.btnAutoDefault, 10, 2, 1, 1)
+        self.gridLayout.addWidget(self.btnAutoDefault, 12, 2, 1, 1)
+        self.label_6 = QtWidgets.QLabel(DialogCSVImport)
+        self.label_6.setObjectName("label_6")
+        self.gridLayout.addWidget(self.label_6, 7, 0, 1, 2)
+        self.spinBoxSkipRows = QtWidgets.QSpinBox(DialogCSVImport)
+        self.spinBoxSkipRows.setMaximum(999999999)
+        self.spinBoxSkipRows.setObjectName("spinBoxSkipRows")
+        self.gridLayout.addWidget(self.spinBoxSkipRows, 7, 2, 1, 1)
+        self.label_7 = QtWidgets.QLabel(DialogCSVImport)
+        self.label_7.setObjectName("label_7")
+        self.gridLayout.addWidget(self.label_7, 8, 0, 1, 2)
+        self.spinBoxDecimation = QtWidgets.QSpinBox(DialogCSVImport)
+        self.spinBoxDecimation.setMinimum(1)
+        self.spinBoxDecimation.setMaximum(999999999)
+        self.spinBoxDecimation.setProperty("value", 1)
+        self.spinBoxDecimation.setObjectName("spinBoxDecimation")
+        self.gridLayout.addWidget(self.spinBoxDecimation, 8, 2, 1, 1)
+        self.progressBarImport = QtWidgets.QProgressBar(DialogCSVImport)
+        self.progressBarImport.setProperty("value", 0)
+        self.progressBarImport.setObjectName("progressBarImport")
+        self.gridLayout.addWidget(self.progressBarImport, 10, 0, 1, 3)
 
         self.retranslateUi(DialogCSVImport)
         self.buttonBox.accepted.connect(DialogCSVImport.accept)
@@ -120,7 +140,9 @@ class Ui_DialogCSVImport(object):
         DialogCSVImport.setTabOrder(self.btnAddSeparator, self.spinBoxIDataColumn)
         DialogCSVImport.setTabOrder(self.spinBoxIDataColumn, self.spinBoxQDataColumn)
         DialogCSVImport.setTabOrder(self.spinBoxQDataColumn, self.spinBoxTimestampColumn)
-        DialogCSVImport.setTabOrder(self.spinBoxTimestampColumn, self.tableWidgetPreview)
+        DialogCSVImport.setTabOrder(self.spinBoxTimestampColumn, self.spinBoxSkipRows)
+        DialogCSVImport.setTabOrder(self.spinBoxSkipRows, self.spinBoxDecimation)
+        DialogCSVImport.setTabOrder(self.spinBoxDecimation, self.tableWidgetPreview)
 
     def retranslateUi(self, DialogCSVImport):
         _translate = QtCore.QCoreApplication.translate
@@ -149,3 +171,9 @@ class Ui_DialogCSVImport(object):
         self.groupBoxFilePreview.setTitle(_translate("DialogCSVImport", "File Content (at most 100 rows)"))
         self.label_5.setText(_translate("DialogCSVImport", "File to import:"))
         self.btnAutoDefault.setText(_translate("DialogCSVImport", "Prevent Dialog From Close with Enter"))
+        self.label_6.setToolTip(_translate("DialogCSVImport", "<html><head/><body><p>Number of rows at the beginning of the file that are not imported, e.g. a header.</p></body></html>"))
+        self.label_6.setText(_translate("DialogCSVImport", "Skip Rows:"))
+        self.spinBoxSkipRows.setToolTip(_translate("DialogCSVImport", "<html><head/><body><p>Number of rows at the beginning of the file that are not imported, e.g. a header.</p></body></html>"))
+        self.label_7.setToolTip(_translate("DialogCSVImport", "<html><head/><body><p>Only import every n-th row to reduce the size of large files. The sample rate is reduced accordingly.</p></body></html>"))
+        self.label_7.setText(_translate("DialogCSVImport", "Decimation:"))
+        self.spinBoxDecimation.setToolTip(_translate("DialogCSVImport", "<html><head/><body><p>Only import every n-th row to reduce the size of large files. The sample rate is reduced accordingly.</p></body></html>"))
@@ -214,6 +214,8 @@ class Ui_GeneratorTab(object):
         self.cBoxModulations.setObjectName("cBoxModulations")
         self.cBoxModulations.addItem("")
         self.gridLayout_6.addWidget(self.cBoxModulations, 2, 1, 1, 1)
+        self.horizontalLayoutGeneration = QtWidgets.QHBoxLayout()
+        self.horizontalLayoutGeneration.setObjectName("horizontalLayoutGeneration")
         self.prBarGeneration = QtWidgets.QProgressBar(self.layoutWidget_2)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
@@ -222,7 +224,13 @@ class Ui_GeneratorTab(object):
         self.prBarGeneration.setSizePolicy(sizePolicy)
         self.prBarGeneration.setProperty("value", 0)
         self.prBarGeneration.setObjectName("prBarGeneration")
-        self.gridLayout_6.addWidget(self.prBarGeneration, 5, 0, 1, 1)
+        self.horizontalLayoutGeneration.addWidget(self.prBarGeneration)
+        self.btnCancelGeneration = QtWidgets.QToolButton(self.layoutWidget_2)
+        icon = QtGui.QIcon.fromTheme("process-stop")
+        self.btnCancelGeneration.setIcon(icon)
+        self.btnCancelGeneration.setObjectName("btnCancelGeneration")
+        self.horizontalLayoutGeneration.addWidget(self.btnCancelGeneration)
+        self.gridLayout_6.addLayout(self.horizontalLayoutGeneration, 5, 0, 1, 1)
         self.btnSend = QtWidgets.QPushButton(self.layoutWidget_2)
         self.btnSend.setEnabled(False)
         icon = QtGui.QIcon.fromTheme("media-playback-start")
@@ -373,6 +381,8 @@ class Ui_GeneratorTab(object):
         self.labelBitsPerSymbol.setText(_translate("GeneratorTab", "TextLabel"))
         self.cBoxModulations.setItemText(0, _translate("GeneratorTab", "MyModulation"))
         self.prBarGeneration.setFormat(_translate("GeneratorTab", "Modulating %p%"))
+        self.btnCancelGeneration.setToolTip(_translate("GeneratorTab", "Cancel modulation"))
+        self.btnCancelGeneration.setText(_translate("GeneratorTab", "Cancel"))
         self.btnSend.setText(_translate("GeneratorTab", "Send data..."))
         self.btnEditModulation.setText(_translate("GeneratorTab", "Edit ..."))
         self.lModulation.setText(_translate("GeneratorTab", "Modulation:"))
@@ -282,6 +282,15 @@ class Ui_DialogOptions(object):
         self.doubleSpinBoxRAMThreshold.setMaximum(100.0)
         self.doubleSpinBoxRAMThreshold.setObjectName("doubleSpinBoxRAMThreshold")
         self.gridLayout_3.addWidget(self.doubleSpinBoxRAMThreshold, 1, 1, 1, 1)
+        self.checkBoxAnalysisCache = QtWidgets.QCheckBox(self.tabDevices)
+        self.checkBoxAnalysisCache.setObjectName("checkBoxAnalysisCache")
+        self.gridLayout_3.addWidget(self.checkBoxAnalysisCache, 2, 0, 1, 2)
+        self.checkBoxAnalysisCacheStoreQad = QtWidgets.QCheckBox(self.tabDevices)
+        self.checkBoxAnalysisCacheStoreQad.setObjectName("checkBoxAnalysisCacheStoreQad")
+        self.gridLayout_3.addWidget(self.checkBoxAnalysisCacheStoreQad, 3, 0, 1, 2)
+        self.checkBoxBurstIndex = QtWidgets.QCheckBox(self.tabDevices)
+        self.checkBoxBurstIndex.setObjectName("checkBoxBurstIndex")
+        self.gridLayout_3.addWidget(self.checkBoxBurstIndex, 4, 0, 1, 2)
         self.verticalLayout_8.addLayout(self.gridLayout_3)
         self.tabWidget.addTab(self.tabDevices, "")
         self.verticalLayout_6.addWidget(self.tabWidget)
@@ -347,5 +356,11 @@ class Ui_DialogOptions(object):
         self.spinBoxNumSendingRepeats.setSpecialValueText(_translate("DialogOptions", "Infinite"))
         self.label_5.setText(_translate("DialogOptions", "Use this percentage of available RAM for buffer allocation:"))
         self.doubleSpinBoxRAMThreshold.setSuffix(_translate("DialogOptions", "%"))
+        self.checkBoxAnalysisCache.setToolTip(_translate("DialogOptions", "<html><head/><body><p>Store demodulated messages of signals in the cache directory of your user, so opening the same signal with the same demodulation parameters again does not demodulate it again.</p></body></html>"))
+        self.checkBoxAnalysisCache.setText(_translate("DialogOptions", "Cache demodulated messages across sessions"))
+        self.checkBoxAnalysisCacheStoreQad.setToolTip(_translate("DialogOptions", "<html><head/><body><p>Additionally store the demodulated samples of signals in the analysis cache, so they need not be demodulated again for the demodulated view. This takes four bytes per sample.</p></body></html>"))
+        self.checkBoxAnalysisCacheStoreQad.setText(_translate("DialogOptions", "Also cache demodulated samples"))
+        self.checkBoxBurstIndex.setToolTip(_translate("DialogOptions", "<html><head/><body><p>Store the noise level and bursts of signals with at least 10 million samples in a file next to the signal, so opening them again does not need to detect them again.</p></body></html>"))
+        self.checkBoxBurstIndex.setText(_translate("DialogOptions", "Index bursts of large signals"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tabDevices), _translate("DialogOptions", "Device"))
 from urh.ui.KillerDoubleSpinBox import KillerDoubleSpinBox
@@ -1,7 +1,9 @@
+import copy
+import io
 import os
 import shutil
 import tarfile
-import tempfile
+import time
 import zipfile
 
 import numpy as np
@@ -14,6 +16,14 @@ archives = {}
 """:type: dict of [str, str]
    :param: archives[extracted_filename] = filename"""
 
+archive_members = {}
+""":type: dict of [str, str]
+   :param: archive_members[extracted_filename] = name of the member in the archive"""
+
+# Members with raw samples are not extracted but streamed from the archive when the signal gets loaded
+STREAMED_ARCHIVE_MEMBER_EXTENSIONS = (".complex", ".complex16u", ".cu8", ".complex16s", ".cs8",
+                                      ".complex32u", ".cu16", ".complex32s", ".cs16")
+
 RECENT_PATH = QDir.homePath()
 
 SIGNAL_FILE_EXTENSIONS_BY_TYPE = {
@@ -42,6 +52,7 @@ COMPRESSED_COMPLEX_FILE_FILTER = "Compressed Complex File (*.coco)"
 WAV_FILE_FILTER = "Waveform Audio File Format (*.wav *.wave)"
 PROTOCOL_FILE_FILTER = "Protocol (*.proto.xml *.proto)"
 BINARY_PROTOCOL_FILE_FILTER = "Binary Protocol (*.bin)"
+NUMPY_PROTOCOL_FILE_FILTER = "NumPy Message Columns (*.npz)"
 PLAIN_BITS_FILE_FILTER = "Plain Bits (*.txt)"
 FUZZING_FILE_FILTER = "Fuzzing Profile (*.fuzz.xml *.fuzz)"
 SIMULATOR_FILE_FILTER = "Simulator Profile (*.sim.xml *.sim)"
@@ -93,7 +104,7 @@ def ask_save_file_name(initial_name: str, caption="Save signal", selected_name_f
     elif caption == "Export spectrogram":
         name_filter = "Frequency Time (*.ft);;Frequency Time Amplitude (*.fta)"
     elif caption == "Save protocol":
-        name_filter = ";;".join([PROTOCOL_FILE_FILTER, BINARY_PROTOCOL_FILE_FILTER])
+        name_filter = ";;".join([PROTOCOL_FILE_FILTER, BINARY_PROTOCOL_FILE_FILTER, NUMPY_PROTOCOL_FILE_FILTER])
     elif caption == "Export demodulated":
         name_filter = WAV_FILE_FILTER
     else:
@@ -153,6 +164,10 @@ def save_data(data, filename: str, sample_rate=1e6, num_channels=2):
     if not isinstance(data, IQArray):
         data = IQArray(data)
 
+    if is_streamed_archive_member(filename):
+        replace_archive_member(filename, data.convert_to(IQArray.get_dtype_for_filename(filename)))
+        return
+
     if filename.endswith(".wav"):
         data.export_to_wav(filename, num_channels, sample_rate)
     elif filename.endswith(".coco"):
@@ -161,52 +176,148 @@ def save_data(data, filename: str, sample_rate=1e6, num_channels=2):
         data.tofile(filename)
 
     if filename in archives.keys():
-        archive = archives[filename]
-        if archive.endswith("zip"):
-            rewrite_zip(archive)
-        elif archive.endswith("tar") or archive.endswith("bz2") or archive.endswith("gz"):
-            rewrite_tar(archive)
+        replace_archive_member(filename)
 
 
 def save_signal(signal):
     save_data(signal.iq_array.data, signal.filename, signal.sample_rate)
 
 
-def rewrite_zip(zip_name):
-    tempdir = tempfile.mkdtemp()
-    try:
-        temp_name = os.path.join(tempdir, 'new.zip')
-        files_in_archive = [f for f in archives.keys() if archives[f] == zip_name]
-        with zipfile.ZipFile(temp_name, 'w') as zip_write:
-            for filename in files_in_archive:
-                zip_write.write(filename)
-        shutil.move(temp_name, zip_name)
-    finally:
-        shutil.rmtree(tempdir)
-
-
-def rewrite_tar(tar_name: str):
-    tempdir = tempfile.mkdtemp()
-    compression = ""
-    if tar_name.endswith("gz"):
-        compression = "gz"
-    elif tar_name.endswith("bz2"):
-        compression = "bz2"
+def file_exists(filename: str) -> bool:
+    return is_streamed_archive_member(filename) or os.path.exists(filename)
+
+
+def is_streamed_archive_member(filename: str) -> bool:
+    return filename in archive_members and filename.endswith(STREAMED_ARCHIVE_MEMBER_EXTENSIONS)
+
+
+def read_archive_member(filename: str, dtype) -> np.ndarray:
+    """
+    Stream a member of an archive straight into a numpy array without extracting it to disk
+
+    :param filename: name of the extracted member as returned by uncompress_archives
+    """
+    archive, member_name = archives[filename], archive_members[filename]
+    dtype = np.dtype(dtype)
+
+    if archive.endswith(".zip"):
+        with zipfile.ZipFile(archive) as obj:
+            info = obj.getinfo(member_name)
+            result = np.empty(info.file_size // dtype.itemsize, dtype=dtype)
+            with obj.open(info) as f:
+                __read_into(f, result)
+    else:
+        with tarfile.open(archive, "r") as obj:
+            member = obj.getmember(member_name)  # the last member with this name if it was replaced
+            result = np.empty(member.size // dtype.itemsize, dtype=dtype)
+            with obj.extractfile(member) as f:
+                __read_into(f, result)
+
+    return result
+
+
+def __read_into(f, data: np.ndarray):
+    buffer = memoryview(data).cast("B")
+    pos = 0
+    while pos < len(buffer):
+        n = f.readinto(buffer[pos:])
+        if not n:
+            raise EOFError("Archive member ended after {} of {} bytes".format(pos, len(buffer)))
+        pos += n
+
+
+def replace_archive_member(filename: str, data: np.ndarray = None):
+    """
+    Replace a single member of an archive.
+
+    Members of uncompressed tar archives are overwritten in place if the new content occupies as many blocks.
+    Otherwise the archive is rewritten to a temporary file next to it,
+    where all other members are copied over straight from the old archive.
+
+    :param filename: name of the extracted member as returned by uncompress_archives
+    :param data: new content of the member, if None the extracted file is read from disk
+    """
+    archive, member_name = archives[filename], archive_members[filename]
+
+    if data is None:
+        size = os.path.getsize(filename)
+        open_content = lambda: open(filename, "rb")
+    else:
+        size = data.nbytes
+        open_content = lambda: io.BytesIO(data.tobytes())
+
+    if archive.endswith(".tar") and __replace_tar_member_in_place(archive, member_name, size, open_content):
+        return
+
+    tmp_name = "{}.{}.tmp".format(archive, os.getpid())
     try:
-        ext = "" if len(compression) == 0 else "." + compression
-        temp_name = os.path.join(tempdir, 'new.tar' + ext)
-        files_in_archive = [f for f in archives.keys() if archives[f] == tar_name]
-        with tarfile.open(temp_name, 'w:' + compression) as tar_write:
-            for file in files_in_archive:
-                tar_write.add(file)
-        shutil.move(temp_name, tar_name)
-    finally:
-        shutil.rmtree(tempdir)
+        if archive.endswith(".zip"):
+            with zipfile.ZipFile(archive) as zip_read, zipfile.ZipFile(tmp_name, "w") as zip_write:
+                for info in zip_read.infolist():
+                    new_info = copy.copy(info)
+                    if info.filename != member_name:
+                        with zip_read.open(info) as src, zip_write.open(new_info, "w") as dst:
+                            shutil.copyfileobj(src, dst)
+                    else:
+                        new_info.file_size = size
+                        new_info.date_time = time.localtime()[:6]
+                        with open_content() as src, zip_write.open(new_info, "w") as dst:
+                            shutil.copyfileobj(src, dst)
+        else:
+            compression = "gz" if archive.endswith("gz") else "bz2" if archive.endswith("bz2") else ""
+            with tarfile.open(archive, "r") as tar_read, tarfile.open(tmp_name, "w:" + compression) as tar_write:
+                replaced = False
+                for member in tar_read:
+                    if member.name != member_name:
+                        tar_write.addfile(member, tar_read.extractfile(member) if member.isfile() else None)
+                    elif not replaced:
+                        with open_content() as content:
+                            tar_write.addfile(__create_tar_info(member_name, size, member), content)
+                        replaced = True
+
+        os.replace(tmp_name, archive)
+    except Exception:
+        if os.path.isfile(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def __replace_tar_member_in_place(archive: str, member_name: str, size: int, open_content) -> bool:
+    """
+    Overwrite header and content of a member of an uncompressed tar archive,
+    which is only possible if the new header and content have the same number of blocks as the old ones.
+
+    :return: True if the member was replaced
+    """
+    with tarfile.open(archive, "r") as obj:
+        member = obj.getmember(member_name)
+        info = __create_tar_info(member_name, size, member)
+        info.mtime = int(info.mtime)  # a float mtime needs an extended header
+        header = info.tobuf(obj.format, obj.encoding, obj.errors)
+
+    num_blocks = lambda n: -(-n // tarfile.BLOCKSIZE)
+    if num_blocks(size) != num_blocks(member.size) or len(header) != member.offset_data - member.offset:
+        return False
+
+    with open(archive, "r+b") as f, open_content() as content:
+        f.seek(member.offset)
+        f.write(header)
+        shutil.copyfileobj(content, f)
+        f.write(bytes(num_blocks(size) * tarfile.BLOCKSIZE - size))
+    return True
+
+
+def __create_tar_info(name: str, size: int, template: tarfile.TarInfo = None) -> tarfile.TarInfo:
+    info = copy.copy(template) if template is not None else tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = time.time()
+    return info
 
 
 def uncompress_archives(file_names, temp_dir):
     """
     Extract each archive from the list of filenames.
+    Members holding raw samples are not extracted, as they get streamed from the archive when loaded.
     Normal files stay untouched.
     Add all files to the Recent Files.
     :type file_names: list of str
@@ -216,29 +327,34 @@ def uncompress_archives(file_names, temp_dir):
     result = []
     for filename in file_names:
         if filename.endswith(".tar") or filename.endswith(".tar.gz") or filename.endswith(".tar.bz2"):
-            obj = tarfile.open(filename, "r")
-            extracted_file_names = []
-            for j, member in enumerate(obj.getmembers()):
-                obj.extract(member, temp_dir)
-                extracted_filename = os.path.join(temp_dir, obj.getnames()[j])
-                extracted_file_names.append(extracted_filename)
-                archives[extracted_filename] = filename
-            result.extend(extracted_file_names[:])
+            with tarfile.open(filename, "r") as obj:
+                # Later members supersede earlier ones with the same name
+                members = {member.name: member for member in obj.getmembers() if member.isfile()}
+                for member in members.values():
+                    if not member.name.endswith(STREAMED_ARCHIVE_MEMBER_EXTENSIONS):
+                        obj.extract(member, temp_dir)
+                    result.append(__add_archive_member(filename, member.name, temp_dir))
         elif filename.endswith(".zip"):
-            obj = zipfile.ZipFile(filename)
-            extracted_file_names = []
-            for j, info in enumerate(obj.infolist()):
-                obj.extract(info, path=temp_dir)
-                extracted_filename = os.path.join(temp_dir, obj.namelist()[j])
-                extracted_file_names.append(extracted_filename)
-                archives[extracted_filename] = filename
-            result.extend(extracted_file_names[:])
+            with zipfile.ZipFile(filename) as obj:
+                for info in obj.infolist():
+                    if info.is_dir():
+                        continue
+                    if not info.filename.endswith(STREAMED_ARCHIVE_MEMBER_EXTENSIONS):
+                        obj.extract(info, path=temp_dir)
+                    result.append(__add_archive_member(filename, info.filename, temp_dir))
         else:
             result.append(filename)
 
     return result
 
 
+def __add_archive_member(archive: str, member_name: str, temp_dir: str) -> str:
+    extracted_filename = os.path.join(temp_dir, member_name)
+    archives[extracted_filename] = archive
+    archive_members[extracted_filename] = member_name
+    return extracted_filename
+
+
 def get_directory():
     directory = QFileDialog.getExistingDirectory(None, "Choose Directory", QDir.homePath(),
                                                  QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks)
@@ -41,6 +41,12 @@ class ProjectManager(QObject):
         self.simulator_error_handling_index = 2
 
         self.__project_file = None
+        self.__project_tree = None  # type: ET.ElementTree
+        self.__project_tree_stat = None
+
+        # Tags of project file sections with the key of their content at the last save
+        self.__sections = dict()  # type: dict[str, tuple]
+        self.__saved_project_key = None
 
         self.__modulators = [Modulator("Modulator")]  # type: list[Modulator]
 
@@ -201,7 +207,7 @@ class ProjectManager(QObject):
         if self.project_file is None:
             return None
 
-        tree = ET.parse(self.project_file)
+        tree = self.read_project_tree()
         root = tree.getroot()
         result = []
         for msg_type_tag in root.find("protocol").find("message_types").findall("message_type"):
@@ -232,11 +238,10 @@ class ProjectManager(QObject):
 
             if self.project_file is not None:
                 root = ET.Element("UniversalRadioHackerProject")
-                tree = ET.ElementTree(root)
-                tree.write(self.project_file)
+                self.__write_project_tree(root)
                 self.modulation_was_edited = False
         else:
-            tree = ET.parse(self.project_file)
+            tree = self.read_project_tree()
             root = tree.getroot()
 
             collapse_project_tabs = bool(int(root.get("collapse_project_tabs", 0)))
@@ -290,53 +295,94 @@ class ProjectManager(QObject):
         self.project_file = os.path.join(self.project_path, settings.PROJECT_FILE)
         self.main_controller.show_project_settings()
 
-    def write_signal_information_to_project_file(self, signal: Signal, tree=None):
-        if self.project_file is None or signal is None or len(signal.filename) == 0:
-            return
+    def read_project_tree(self) -> ET.ElementTree:
+        """
+        Parse the project file. The parsed tree is cached until the file changes on disk.
 
-        if tree is None:
-            tree = ET.parse(self.project_file)
+        """
+        stat = os.stat(self.project_file)
+        stat_key = (self.project_file, stat.st_mtime_ns, stat.st_size)
+        if self.__project_tree is None or self.__project_tree_stat != stat_key:
+            self.__project_tree = ET.parse(self.project_file)
+            self.__project_tree_stat = stat_key
+            self.__saved_project_key = None
+        return self.__project_tree
+
+    def __write_project_tree(self, root: ET.Element, project_key=None):
+        util.write_xml_to_file(root, self.project_file)
+        stat = os.stat(self.project_file)
+        self.__project_tree = ET.ElementTree(root)
+        self.__project_tree_stat = (self.project_file, stat.st_mtime_ns, stat.st_size)
+        self.__saved_project_key = project_key
 
-        root = tree.getroot()
+    def __get_section(self, name: str, key, create_tag):
+        """
+        Get the tag of a project file section. The tag is only created again if its key changed since the last save.
 
-        existing_filenames = {}
+        :param create_tag: function creating the tag of the section
+        """
+        try:
+            cached_key, tag = self.__sections[name]
+            if cached_key == key:
+                return tag
+        except KeyError:
+            pass
 
-        for signal_tag in root.iter("signal"):
-            existing_filenames[signal_tag.attrib["filename"]] = signal_tag
+        tag = create_tag()
+        self.__sections[name] = (key, tag)
+        return tag
 
+    def __get_signal_attributes(self, signal: Signal) -> dict:
         try:
             file_path = os.path.relpath(signal.filename, self.project_path)
         except ValueError:
             # Can happen e.g. on Windows when Project is in C:\ and signal on D:\
             file_path = signal.filename
 
-        if file_path in existing_filenames.keys():
-            signal_tag = existing_filenames[file_path]
-        else:
+        return {
+            "name": signal.name,
+            "filename": file_path,
+            "samples_per_symbol": str(signal.samples_per_symbol),
+            "center": str(signal.center),
+            "center_spacing": str(signal.center_spacing),
+            "tolerance": str(signal.tolerance),
+            "noise_threshold": str(signal.noise_threshold),
+            "noise_minimum": str(signal.noise_min_plot),
+            "noise_maximum": str(signal.noise_max_plot),
+            "modulation_type": str(signal.modulation_type),
+            "sample_rate": str(signal.sample_rate),
+            "pause_threshold": str(signal.pause_threshold),
+            "message_length_divisor": str(signal.message_length_divisor),
+            "bits_per_symbol": str(signal.bits_per_symbol),
+            "costas_loop_bandwidth": str(signal.costas_loop_bandwidth),
+        }
+
+    @staticmethod
+    def __set_signal_tag_attributes(signal_tag: ET.Element, attributes: dict):
+        for key, value in attributes.items():
+            signal_tag.set(key, value)
+
+        if signal_tag.find("messages") is None:
+            ET.SubElement(signal_tag, "messages")
+
+    def write_signal_information_to_project_file(self, signal: Signal, tree=None):
+        if self.project_file is None or signal is None or len(signal.filename) == 0:
+            return
+
+        if tree is None:
+            tree = self.read_project_tree()
+
+        root = tree.getroot()
+        attributes = self.__get_signal_attributes(signal)
+        signal_tag = next((tag for tag in root.iter("signal") if tag.get("filename") == attributes["filename"]), None)
+        if signal_tag is None:
             # Create new tag
             signal_tag = ET.SubElement(root, "signal")
 
-        signal_tag.set("name", signal.name)
-        signal_tag.set("filename", file_path)
-        signal_tag.set("samples_per_symbol", str(signal.samples_per_symbol))
-        signal_tag.set("center", str(signal.center))
-        signal_tag.set("center_spacing", str(signal.center_spacing))
-        signal_tag.set("tolerance", str(signal.tolerance))
-        signal_tag.set("noise_threshold", str(signal.noise_threshold))
-        signal_tag.set("noise_minimum", str(signal.noise_min_plot))
-        signal_tag.set("noise_maximum", str(signal.noise_max_plot))
-        signal_tag.set("modulation_type", str(signal.modulation_type))
-        signal_tag.set("sample_rate", str(signal.sample_rate))
-        signal_tag.set("pause_threshold", str(signal.pause_threshold))
-        signal_tag.set("message_length_divisor", str(signal.message_length_divisor))
-        signal_tag.set("bits_per_symbol", str(signal.bits_per_symbol))
-        signal_tag.set("costas_loop_bandwidth", str(signal.costas_loop_bandwidth))
-
-        messages = ET.SubElement(signal_tag, "messages")
-        for message in messages:
-            messages.append(message.to_xml())
-
-        tree.write(self.project_file)
+        # The tag may be the cached section of the last save, which no longer matches its key after the change
+        self.__sections.pop("signal " + attributes["filename"], None)
+        self.__set_signal_tag_attributes(signal_tag, attributes)
+        self.__write_project_tree(root)
 
     def write_modulators_to_project_file(self, tree=None):
         """
@@ -347,18 +393,23 @@ class ProjectManager(QObject):
             return
 
         if tree is None:
-            tree = ET.parse(self.project_file)
+            tree = self.read_project_tree()
 
         root = tree.getroot()
+        for modulators_tag in root.findall("modulators"):
+            root.remove(modulators_tag)
         root.append(Modulator.modulators_to_xml_tag(self.modulators))
 
-        tree.write(self.project_file)
+        self.__write_project_tree(root)
 
     def read_modulators_from_project_file(self):
         """
         :rtype: list of Modulator
         """
-        return ProjectManager.read_modulators_from_file(self.project_file)
+        if not self.project_file:
+            return []
+
+        return Modulator.modulators_from_xml_tag(self.read_project_tree().getroot())
 
     @staticmethod
     def read_modulators_from_file(filename: str):
@@ -371,20 +422,21 @@ class ProjectManager(QObject):
         return Modulator.modulators_from_xml_tag(root)
 
     def save_project(self, simulator_config=None):
+        """
+        Save the project to the project file.
+        Tags of signals and protocols are only created again if they changed since the last save
+        and the file is not written at all if nothing changed.
+
+        """
         if self.project_file is None or not os.path.isfile(self.project_file):
             return
 
-        # Recreate file
-        open(self.project_file, 'w').close()
         root = ET.Element("UniversalRadioHackerProject")
-        tree = ET.ElementTree(root)
-        tree.write(self.project_file)
+        section_keys = []
 
-        # self.write_labels(self.maincontroller.compare_frame_controller.proto_analyzer)
-        self.write_modulators_to_project_file(tree=tree)
+        if self.modulators:
+            root.append(Modulator.modulators_to_xml_tag(self.modulators))
 
-        tree = ET.parse(self.project_file)
-        root = tree.getroot()
         root.append(self.__device_conf_dict_to_xml("device_conf", self.device_conf))
         root.append(self.simulator_rx_conf_to_xml())
         root.append(self.simulator_tx_conf_to_xml())
@@ -393,9 +445,19 @@ class ProjectManager(QObject):
         root.set("modulation_was_edited", str(int(self.modulation_was_edited)))
         root.set("broadcast_address_hex", str(self.broadcast_address_hex))
 
+        signal_tags = dict()
         open_files = []
         for i, sf in enumerate(self.main_controller.signal_tab_controller.signal_frames):
-            self.write_signal_information_to_project_file(sf.signal, tree=tree)
+            signal = sf.signal
+            if signal is not None and len(signal.filename) > 0:
+                attributes = self.__get_signal_attributes(signal)
+                if attributes["filename"] not in signal_tags:
+                    key = tuple(attributes.items())
+                    signal_tag = self.__get_section("signal " + attributes["filename"], key,
+                                                    lambda: self.__create_signal_tag(attributes))
+                    root.append(signal_tag)
+                    signal_tags[attributes["filename"]] = signal_tag
+                    section_keys.append(key)
             try:
                 pf = self.main_controller.signal_protocol_dict[sf]
                 filename = pf.filename
@@ -420,9 +482,6 @@ class ProjectManager(QObject):
             except Exception:
                 pass
 
-        for group_tag in root.findall("group"):
-            root.remove(group_tag)
-
         cfc = self.main_controller.compare_frame_controller
 
         for i, group in enumerate(cfc.groups):
@@ -440,20 +499,61 @@ class ProjectManager(QObject):
 
                     proto_tag.set("filename", rel_file_name)
 
-        root.append(cfc.proto_analyzer.to_xml_tag(decodings=cfc.decodings, participants=self.participants,
-                                                  messages=[msg for proto in cfc.full_protocol_list for msg in
-                                                            proto.messages]))
-
         if simulator_config is not None:
             root.append(simulator_config.save_to_xml())
 
-        util.write_xml_to_file(root, self.project_file)
+        messages = [msg for proto in cfc.full_protocol_list for msg in proto.messages]
+        protocol_key = self.__get_protocol_key(cfc, messages)
+        protocol_tag = self.__get_section("protocol", protocol_key,
+                                          lambda: cfc.proto_analyzer.to_xml_tag(decodings=cfc.decodings,
+                                                                                participants=self.participants,
+                                                                                messages=messages))
+        # Keep the protocol tag at the position it had before
+        if simulator_config is not None:
+            root.insert(len(root) - 1, protocol_tag)
+        else:
+            root.append(protocol_tag)
+        section_keys.append(protocol_key)
+
+        section_tags = set(map(id, signal_tags.values())) | {id(protocol_tag)}
+        project_key = (tuple(sorted(root.attrib.items())),
+                       tuple(ET.tostring(tag) for tag in root if id(tag) not in section_tags),
+                       tuple(section_keys))
+
+        if project_key == self.__saved_project_key and self.__project_file_is_unchanged():
+            return
+
+        self.__write_project_tree(root, project_key)
+
+    def __project_file_is_unchanged(self) -> bool:
+        try:
+            stat = os.stat(self.project_file)
+        except OSError:
+            return False
+        return self.__project_tree_stat == (self.project_file, stat.st_mtime_ns, stat.st_size)
+
+    def __create_signal_tag(self, attributes: dict) -> ET.Element:
+        signal_tag = ET.Element("signal")
+        self.__set_signal_tag_attributes(signal_tag, attributes)
+        return signal_tag
+
+    def __get_protocol_key(self, cfc, messages: list) -> tuple:
+        """
+        Key describing everything that is written to the protocol tag of the project file.
+        Message bits are not part of it, because they are not saved in the project file.
+
+        """
+        return (ET.tostring(Encoding.decodings_to_xml_tag(cfc.decodings)),
+                ET.tostring(Participant.participants_to_xml_tag(self.participants)),
+                tuple(ET.tostring(message_type.to_xml()) for message_type in cfc.proto_analyzer.message_types),
+                tuple((msg.message_type.id, msg.modulator_index, msg.pause, msg.timestamp, id(msg.decoder),
+                       None if msg.participant is None else msg.participant.id) for msg in messages))
 
     def read_participants_for_signal(self, signal: Signal, messages):
         if self.project_file is None or len(signal.filename) == 0:
             return False
 
-        tree = ET.parse(self.project_file)
+        tree = self.read_project_tree()
         root = tree.getroot()
 
         try:
@@ -480,7 +580,7 @@ class ProjectManager(QObject):
         if self.project_file is None or len(signal.filename) == 0:
             return False
 
-        tree = ET.parse(self.project_file)
+        tree = self.read_project_tree()
         root = tree.getroot()
 
         try:
@@ -517,7 +617,7 @@ class ProjectManager(QObject):
 
     def read_opened_filenames(self):
         if self.project_file is not None:
-            tree = ET.parse(self.project_file)
+            tree = self.read_project_tree()
             root = tree.getroot()
             file_names = []
 
@@ -1,5 +1,5 @@
 import numpy as np
-from multiprocessing import Value, Array
+from multiprocessing.sharedctypes import RawArray
 
 from urh.signalprocessing.IQArray import IQArray
 
@@ -7,36 +7,65 @@ from urh.signalprocessing.IQArray import IQArray
 class RingBuffer(object):
     """
     A RingBuffer containing complex values.
+
+    The buffer is shared between processes and lock free for a single producer, which pushes values,
+    and a single consumer, which pops them. Instead of wrapping indices, the producer and consumer each
+    increment their own counter of pushed respectively popped values, so no counter is written by both sides.
+    The counters live on separate cache lines and are only published after the data was written or read.
     """
+
+    # Positions of the counters in the control block as indices of uint64 values
+    HEAD, TAIL = 0, 8
+    CONTROL_SIZE = 16
+
     def __init__(self, size: int, dtype=np.float32):
         self.dtype = dtype
 
         types = {np.uint8: "B", np.int8: "b", np.int16: "h", np.uint16: "H", np.float32: "f", np.float64: "d"}
-        self.__data = Array(types[self.dtype], 2*size)
+        self.__data = RawArray(types[self.dtype], 2*size)
+        self.__control = RawArray("Q", self.CONTROL_SIZE)
 
         self.size = size
-        self.__left_index = Value("L", 0)
-        self.__right_index = Value("L", 0)
-        self.__length = Value("L", 0)
+        self.__init_views()
+
+    def __getstate__(self):
+        # The views are created again after unpickling, so the data is not copied
+        return {"dtype": self.dtype, "size": self.size,
+                "_RingBuffer__data": self.__data, "_RingBuffer__control": self.__control}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__init_views()
+
+    def __init_views(self):
+        self.__data_view = np.frombuffer(self.__data, dtype=self.dtype).reshape(len(self.__data) // 2, 2)
+        self.__counters = np.frombuffer(self.__control, dtype=np.uint64)
+        self.__plot_buffer = None
 
     def __len__(self):
-        return self.__length.value
+        return int(self.__counters[self.HEAD]) - int(self.__counters[self.TAIL])
 
     @property
-    def left_index(self):
-        return self.__left_index.value
+    def head(self) -> int:
+        """
+        Number of values pushed so far
+        """
+        return int(self.__counters[self.HEAD])
 
-    @left_index.setter
-    def left_index(self, value):
-        self.__left_index.value = value % self.size
+    @property
+    def tail(self) -> int:
+        """
+        Number of values popped so far
+        """
+        return int(self.__counters[self.TAIL])
 
     @property
-    def right_index(self):
-        return self.__right_index.value
+    def left_index(self):
+        return self.tail % self.size
 
-    @right_index.setter
-    def right_index(self, value):
-        self.__right_index.value = value % self.size
+    @property
+    def right_index(self):
+        return self.head % self.size
 
     @property
     def is_empty(self) -> bool:
@@ -48,45 +77,90 @@ class RingBuffer(object):
 
     @property
     def data(self):
-        return np.frombuffer(self.__data.get_obj(), dtype=self.dtype).reshape(len(self.__data) // 2, 2)
+        return self.__data_view
 
     @property
     def view_data(self):
         """
-        Get a representation of the ring buffer for plotting. This is expensive, so it should only be used in frontend
+        Get a representation of the ring buffer for plotting, starting with the oldest value.
+        This copies the buffer into a reused array, so it should only be used in frontend
         :return:
         """
-        left, right = self.left_index, self.left_index + len(self)
-        if left > right:
-            left, right = right, left
+        if self.__plot_buffer is None:
+            self.__plot_buffer = np.empty(2 * self.size, dtype=self.dtype)
 
-        data = self.data.flatten()
-        return np.concatenate((data[left:right], data[right:], data[:left]))
+        left = self.left_index
+        data = self.__data_view.reshape(-1)
+        self.__plot_buffer[:2 * (self.size - left)] = data[2 * left:]
+        self.__plot_buffer[2 * (self.size - left):] = data[:2 * left]
+        return self.__plot_buffer
 
     def clear(self):
-        self.left_index = 0
-        self.right_index = 0
+        """
+        Discard all values. Must only be called while the consumer is not popping values.
+        """
+        self.__counters[self.TAIL] = self.__counters[self.HEAD]
 
     def will_fit(self, number_values: int) -> bool:
         return number_values <= self.space_left
 
     def push(self, values: IQArray):
         """
-        Push values to buffer. If buffer can't store all values a ValueError is raised
+        Push values to buffer. If buffer can't store all values a ValueError is raised.
+        Must only be called by the producer.
         """
         n = len(values)
-        if len(self) + n > self.size:
+        head, tail = self.head, self.tail
+        if head - tail + n > self.size:
             raise ValueError("Too much data to push to RingBuffer")
 
-        slide_1 = np.s_[self.right_index:min(self.right_index + n, self.size)]
-        slide_2 = np.s_[:max(self.right_index + n - self.size, 0)]
-        with self.__data.get_lock():
-            data = np.frombuffer(self.__data.get_obj(), dtype=self.dtype).reshape(len(self.__data) // 2, 2)
-            data[slide_1] = values[:slide_1.stop - slide_1.start]
-            data[slide_2] = values[slide_1.stop - slide_1.start:]
-            self.right_index += n
+        start = head % self.size
+        end = min(start + n, self.size)
+        self.__data_view[start:end] = values[:end - start]
+        self.__data_view[:n - (end - start)] = values[end - start:]
 
-        self.__length.value += n
+        # Publish the values only after they were written
+        self.__counters[self.HEAD] = head + n
+
+    def peek(self, number: int = -1) -> tuple:
+        """
+        Get up to number values as two views of the buffer without copying them,
+        as the values may wrap around the end of the buffer. The second view is empty if they do not.
+        The views are valid until the values are released with consume. Must only be called by the consumer.
+
+        :param number: maximum number of values, any value below zero means all values
+        :return: tuple of two arrays of shape (n, 2)
+        """
+        available = len(self)
+        number = available if number < 0 else min(number, available)
+        start = self.tail % self.size
+        end = min(start + number, self.size)
+        return self.__data_view[start:end], self.__data_view[:number - (end - start)]
+
+    def consume(self, number: int):
+        """
+        Release number values returned by peek, so the producer can overwrite them
+        """
+        self.__counters[self.TAIL] = self.tail + min(number, len(self))
+
+    def pop_into(self, out: np.ndarray, ensure_even_length=False) -> int:
+        """
+        Pop values into the preallocated array out of shape (n, 2) without allocating memory.
+        Must only be called by the consumer.
+
+        :return: number of values written to out
+        """
+        number = len(out)
+        if ensure_even_length:
+            number -= number % 2
+
+        first, second = self.peek(number)
+        out[:len(first)] = first
+        out[len(first):len(first) + len(second)] = second
+        number = len(first) + len(second)
+
+        self.consume(number)
+        return number
 
     def pop(self, number: int, ensure_even_length=False) -> np.ndarray:
         """
@@ -107,20 +181,6 @@ class RingBuffer(object):
         else:
             number = min(number, len(self))
 
-        with self.__data.get_lock():
-            result = np.ones(2*number, dtype=self.dtype).reshape(number, 2)
-            data = np.frombuffer(self.__data.get_obj(), dtype=self.dtype).reshape(len(self.__data) // 2, 2)
-
-            if self.left_index + number > len(data):
-                end = len(data) - self.left_index
-            else:
-                end = number
-
-            result[:end] = data[self.left_index:self.left_index + end]
-            if end < number:
-                result[end:] = data[:number-end]
-
-        self.left_index += number
-        self.__length.value -= number
-
+        result = np.empty((number, 2), dtype=self.dtype)
+        self.pop_into(result)
         return result
@@ -0,0 +1,220 @@
+import os
+import time
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None  # Python < 3.8
+
+
+class SharedMemoryRing(object):
+    """
+    Lock free single producer single consumer ring in shared memory,
+    which passes chunks of received samples from a device process to the main process.
+
+    The producer writes every chunk as record of a sequence number, the payload length and the payload.
+    Records never wrap around the end of the ring, instead the rest of the ring is marked as padding,
+    so the consumer gets every chunk as a single contiguous view without copying it.
+    Producer and consumer only write their own position, so no lock is required.
+    If the ring is full, the producer drops the chunk and the consumer detects the overrun from the sequence numbers.
+
+    The ring can be passed to a device process in place of the data connection, as it offers send_bytes and close
+    with the same signatures as a multiprocessing Connection.
+    """
+
+    # Positions in the control block as indices of uint64 values.
+    # The read position lives on its own cache line, as it is written by the other side.
+    WRITE_POS, SEQUENCE, CLOSED, READ_POS = 0, 1, 2, 8
+    CONTROL_SIZE = 128
+    RECORD_HEADER_SIZE = 16
+    ALIGNMENT = 16
+    PADDING = np.iinfo(np.uint64).max
+    SHM_PATH = "/dev/shm"
+
+    def __init__(self, capacity: int, name: str = None):
+        """
+        Create a new ring or attach to an existing one
+
+        :param capacity: capacity in bytes, rounded up to the alignment
+        :param name: name of an existing ring to attach to
+        :raises OSError: if the shared memory can not be created or there is not enough free shared memory
+        """
+        if shared_memory is None:
+            raise OSError("Shared memory is not supported by this Python version")
+
+        self.capacity = self.__align(capacity)
+        # Processes forked from the owner inherit the ring without attaching, so remember the owning process
+        self.__owner_pid = os.getpid() if name is None else None
+        if self.is_owner:
+            # tmpfs does not fail on creation when it is too small, but with SIGBUS once the pages are touched
+            free_memory = self.get_free_memory()
+            if free_memory is not None and self.CONTROL_SIZE + self.capacity > free_memory:
+                raise OSError("Not enough free shared memory for ring of {} bytes "
+                              "({} bytes free)".format(self.capacity, free_memory))
+            self.__shm = shared_memory.SharedMemory(create=True, size=self.CONTROL_SIZE + self.capacity)
+        else:
+            # Device processes share the resource tracker of the main process, so attaching is tracked once
+            self.__shm = shared_memory.SharedMemory(name=name)
+
+        self.__control = np.ndarray((self.CONTROL_SIZE // 8,), dtype=np.uint64, buffer=self.__shm.buf)
+        self.__data = self.__shm.buf[self.CONTROL_SIZE:self.CONTROL_SIZE + self.capacity]
+        if self.is_owner:
+            self.__control[:] = 0
+
+        self.__next_sequence = 0  # sequence number the consumer expects next
+        self.__pending = 0  # size of the record the consumer currently holds a view of
+        self.num_dropped = 0  # number of chunks the consumer detected as dropped
+        self.is_closed = False
+
+    def __getstate__(self):
+        return {"name": self.__shm.name, "capacity": self.capacity}
+
+    def __setstate__(self, state):
+        self.__init__(state["capacity"], name=state["name"])
+
+    @classmethod
+    def get_free_memory(cls):
+        """
+        Free bytes of the file system backing shared memory or None if it is unknown, e.g. on Windows
+
+        :rtype: int or None
+        """
+        try:
+            stat = os.statvfs(cls.SHM_PATH)
+        except (AttributeError, OSError):
+            return None
+        return stat.f_bavail * stat.f_frsize
+
+    @property
+    def is_owner(self) -> bool:
+        return self.__owner_pid == os.getpid()
+
+    @property
+    def name(self) -> str:
+        return self.__shm.name
+
+    def __len__(self):
+        """
+        Number of bytes used by unread records
+        """
+        return int(self.__control[self.WRITE_POS] - self.__control[self.READ_POS])
+
+    def send_bytes(self, data):
+        """
+        Write a chunk to the ring. Called by the producer, e.g. from a device callback, so it never blocks.
+        If the ring is full, the chunk is dropped and only the consumer notices it from the skipped sequence number.
+        Like Connection.send_bytes this returns None, as device libraries pass the result through.
+        """
+        payload = memoryview(data).cast("B")
+        n = len(payload)
+        size = self.RECORD_HEADER_SIZE + self.__align(n)
+
+        control = self.__control
+        write_pos, read_pos = int(control[self.WRITE_POS]), int(control[self.READ_POS])
+        sequence = int(control[self.SEQUENCE])
+        control[self.SEQUENCE] = sequence + 1
+
+        offset = write_pos % self.capacity
+        tail = self.capacity - offset
+        padding = tail if tail < size else 0
+        if size + padding > self.capacity - (write_pos - read_pos):
+            return
+
+        if padding:
+            self.__write_record_header(offset, self.PADDING, 0)
+            offset = 0
+
+        self.__write_record_header(offset, sequence, n)
+        start = offset + self.RECORD_HEADER_SIZE
+        self.__data[start:start + n] = payload
+
+        # Publish the record only after it was written completely
+        control[self.WRITE_POS] = write_pos + padding + size
+
+    def recv_view(self, timeout: float = None):
+        """
+        Get a view of the next chunk without copying it. Called by the consumer.
+        The view is valid until release is called, which must happen before the next call of recv_view.
+
+        :param timeout: seconds to wait for a chunk, None waits forever
+        :return: memoryview of the chunk or None if no chunk arrived within timeout
+        :raises EOFError: if the producer closed the ring and all chunks were read
+        """
+        if self.is_closed:
+            raise EOFError("Ring is closed")
+        self.release()
+
+        deadline = None if timeout is None else time.time() + timeout
+        sleep = 0.0001
+        while len(self) == 0:
+            if self.__control[self.CLOSED] and len(self) == 0:
+                raise EOFError("Producer closed the ring")
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(sleep)
+            sleep = min(2 * sleep, 0.005)
+
+        read_pos = int(self.__control[self.READ_POS])
+        offset = read_pos % self.capacity
+        sequence, n = self.__read_record_header(offset)
+        if sequence == self.PADDING:
+            read_pos += self.capacity - offset
+            self.__control[self.READ_POS] = read_pos
+            offset = 0
+            sequence, n = self.__read_record_header(offset)
+
+        if sequence != self.__next_sequence:
+            self.num_dropped += sequence - self.__next_sequence
+        self.__next_sequence = sequence + 1
+
+        self.__pending = self.RECORD_HEADER_SIZE + self.__align(n)
+        start = offset + self.RECORD_HEADER_SIZE
+        return self.__data[start:start + n]
+
+    def release(self):
+        """
+        Release the chunk returned by recv_view, so the producer can overwrite it
+        """
+        if self.__pending:
+            self.__control[self.READ_POS] = int(self.__control[self.READ_POS]) + self.__pending
+            self.__pending = 0
+
+    def close(self):
+        """
+        Close the ring. The producer marks the ring as closed, so the consumer gets an EOFError after the last chunk.
+        The owner, i.e. the consumer, additionally frees the shared memory.
+        """
+        if self.is_closed:
+            return
+        self.is_closed = True
+
+        if not self.is_owner:
+            self.__control[self.CLOSED] = 1
+
+        data = self.__data
+        self.__control = self.__data = None
+        try:
+            data.release()
+        except BufferError:
+            pass
+
+        if self.is_owner:
+            self.__shm.unlink()
+        try:
+            self.__shm.close()
+        except BufferError:
+            # Chunks are still referenced, the memory gets unmapped when they are garbage collected
+            pass
+
+    def __write_record_header(self, offset: int, sequence: int, length: int):
+        np.frombuffer(self.__data, dtype=np.uint64, count=2, offset=offset)[:] = (sequence, length)
+
+    def __read_record_header(self, offset: int) -> tuple:
+        sequence, length = np.frombuffer(self.__data, dtype=np.uint64, count=2, offset=offset).tolist()
+        return sequence, length
+
+    @classmethod
+    def __align(cls, n: int) -> int:
+        return -(-n // cls.ALIGNMENT) * cls.ALIGNMENT
@@ -0,0 +1,110 @@
+import select
+import socket
+
+
+class SocketReader(object):
+    """
+    Read from a stream socket into a ring of preallocated buffers with recv_into,
+    so no bytes objects are created per read.
+
+    A view returned by read stays valid for the next num_buffers - 1 reads, so it can be passed on,
+    e.g. to send_bytes of a pipe or SharedMemoryRing, without copying it first.
+    The length of every returned view is a multiple of alignment, e.g. 2 for interleaved I/Q bytes.
+    An incomplete frame at the end of a read is carried over to the next one.
+    """
+
+    def __init__(self, sock: socket.socket, read_size: int = 2 ** 18, num_buffers: int = 4, alignment: int = 1):
+        """
+
+        :param read_size: maximum number of bytes per read
+        :param num_buffers: number of buffers in the ring
+        :param alignment: frame size in bytes the length of read data is a multiple of
+        """
+        self.sock = sock
+        self.read_size = read_size
+        self.alignment = alignment
+
+        # Every buffer has room for an incomplete frame carried over from the previous read
+        self.__buffers = [memoryview(bytearray(read_size + alignment)) for _ in range(max(1, num_buffers))]
+        self.__index = 0
+        self.__carry = b""
+
+        self.is_closed = False  # True after the peer closed or reset the connection
+
+    def read(self, timeout: float = None) -> memoryview:
+        """
+        Read the data available on the socket, up to read_size bytes.
+
+        :param timeout: seconds to wait for data, None waits until data arrives
+        :return: view of the received data, which is empty if no data arrived within timeout
+                 or the connection was closed, see is_closed
+        """
+        if timeout is not None:
+            readable, _, _ = select.select([self.sock], [], [], timeout)
+            if not readable:
+                return self.__buffers[self.__index][:0]
+
+        buffer = self.__next_buffer()
+        carry = len(self.__carry)
+        try:
+            n = self.sock.recv_into(buffer[carry:], self.read_size)
+        except ConnectionResetError:
+            n = 0
+        if n == 0:
+            self.is_closed = True
+        return self.__align(buffer, carry + n)
+
+    def read_exactly(self, num_bytes: int) -> memoryview:
+        """
+        Read exactly num_bytes, e.g. a header or frame of fixed size.
+        The data is read into the buffer ring, unless it is larger than read_size.
+
+        :raises ConnectionError: if the peer closes the connection before num_bytes arrived
+        """
+        if num_bytes <= self.read_size:
+            buffer = self.__next_buffer()
+        else:
+            buffer = memoryview(bytearray(num_bytes + self.alignment))
+            buffer[:len(self.__carry)] = self.__carry
+
+        pos = len(self.__carry)
+        while pos < num_bytes:
+            n = self.sock.recv_into(buffer[pos:], num_bytes - pos)
+            if n == 0:
+                self.is_closed = True
+                raise ConnectionError("Connection closed after {} of {} bytes".format(pos, num_bytes))
+            pos += n
+
+        self.__carry = bytes(buffer[num_bytes:pos])
+        return buffer[:num_bytes]
+
+    def read_into(self, out) -> int:
+        """
+        Read exactly len(out) bytes into the writable buffer out, e.g. straight to their destination.
+
+        :raises ConnectionError: if the peer closes the connection before out is filled
+        """
+        out = memoryview(out).cast("B")
+        carry = self.__carry[:len(out)]
+        out[:len(carry)] = carry
+        self.__carry = self.__carry[len(carry):]
+
+        pos = len(carry)
+        while pos < len(out):
+            n = self.sock.recv_into(out[pos:], len(out) - pos)
+            if n == 0:
+                self.is_closed = True
+                raise ConnectionError("Connection closed after {} of {} bytes".format(pos, len(out)))
+            pos += n
+        return pos
+
+    def __next_buffer(self) -> memoryview:
+        self.__index = (self.__index + 1) % len(self.__buffers)
+        buffer = self.__buffers[self.__index]
+        buffer[:len(self.__carry)] = self.__carry
+        return buffer
+
+    def __align(self, buffer: memoryview, num_bytes: int) -> memoryview:
+        aligned = num_bytes - num_bytes % self.alignment
+        self.__carry = bytes(buffer[aligned:num_bytes])
+        return buffer[:aligned]
@@ -25,6 +25,8 @@ BCD_LUT = {"{0:04b}".format(i): str(i) if i < 10 else BCD_ERROR_SYMBOL for i in
 BCD_REVERSE_LUT = {str(i): "{0:04b}".format(i) for i in range(10)}
 BCD_REVERSE_LUT[BCD_ERROR_SYMBOL] = "0000"
 
+HEX_CHARS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
 DEFAULT_PROGRAMS_WINDOWS = {}
 
 
@@ -277,6 +279,55 @@ def aggregate_bits(bits: array.array, size=4) -> array.array:
     return result
 
 
+def aggregate_bit_chains(bits: np.ndarray, chain_lengths: np.ndarray, size=4):
+    """
+    Aggregate consecutive bit chains to symbols of given size, e.g. 4 for hex or 8 for ascii.
+    Every chain is padded with zeros so that its length is a multiple of size.
+    All chains are converted at once, so this can be used for whole protocols.
+
+    :param bits: Concatenated bits of all chains
+    :param chain_lengths: Length of each chain
+    :param size: Number of bits per symbol (at most 8)
+    :return: the symbols of all chains and the number of symbols per chain
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    chain_lengths = np.asarray(chain_lengths, dtype=np.int64)
+    padding = (size - chain_lengths % size) % size
+    padded = np.insert(bits, np.repeat(np.cumsum(chain_lengths), padding), 0) if padding.any() else bits
+
+    num_symbols = len(padded) // size
+    packed = np.packbits(padded)
+    if size == 8:
+        symbols = packed
+    elif size == 4:
+        symbols = np.empty(2 * len(packed), dtype=np.uint8)
+        symbols[0::2] = packed >> 4
+        symbols[1::2] = packed & 0x0F
+        symbols = symbols[:num_symbols]
+    else:
+        symbols = np.packbits(padded.reshape(-1, size), axis=1).ravel() >> (8 - size)
+
+    return symbols, (chain_lengths + padding) // size
+
+
+def symbols_to_string(symbols: np.ndarray, view_type: int) -> str:
+    """
+    Convert bits (view_type 0), hex nibbles (view type 1) or ascii bytes (view type 2) to string
+    using lookup tables instead of formatting every symbol on its own.
+
+    """
+    symbols = np.asarray(symbols, dtype=np.uint8)
+    if view_type == 0:
+        return (symbols + ord("0")).tobytes().decode("ascii")
+    elif view_type == 1:
+        return HEX_CHARS[symbols].tobytes().decode("ascii")
+    elif view_type == 2:
+        # latin-1 maps every byte to the unicode code point with the same value just like chr
+        return symbols.tobytes().decode("latin-1")
+    else:
+        raise ValueError("Unknown view type")
+
+
 def convert_numbers_to_hex_string(arr: np.ndarray):
     """
     Convert an array like [0, 1, 10, 2] to string 012a2
@@ -309,11 +360,28 @@ def create_table_item(content):
 
 
 def write_xml_to_file(xml_tag: ET.Element, filename: str):
-    xml_str = minidom.parseString(ET.tostring(xml_tag)).toprettyxml(indent="  ")
-    with open(filename, "w") as f:
-        for line in xml_str.split("\n"):
-            if line.strip():
-                f.write(line + "\n")
+    """
+    Write the pretty printed XML to a temporary file which then replaces the target file,
+    so the target file is never left half written, e.g. if URH crashes during an autosave.
+    """
+    if hasattr(ET, "indent"):
+        # Much faster than pretty printing with minidom for large files, available from Python 3.9 on
+        ET.indent(xml_tag, space="  ")
+        lines = ['<?xml version="1.0" ?>', ET.tostring(xml_tag, encoding="unicode")]
+    else:
+        lines = minidom.parseString(ET.tostring(xml_tag)).toprettyxml(indent="  ").split("\n")
+
+    tmp_filename = "{}.{}.tmp".format(filename, os.getpid())
+    try:
+        with open(tmp_filename, "w") as f:
+            for line in lines:
+                if line.strip():
+                    f.write(line + "\n")
+        os.replace(tmp_filename, filename)
+    except Exception:
+        if os.path.isfile(tmp_filename):
+            os.remove(tmp_filename)
+        raise
 
 
 def get_monospace_font() -> QFont:
@@ -1,6 +1,9 @@
 import unittest
 
+import numpy as np
+
 from urh.cli import urh_cli
+from urh.signalprocessing.IQArray import IQArray
 from urh.signalprocessing.Message import Message
 from urh.signalprocessing.Modulator import Modulator
 from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
@@ -34,3 +37,30 @@ class TestCLILogic(unittest.TestCase):
         pa.get_protocol_from_signal()
         self.assertEqual(len(pa.messages), 1)
         self.assertEqual(pa.messages[0].plain_bits_str, bits)
+
+    def test_cli_stream_modulated_messages(self):
+        modulator = Modulator("test")
+        modulator.sample_rate = 2e3
+        modulator.samples_per_symbol = 100
+        modulator.modulation_type = "ASK"
+        modulator.parameters[0] = 0
+        modulator.parameters[1] = 100
+
+        modulator.carrier_freq_hz = 100
+        self.assertIsNone(urh_cli.stream_modulated_messages([], modulator))
+
+        messages = [Message.from_plain_bits_str(bits, pause=1000) for bits in ("1010111100001", "110011")]
+        source = urh_cli.stream_modulated_messages(messages, modulator)
+        expected = urh_cli.modulate_messages(messages, modulator)
+        self.assertEqual(len(source), len(expected))
+        # The carrier phase continues after the first message instead of starting again
+        np.testing.assert_allclose(source.read(0, 1300), expected[:1300], atol=1e-3)
+
+        s = Signal("", "", modulation="ASK", sample_rate=2e6)
+        s.samples_per_symbol = 100
+        s.noise_threshold = 0
+        s.iq_array = IQArray(source.read(0, len(source)))
+
+        pa = ProtocolAnalyzer(s)
+        pa.get_protocol_from_signal()
+        self.assertEqual([msg.plain_bits_str for msg in pa.messages], ["1010111100001", "110011"])
@@ -0,0 +1,90 @@
+import socket
+import socketserver
+import threading
+import time
+
+import numpy as np
+
+from urh.plugins.NetworkSDRInterface.NetworkSDRInterfacePlugin import NetworkSDRInterfacePlugin
+from urh.signalprocessing.IQArray import IQArray
+from urh.util import util
+
+
+class LegacyTCPHandler(socketserver.BaseRequestHandler):
+    """
+    Previous receive handler for comparison, which collects the whole stream before writing it to the buffer
+    """
+
+    def handle(self):
+        size = 2 * np.dtype(np.float32).itemsize
+        received = self.request.recv(65536 * size)
+        data = received
+        while received:
+            received = self.request.recv(65536 * size)
+            data += received
+
+        received = np.frombuffer(data, dtype=np.float32).reshape((-1, 2))
+        self.server.receive_buffer[:len(received)] = received
+        self.server.current_receive_index = len(received)
+
+
+def run_legacy(samples: np.ndarray) -> float:
+    server = socketserver.TCPServer(("", util.get_free_port()), LegacyTCPHandler)
+    server.receive_buffer = IQArray(None, dtype=np.float32, n=len(samples))
+    server.current_receive_index = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    t = time.time()
+    sock = socket.create_connection(("127.0.0.1", server.server_address[1]))
+    sock.sendall(IQArray(samples).to_bytes())
+    sock.close()
+    while server.current_receive_index < len(samples):
+        time.sleep(0.001)
+    elapsed = time.time() - t
+
+    server.shutdown()
+    server.server_close()
+    return elapsed
+
+
+def run(samples: np.ndarray, transport: str) -> tuple:
+    receiver = NetworkSDRInterfacePlugin(raw_mode=True)
+    receiver.receive_buffer = IQArray(None, dtype=np.float32, n=len(samples))
+    receiver.server_port = util.get_free_port()
+    receiver.transport = transport
+    receiver.start_tcp_server_for_receiving()
+
+    sender = NetworkSDRInterfacePlugin(raw_mode=True, sending=True)
+    sender.client_port = receiver.server_port
+    sender.transport = transport
+
+    t = time.time()
+    sender.send_raw_data(IQArray(samples), 1)
+    # Lost datagrams never arrive, so wait until nothing arrives anymore and measure up to the last arrival
+    last_index, last_change = -1, time.time()
+    while True:
+        index, now = receiver.current_receive_index, time.time()
+        if index != last_index:
+            last_index, last_change = index, now
+        if index >= len(samples) or now - last_change >= 0.5:
+            break
+        time.sleep(0.001)
+    elapsed = last_change - t
+
+    received, lost = receiver.current_receive_index, receiver.num_lost_frames
+    receiver.stop_tcp_server()
+    return elapsed, received, lost
+
+
+def test_network_sdr_performance():
+    num_samples = 2 ** 24
+    samples = np.random.uniform(-1, 1, (num_samples, 2)).astype(np.float32)
+    print("Transport\t\tThroughput (MSamples/s)\tReceived samples\tLost frames")
+    print("Legacy raw TCP\t\t{:.1f}".format(num_samples / run_legacy(samples) / 1e6))
+    for transport in NetworkSDRInterfacePlugin.TRANSPORTS:
+        elapsed, received, lost = run(samples, transport)
+        print("{}\t\t{:.1f}\t\t\t{}\t\t{}".format(transport, received / elapsed / 1e6, received, lost))
+
+
+if __name__ == '__main__':
+    test_network_sdr_performance()
@@ -0,0 +1,97 @@
+import time
+from multiprocessing import Process, Value, Array
+
+import numpy as np
+
+from urh.util.RingBuffer import RingBuffer
+
+
+class LockedRingBuffer(object):
+    """
+    Previous implementation of RingBuffer for comparison,
+    which locks the data for push and pop and keeps its indices in separate locked Values.
+    """
+
+    def __init__(self, size: int, dtype=np.float32):
+        self.dtype = dtype
+        self.__data = Array("f", 2 * size)
+        self.size = size
+        self.__left_index = Value("L", 0)
+        self.__right_index = Value("L", 0)
+        self.__length = Value("L", 0)
+
+    def __len__(self):
+        return self.__length.value
+
+    def will_fit(self, number_values: int) -> bool:
+        return number_values <= self.size - len(self)
+
+    def push(self, values: np.ndarray):
+        n = len(values)
+        right_index = self.__right_index.value
+        slide_1 = np.s_[right_index:min(right_index + n, self.size)]
+        slide_2 = np.s_[:max(right_index + n - self.size, 0)]
+        with self.__data.get_lock():
+            data = np.frombuffer(self.__data.get_obj(), dtype=self.dtype).reshape(len(self.__data) // 2, 2)
+            data[slide_1] = values[:slide_1.stop - slide_1.start]
+            data[slide_2] = values[slide_1.stop - slide_1.start:]
+            self.__right_index.value = (right_index + n) % self.size
+        self.__length.value += n
+
+    def pop(self, number: int) -> np.ndarray:
+        if len(self) == 0:
+            return np.array([], dtype=self.dtype)
+        number = min(number, len(self))
+        left_index = self.__left_index.value
+        with self.__data.get_lock():
+            result = np.ones(2 * number, dtype=self.dtype).reshape(number, 2)
+            data = np.frombuffer(self.__data.get_obj(), dtype=self.dtype).reshape(len(self.__data) // 2, 2)
+            end = len(data) - left_index if left_index + number > len(data) else number
+            result[:end] = data[left_index:left_index + end]
+            if end < number:
+                result[end:] = data[:number - end]
+        self.__left_index.value = (left_index + number) % self.size
+        self.__length.value -= number
+        return result
+
+
+def produce(ring_buffer, num_values: int, chunk: np.ndarray):
+    pushed = 0
+    while pushed < num_values:
+        if ring_buffer.will_fit(len(chunk)):
+            ring_buffer.push(chunk)
+            pushed += len(chunk)
+
+
+def consume(ring_buffer, num_values: int, chunk_size: int, use_pop_into: bool):
+    out = np.empty((chunk_size, 2), dtype=np.float32)
+    popped = 0
+    while popped < num_values:
+        if use_pop_into:
+            popped += ring_buffer.pop_into(out)
+        else:
+            popped += len(ring_buffer.pop(chunk_size))
+
+
+def run(ring_buffer, num_values: int, chunk_size: int, use_pop_into: bool) -> float:
+    chunk = np.random.uniform(-1, 1, (chunk_size, 2)).astype(np.float32)
+    p = Process(target=produce, args=(ring_buffer, num_values, chunk))
+    t = time.time()
+    p.start()
+    consume(ring_buffer, num_values, chunk_size, use_pop_into)
+    p.join()
+    return time.time() - t
+
+
+def test_ringbuffer_performance():
+    size, num_values = 10 ** 6, 10 ** 7
+    print("Chunk size\tLocked pop\tLock free pop\tLock free pop_into (MSamples/s)")
+    for chunk_size in (1024, 16384, 131072):
+        results = [run(LockedRingBuffer(size), num_values, chunk_size, False),
+                   run(RingBuffer(size), num_values, chunk_size, False),
+                   run(RingBuffer(size), num_values, chunk_size, True)]
+        print(chunk_size, *("{:.1f}".format(num_values / t / 1e6) for t in results), sep="\t\t")
+
+
+if __name__ == '__main__':
+    test_ringbuffer_performance()
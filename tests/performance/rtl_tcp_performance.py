@@ -0,0 +1,82 @@
+import os
+import select
+import time
+from multiprocessing import Process, Pipe, Queue, Event
+
+import numpy as np
+
+from tests.rtl_tcp_stand_in import RTLTCPStandIn
+from urh.dev.native.RTLSDRTCP import RTLSDRTCP
+
+
+def serve(port_queue: Queue, stop_event: Event, sample_rate):
+    data = np.random.randint(0, 256, 2 * 10 ** 6, dtype=np.uint8).tobytes()
+    with RTLTCPStandIn(data, sample_rate=sample_rate) as server:
+        port_queue.put(server.port)
+        stop_event.wait()
+
+
+def drain(data_connection, child_data_connection):
+    # Close the inherited sending end, so recv_bytes raises an EOFError after the receive process closed it
+    child_data_connection.close()
+    try:
+        while True:
+            data_connection.recv_bytes()
+    except EOFError:
+        pass
+
+
+def read_with_recv(sdr: RTLSDRTCP):
+    """
+    Previous implementation of RTLSDRTCP.read_sync for comparison, which creates a bytes object per read
+    """
+    s_read, _, _ = select.select([sdr.sock], [], [], .1)
+    if sdr.sock in s_read:
+        return sdr.sock.recv(65536)
+    else:
+        return b''
+
+
+def run(sample_rate, num_bytes: int, use_recv_into: bool) -> tuple:
+    port_queue, stop_event = Queue(), Event()
+    server = Process(target=serve, args=(port_queue, stop_event, sample_rate))
+    server.start()
+
+    parent_data_conn, child_data_conn = Pipe(duplex=False)
+    consumer = Process(target=drain, args=(parent_data_conn, child_data_conn))
+    consumer.start()
+    parent_data_conn.close()
+
+    parent_ctrl_conn, child_ctrl_conn = Pipe()
+    sdr = RTLSDRTCP(0, 0, 0, 0, 0)
+    sdr.open(child_ctrl_conn, "127.0.0.1", port_queue.get())
+    received = 0
+    t, cpu = time.time(), time.process_time()
+    while received < num_bytes:
+        data = sdr.read_sync() if use_recv_into else read_with_recv(sdr)
+        if len(data) > 0:
+            child_data_conn.send_bytes(data)
+            received += len(data)
+    t, cpu = time.time() - t, time.process_time() - cpu
+
+    sdr.close()
+    child_data_conn.close()
+    stop_event.set()
+    consumer.join()
+    server.join()
+    return received / t, cpu / t
+
+
+def test_rtl_tcp_performance():
+    print("Stand-in rate\tRead\t\tThroughput (MB/s)\tCPU load of receive process")
+    for sample_rate, num_bytes in [(None, 2 * 10 ** 8), (2.4e6, 2 * 10 ** 7), (10e6, 10 ** 8)]:
+        for use_recv_into in (False, True):
+            throughput, cpu_load = run(sample_rate, num_bytes, use_recv_into)
+            print("{}\t\t{}\t{:.1f}\t\t\t{:.1f}%".format("max" if sample_rate is None else "{:.1f}M".format(sample_rate / 1e6),
+                                                   "recv_into" if use_recv_into else "recv\t",
+                                                   throughput / 1e6, 100 * cpu_load))
+
+
+if __name__ == '__main__':
+    os.chdir(os.path.join(os.path.dirname(__file__), "..", ".."))
+    test_rtl_tcp_performance()
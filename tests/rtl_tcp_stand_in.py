@@ -0,0 +1,121 @@
+import select
+import socket
+import threading
+import time
+
+import numpy as np
+
+from urh.dev.native.RTLSDRTCP import RTLSDRTCP
+
+
+class RTLTCPStandIn(object):
+    """
+    Local stand-in for rtl_tcp, which streams interleaved 8 bit I/Q samples of a file or array at a set sample rate,
+    so RTLSDRTCP can be tested and benchmarked without hardware.
+
+    Commands of the client are recorded and, like for rtl_tcp, the sampleRate command changes the rate.
+    """
+
+    TUNER_R820T = 5
+    # rtl_tcp sends the buffers of librtlsdr, which hold 16 * 32 * 512 bytes by default
+    CHUNK_SIZE = 16 * 32 * 512
+
+    def __init__(self, samples, sample_rate: float = None, loop=True, chunk_size=CHUNK_SIZE, port=0):
+        """
+
+        :param samples: filename or bytes of interleaved 8 bit I/Q samples
+        :param sample_rate: rate to stream with in samples per second, None streams as fast as possible.
+                            Like for rtl_tcp, a chunk is sent as soon as its samples are due.
+        :param loop: restart from the beginning after the last sample, otherwise stop sending samples
+        :param port: port to listen on, 0 picks a free port
+        """
+        if isinstance(samples, str):
+            self.data = np.fromfile(samples, dtype=np.uint8)
+        else:
+            self.data = np.frombuffer(samples, dtype=np.uint8)
+
+        self.sample_rate = sample_rate
+        self.loop = loop
+        self.chunk_size = chunk_size
+
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", port))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+
+        self.commands = []  # received commands as (name, value)
+        self.bytes_sent = 0
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__serve, daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+        self.__thread.join(2)
+        self.server.close()
+
+    def __serve(self):
+        self.server.settimeout(0.1)
+        while not self.__stop.is_set():
+            try:
+                connection, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            with connection:
+                try:
+                    self.__stream(connection)
+                except ConnectionError:
+                    pass
+            return
+
+    def __stream(self, connection: socket.socket):
+        header = b"RTL0" + self.TUNER_R820T.to_bytes(4, "big") + (29).to_bytes(4, "big")
+        connection.sendall(header)
+
+        data = memoryview(self.data)
+        command_bytes = b""
+        position, chunk_end, start_time, start_bytes = 0, 0, time.time(), 0
+        while not self.__stop.is_set():
+            finished = position >= len(data) and not self.loop
+            readable, writable, _ = select.select([connection], [] if finished else [connection], [], 0.01)
+            if readable:
+                received = connection.recv(1024)
+                if not received:
+                    return
+                command_bytes += received
+                while len(command_bytes) >= 5:
+                    name = RTLSDRTCP.RTL_TCP_CONSTS[command_bytes[0]]
+                    value = int.from_bytes(command_bytes[1:5], "big")
+                    self.commands.append((name, value))
+                    command_bytes = command_bytes[5:]
+                    if name == "sampleRate" and self.sample_rate is not None:
+                        self.sample_rate, start_time, start_bytes = value, time.time(), self.bytes_sent
+
+            if finished:
+                continue
+            elif position >= len(data):
+                position = chunk_end = 0
+
+            if position >= chunk_end:
+                num_bytes = min(self.chunk_size, len(data) - position)
+                if self.sample_rate is not None:
+                    due = int(2 * self.sample_rate * (time.time() - start_time)) - (self.bytes_sent - start_bytes)
+                    if due < num_bytes:
+                        time.sleep(min(0.01, (num_bytes - due) / (2 * self.sample_rate)))
+                        continue
+                chunk_end = position + num_bytes
+
+            if writable:
+                sent = connection.send(data[position:chunk_end])
+                position += sent
+                self.bytes_sent += sent
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from tests.utils_testing import get_path_for_data_file
+from urh import settings
+from urh.signalprocessing.AnalysisCache import AnalysisCache
+from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
+from urh.signalprocessing.Signal import Signal
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = AnalysisCache(tempfile.mkdtemp(), max_size=10 ** 6)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache.directory)
+
+    def __get_signal(self) -> Signal:
+        signal = Signal(get_path_for_data_file("ask.complex"), "ASK")
+        signal.modulation_type = "ASK"
+        signal.samples_per_symbol = 295
+        signal.center = 0.0219
+        return signal
+
+    def test_get_and_put(self):
+        signal = self.__get_signal()
+        protocol = ProtocolAnalyzer(signal)
+        protocol.get_protocol_from_signal()
+        self.assertIsNone(self.cache.get(signal))
+
+        self.cache.put(signal, protocol.messages)
+        cached = self.cache.get(signal)
+        self.assertIsNotNone(cached)
+        self.assertIsNotNone(self.cache.get(self.__get_signal()))
+        self.assertEqual(cached["pauses"].tolist(), [msg.pause for msg in protocol.messages])
+
+        signal.samples_per_symbol = 300
+        self.assertIsNone(self.cache.get(signal))
+
+        signal.samples_per_symbol = 295
+        signal.changed = True
+        self.assertIsNone(signal.content_hash)
+        self.assertIsNone(self.cache.get(signal))
+
+    def test_messages_from_cache(self):
+        use_analysis_cache = settings.read("use_analysis_cache", False, bool)
+        settings.write("use_analysis_cache", True)
+        try:
+            with mock.patch.object(AnalysisCache, "get_default", return_value=self.cache):
+                signal = self.__get_signal()
+                protocol = ProtocolAnalyzer(signal)
+                protocol.get_protocol_from_signal()
+
+                # Second analysis of the same samples with the same parameters is read from the cache
+                cached_signal = self.__get_signal()
+                self.assertIsNotNone(self.cache.get(cached_signal))
+                cached_protocol = ProtocolAnalyzer(cached_signal)
+                cached_protocol.get_protocol_from_signal()
+        finally:
+            settings.write("use_analysis_cache", use_analysis_cache)
+
+        self.assertEqual(cached_protocol.plain_bits_str, protocol.plain_bits_str)
+        for msg, cached_msg in zip(protocol.messages, cached_protocol.messages):
+            self.assertEqual(list(msg.bit_sample_pos), list(cached_msg.bit_sample_pos))
+            self.assertEqual(msg.pause, cached_msg.pause)
+            self.assertAlmostEqual(msg.rssi, cached_msg.rssi)
+
+    def test_store_qad(self):
+        use_analysis_cache = settings.read("use_analysis_cache", False, bool)
+        store_qad = settings.read("analysis_cache_store_qad", False, bool)
+        settings.write("use_analysis_cache", True)
+        try:
+            with mock.patch.object(AnalysisCache, "get_default", return_value=self.cache):
+                settings.write("analysis_cache_store_qad", False)
+                signal = self.__get_signal()
+                ProtocolAnalyzer(signal).get_protocol_from_signal()
+                self.assertNotIn("qad", self.cache.get(signal))
+
+                self.cache.clear()
+                settings.write("analysis_cache_store_qad", True)
+                ProtocolAnalyzer(signal).get_protocol_from_signal()
+
+                cached_signal = self.__get_signal()
+                ProtocolAnalyzer(cached_signal).get_protocol_from_signal()
+                self.assertIsNotNone(cached_signal._qad)
+                np.testing.assert_array_equal(cached_signal.qad, signal.qad)
+        finally:
+            settings.write("use_analysis_cache", use_analysis_cache)
+            settings.write("analysis_cache_store_qad", store_qad)
+
+    def test_cache_disabled(self):
+        use_analysis_cache = settings.read("use_analysis_cache", False, bool)
+        settings.write("use_analysis_cache", False)
+        try:
+            with mock.patch.object(AnalysisCache, "get_default", return_value=self.cache):
+                ProtocolAnalyzer(self.__get_signal()).get_protocol_from_signal()
+            self.assertEqual(self.cache.size, 0)
+        finally:
+            settings.write("use_analysis_cache", use_analysis_cache)
+
+    def test_prune(self):
+        signal = self.__get_signal()
+        protocol = ProtocolAnalyzer(signal)
+        protocol.get_protocol_from_signal()
+
+        for samples_per_symbol in (100, 200, 300):
+            signal.samples_per_symbol = samples_per_symbol
+            self.cache.put(signal, protocol.messages)
+            os.utime(os.path.join(self.cache.directory, self.cache.get_key(signal) + ".npz"),
+                     ns=(samples_per_symbol, samples_per_symbol))
+
+        entry_size = self.cache.size // 3
+        signal.samples_per_symbol = 100
+        self.cache.get(signal)  # Most recently used now
+
+        self.assertEqual(self.cache.prune(2 * entry_size), (1, entry_size))
+        signal.samples_per_symbol = 200
+        self.assertIsNone(self.cache.get(signal))
+        signal.samples_per_symbol = 100
+        self.assertIsNotNone(self.cache.get(signal))
+
+        self.assertEqual(self.cache.clear()[0], 2)
+        self.assertEqual(self.cache.size, 0)
@@ -108,6 +108,24 @@ class TestAnalysisTabGUI(QtTestCase):
 
         self.assertEqual(self.cfc.ui.lSearchTotal.text(), "18")
 
+    def test_search_regex(self):
+        self.cfc.ui.cbProtoView.setCurrentIndex(1)
+        self.cfc.ui.lineEditSearch.setText("aaaaaaaa")
+        self.cfc.ui.btnSearchSelectFilter.click()
+        self.assertEqual(self.cfc.ui.lSearchTotal.text(), "18")
+
+        self.cfc.regex_search_action.setChecked(True)
+        self.cfc.ui.lineEditSearch.setText("^a{8}")
+        self.cfc.ui.btnSearchSelectFilter.click()
+        results = self.cfc.protocol_model.search_results
+        self.assertGreater(len(results), 0)
+        self.assertTrue(all(end - start == 8 for _, start, end in results))
+        self.assertEqual(len(self.cfc.ui.tblViewProtocol.selectedIndexes()), 8)
+
+        self.cfc.ui.lineEditSearch.setText("a(")
+        self.cfc.ui.btnSearchSelectFilter.click()
+        self.assertEqual(self.cfc.ui.lSearchTotal.text(), "-")
+
     def test_search_without_results(self):
         search_str = "deadbeef42"
         self.cfc.ui.cbProtoView.setCurrentIndex(1)
@@ -401,3 +419,49 @@ class TestAnalysisTabGUI(QtTestCase):
                     break
 
         self.assertTrue(aligned)
+
+    def test_add_sniffed_protocol_messages(self):
+        model = self.cfc.protocol_model
+        num_rows = model.row_count
+        self.assertGreater(num_rows, 0)
+
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+
+        messages = [copy.deepcopy(msg) for msg in self.cfc.proto_analyzer.messages[:3]]
+        for msg in messages:
+            msg.timestamp = 1000
+        self.cfc.add_sniffed_protocol_messages(messages)
+
+        self.assertEqual(inserted, [(num_rows, num_rows + 2)])
+        self.assertEqual(model.row_count, num_rows + 3)
+        self.assertEqual(self.cfc.rows_for_protocols[self.cfc.protocol_list[-1]], [num_rows, num_rows + 1, num_rows + 2])
+        self.assertEqual(model.first_messages[-1], num_rows + 3)
+        for i in range(3):
+            self.assertEqual(model.data(model.index(num_rows + i, 0)), model.data(model.index(i, 0)))
+            self.assertEqual(model.display_data[num_rows + i], model.display_data[i])
+
+        self.cfc.refresh()
+        self.assertEqual(model.row_count, num_rows + 3)
+
+    def test_find_differences(self):
+        model = self.cfc.protocol_model
+        self.cfc.ui.cbProtoView.setCurrentIndex(1)
+        self.cfc.proto_analyzer.messages[1].alignment_offset = 8
+        self.cfc.proto_analyzer.messages[2].plain_bits = self.cfc.proto_analyzer.messages[2].plain_bits[:20]
+        model.update()
+
+        differences = model.find_differences(0)
+        for i in range(1, model.row_count):
+            ref, msg = model.display_data[0], model.display_data[i]
+            offset = model.get_alignment_offset_at(i)
+            expected = {j for j in range(offset, max(len(ref), len(msg) + offset))
+                        if j >= min(len(ref), len(msg) + offset) or msg[j - offset] != ref[j]}
+            self.assertEqual(differences[i], expected)
+
+        model.refindex = 0
+        self.assertEqual(set(model.diff_columns.columns(2).tolist()), differences[2])
+        self.assertFalse(model.diff_columns.is_different(0, 0))
+        self.assertFalse(model.diff_columns.is_different(1, 0))
+        self.assertTrue(model.diff_columns.is_different(2, len(model.display_data[0]) - 1))
+        self.assertTrue(model.data(model.index(2, len(model.display_data[0]) - 1), Qt.FontRole).bold())
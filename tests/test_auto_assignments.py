@@ -9,7 +9,7 @@ from urh.signalprocessing.Message import Message
 from urh.signalprocessing.MessageType import MessageType
 from urh.signalprocessing.Participant import Participant
 from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
-from urh.signalprocessing.Ruleset import Rule, Ruleset, Mode
+from urh.signalprocessing.Ruleset import Rule, Ruleset, Mode, RulesetView
 
 
 class TestAutoAssignments(unittest.TestCase):
@@ -60,6 +60,68 @@ class TestAutoAssignments(unittest.TestCase):
             else:
                 self.assertEqual(message.message_type, self.protocol.default_message_type, msg=str(i))
 
+    def test_ruleset_applies_for_view(self):
+        self.protocol.messages.append(Message.from_plain_bits_str(""))
+        self.protocol.messages.append(Message.from_plain_bits_str("1010"))
+        view = RulesetView(self.protocol.messages, lambda vt: self.protocol.get_view_strings(vt, decoded=True))
+
+        rules = [Rule(8, 15, "=", "9a7d9a7d", 1), Rule(0, 3, ">", "1010", 0), Rule(2, 5, "<=", "2d", 1),
+                 Rule(0, 1, "!=", "", 2), Rule(30, 200, ">=", "aa", 1), Rule(4, 4, "<", "0", 0),
+                 Rule(2, 4, ">", "\x80", 2), Rule(-1, 3, "=", "1", 0)]
+        for rule in rules:
+            expected = [rule.applies_for_message(msg) for msg in self.protocol.messages]
+            self.assertEqual(rule.applies_for_view(view).tolist(), expected, msg=str(rule.key))
+
+        for mode in Mode:
+            ruleset = Ruleset(mode, rules[:3])
+            expected = [ruleset.applies_for_message(msg) for msg in self.protocol.messages]
+            self.assertEqual(ruleset.applies_for_view(view).tolist(), expected, msg=str(mode))
+
+    def test_auto_message_types_cache(self):
+        msg_type = MessageType("autotest")
+        msg_type.ruleset = Ruleset(Mode.all_apply, [Rule(8, 15, "=", "9a7d9a7d", 1)])
+        msg_type.assigned_by_ruleset = True
+        self.protocol.message_types.append(msg_type)
+
+        self.protocol.update_auto_message_types()
+        self.assertEqual(self.protocol.messages[1].message_type, self.protocol.default_message_type)
+
+        # Editing a message must invalidate the cached results
+        self.protocol.messages[1].plain_bits = copy.copy(self.protocol.messages[0].plain_bits)
+        self.protocol.update_auto_message_types()
+        self.assertEqual(self.protocol.messages[1].message_type, msg_type)
+
+        # Changing a rule must invalidate the cached results
+        msg_type.ruleset[0].target_value = "0"
+        for message in self.protocol.messages:
+            message.message_type = self.protocol.default_message_type
+        self.protocol.update_auto_message_types()
+        self.assertTrue(all(msg.message_type == self.protocol.default_message_type for msg in self.protocol.messages))
+
+    def test_auto_message_types_cache_label_alignment(self):
+        msg_type = MessageType("autotest")
+        msg_type.ruleset = Ruleset(Mode.all_apply, [Rule(8, 15, "=", "9a7d9a7d", 1)])
+        msg_type.assigned_by_ruleset = True
+        self.protocol.message_types.append(msg_type)
+        self.protocol.update_auto_message_types()
+        self.assertEqual(self.protocol.messages[0].message_type, msg_type)
+
+        # Hex view of all messages shifts as it gets aligned to the new label
+        for message in self.protocol.messages:
+            message.message_type = self.protocol.default_message_type
+        self.protocol.default_message_type.add_protocol_label(0, 1)
+        expected = [msg_type.ruleset.applies_for_message(msg) for msg in self.protocol.messages]
+        self.protocol.update_auto_message_types()
+        self.assertEqual([msg.message_type is msg_type for msg in self.protocol.messages], expected)
+        self.assertFalse(any(expected))
+
+        # Disabling label alignment restores the unaligned hex view
+        for message in self.protocol.messages:
+            message.message_type = self.protocol.default_message_type
+            message.align_labels = False
+        self.protocol.update_auto_message_types()
+        self.assertEqual(self.protocol.messages[0].message_type, msg_type)
+
     def test_two_assign_participants_by_rssi(self):
         rssis = [[0.65389872, 0.13733707, 0.1226876, 0.73320961, 0.64940965, 0.12463234, 0.12296994,
                   0.68053716, 0.66020358, 0.12428901, 0.12312815, 0.69160986, 0.65582329, 0.12536003,
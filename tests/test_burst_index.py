@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from tests.utils_testing import get_path_for_data_file
+from urh import settings
+from urh.ainterpretation import AutoInterpretation
+from urh.signalprocessing.BurstIndex import BurstIndex
+from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
+from urh.signalprocessing.SampleOffsetMap import SampleOffsetMap
+from urh.signalprocessing.Signal import Signal
+
+
+class TestBurstIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, "fsk.complex")
+        shutil.copy(get_path_for_data_file("fsk.complex"), self.filename)
+        self.min_samples = settings.BURST_INDEX_MIN_SAMPLES
+        self.use_burst_index = settings.read("use_burst_index", False, bool)
+        settings.write("use_burst_index", True)
+
+    def tearDown(self):
+        settings.BURST_INDEX_MIN_SAMPLES = self.min_samples
+        settings.write("use_burst_index", self.use_burst_index)
+        shutil.rmtree(self.temp_dir)
+
+    def test_create_index(self):
+        signal = Signal(self.filename, "")
+        index = BurstIndex.from_iq_array(signal.iq_array)
+        magnitudes = signal.iq_array.magnitudes
+
+        self.assertEqual(index.noise_level, AutoInterpretation.detect_noise_level(magnitudes))
+        self.assertEqual(index.bursts.tolist(),
+                         [list(s) for s in AutoInterpretation.segment_messages_from_magnitudes(magnitudes,
+                                                                                                index.noise_level)])
+        self.assertGreater(len(index), 0)
+        for (start, end), rssi in zip(index.bursts, index.rssis):
+            expected = np.mean(signal.iq_array.subarray(start, end).magnitudes_normalized)
+            self.assertAlmostEqual(rssi, expected, places=5)
+
+        self.assertEqual(index.find_burst(0), 0)
+        self.assertEqual(index.find_burst(index.bursts[0, 1]), 1)
+        self.assertEqual(index.find_burst(signal.num_samples), len(index))
+
+    def test_signal_with_index(self):
+        settings.BURST_INDEX_MIN_SAMPLES = 0
+        signal = Signal(self.filename, "")
+        self.assertIsNotNone(signal.burst_index)
+        self.assertTrue(os.path.isfile(BurstIndex.get_filename(self.filename)))
+
+        loaded = BurstIndex.load(self.filename)
+        self.assertEqual(loaded.noise_level, signal.noise_threshold)
+        self.assertTrue(np.array_equal(loaded.bursts, signal.burst_index.bursts))
+
+        reference = Signal(self.filename, "")
+        reference.burst_index = None
+        self.assertTrue(signal.auto_detect(detect_modulation=True, detect_noise=True))
+        self.assertTrue(reference.auto_detect(detect_modulation=True, detect_noise=True))
+        self.assertEqual(signal.samples_per_symbol, reference.samples_per_symbol)
+        self.assertEqual(signal.center, reference.center)
+        self.assertEqual(signal.modulation_type, reference.modulation_type)
+
+        # Editing the signal drops the index
+        signal.mute_range(0, 10)
+        self.assertIsNone(signal.burst_index)
+
+        # Index gets invalid when the capture changes
+        with open(self.filename, "ab") as f:
+            f.write(np.zeros(2, dtype=np.float32).tobytes())
+        self.assertIsNone(BurstIndex.load(self.filename))
+
+    def test_signal_without_index(self):
+        settings.BURST_INDEX_MIN_SAMPLES = 0
+        settings.write("use_burst_index", False)
+        signal = Signal(self.filename, "")
+        self.assertIsNone(signal.burst_index)
+        self.assertFalse(os.path.isfile(BurstIndex.get_filename(self.filename)))
+
+    def test_extract_bursts(self):
+        signal = Signal(self.filename, "")
+        index = BurstIndex.from_iq_array(signal.iq_array)
+        iq_array, offset_map = index.extract(signal.iq_array, pre_padding=100, post_padding=100)
+
+        self.assertLess(len(iq_array), signal.num_samples)
+        self.assertEqual(offset_map.original_num_samples, signal.num_samples)
+        positions = np.arange(len(iq_array))
+        self.assertTrue(np.array_equal(iq_array.data, signal.iq_array.data[offset_map.to_original(positions)]))
+        for start, end in index.bursts:
+            self.assertIn(start, offset_map.to_original(positions))
+            self.assertIn(end - 1, offset_map.to_original(positions))
+
+        # Bursts with overlapping padding are merged
+        merged, merged_map = index.extract(signal.iq_array, pre_padding=signal.num_samples)
+        self.assertEqual(len(merged_map), 1)
+        self.assertEqual(merged_map.to_original(0), 0)
+
+    def test_protocol_of_compacted_capture(self):
+        burst = Signal(get_path_for_data_file("ask.complex"), "").iq_array.data
+        silence = np.zeros((50000, 2), dtype=np.float32)
+        original_filename = os.path.join(self.temp_dir, "sparse.complex")
+        np.concatenate((burst, silence, burst, silence, burst)).tofile(original_filename)
+
+        def get_protocol(filename: str) -> ProtocolAnalyzer:
+            signal = Signal(filename, "")
+            signal.modulation_type = "ASK"
+            signal.samples_per_symbol = 295
+            signal.center = 0.0219
+            signal.noise_threshold = 0.0255
+            protocol = ProtocolAnalyzer(signal)
+            protocol.get_protocol_from_signal()
+            return protocol
+
+        original = get_protocol(original_filename)
+        index = BurstIndex.from_iq_array(original.signal.iq_array, noise_level=original.signal.noise_threshold)
+        iq_array, offset_map = index.extract(original.signal.iq_array, pre_padding=2000, post_padding=2000)
+        compact_filename = os.path.join(self.temp_dir, "compact.complex")
+        iq_array.tofile(compact_filename)
+        offset_map.save(compact_filename)
+
+        compact = get_protocol(compact_filename)
+        self.assertIsNotNone(compact.signal.sample_offset_map)
+        self.assertLess(compact.signal.num_samples, original.signal.num_samples / 2)
+
+        self.assertEqual(len(compact.messages), 3)
+        self.assertEqual(compact.plain_bits_str[:2], original.plain_bits_str[:2])
+        for i in range(len(original.messages)):
+            self.assertEqual(compact.get_original_bit_sample_pos(i)[0], original.messages[i].bit_sample_pos[0])
+        for msg, original_msg in zip(compact.messages[:-1], original.messages[:-1]):
+            self.assertEqual(msg.pause, original_msg.pause)
+        self.assertAlmostEqual(compact.messages[1].timestamp - compact.messages[0].timestamp,
+                               (original.messages[1].bit_sample_pos[0] - original.messages[0].bit_sample_pos[0]) / 1e6)
+
+        compact.signal.mute_range(0, 10)
+        self.assertIsNone(compact.signal.sample_offset_map)
+
+        # Map gets invalid when the compacted capture changes
+        iq_array[:10] = 0
+        iq_array.tofile(compact_filename)
+        self.assertIsNone(SampleOffsetMap.load(compact_filename))
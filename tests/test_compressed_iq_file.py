@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from tests.utils_testing import get_path_for_data_file
+from urh.signalprocessing.CompressedIQFile import CompressedIQFile
+from urh.signalprocessing.IQArray import IQArray
+from urh.signalprocessing.Signal import Signal
+from urh.util import FileOperator
+
+
+class TestCompressedIQFile(unittest.TestCase):
+    def setUp(self):
+        self.filename = os.path.join(tempfile.gettempdir(), "test_compressed_iq_file.coco")
+
+    def tearDown(self):
+        if os.path.isfile(self.filename):
+            os.remove(self.filename)
+
+    def test_random_access(self):
+        data = np.random.randint(-128, 127, size=(1000, 2), dtype=np.int8)
+        for codec in CompressedIQFile.CODECS:
+            CompressedIQFile.write(self.filename, IQArray(data), codec=codec, chunk_samples=64)
+            f = CompressedIQFile(self.filename)
+
+            self.assertEqual(f.num_samples, 1000)
+            self.assertEqual(f.num_chunks, 16)
+            self.assertEqual(f.dtype, np.int8)
+            self.assertTrue(np.array_equal(f.read(0, 1000), data))
+            self.assertTrue(np.array_equal(f.read(60, 130), data[60:130]))
+            self.assertTrue(np.array_equal(f[990:2000], data[990:]))
+            self.assertTrue(np.array_equal(f[-1], data[-1]))
+            self.assertEqual(len(f.read(500, 500)), 0)
+            self.assertTrue(np.array_equal(f.to_iq_array().data, data))
+
+    def test_save_and_load_signal(self):
+        data = np.random.normal(size=(5000, 2)).astype(np.float32)
+        FileOperator.save_data(IQArray(data), self.filename)
+        self.assertTrue(CompressedIQFile.is_chunked_file(self.filename))
+
+        signal = Signal(self.filename, "")
+        self.assertTrue(np.array_equal(signal.iq_array.data, data))
+        self.assertFalse(any(f.endswith(".tmp") for f in os.listdir(os.path.dirname(self.filename))))
+
+    def test_load_legacy_file(self):
+        filename = get_path_for_data_file("xavax.coco")
+        self.assertFalse(CompressedIQFile.is_chunked_file(filename))
+        self.assertRaises(ValueError, CompressedIQFile, filename)
+        self.assertGreater(len(Signal(filename, "").iq_array), 0)
@@ -2,6 +2,8 @@ import os
 import random
 import tempfile
 
+import numpy as np
+
 from tests.QtTestCase import QtTestCase
 from urh.controller.dialogs.CSVImportDialog import CSVImportDialog
 
@@ -87,3 +89,37 @@ class TestCSVImportDialog(QtTestCase):
         i, _ = map(float, last_preview_line.split(";"))
         self.assertEqual(self.dialog.ui.tableWidgetPreview.item(20, self.i_column).text(), str(i))
         self.assertEqual(self.dialog.ui.tableWidgetPreview.item(20, self.q_column).text(), "0.0")
+
+    def test_chunked_import(self):
+        filename = os.path.join(tempfile.gettempdir(), "chunked.csv")
+        i_values, q_values = np.random.uniform(-2, 2, 1000), np.random.uniform(-2, 2, 1000)
+        with open(filename, "w") as f:
+            f.write("Timestamp,I,Q\n")
+            for i, (i_value, q_value) in enumerate(zip(i_values, q_values)):
+                f.write("{},{},{}\n".format(i / 1e6, i_value, q_value))
+                if i == 500:
+                    f.write("a comment in between\n")
+
+        expected = (i_values + 1j * q_values).astype(np.complex64)
+        iq_data, sample_rate = CSVImportDialog.parse_csv_file(filename, ",", 1, 2, 0)
+        self.assertEqual(sample_rate, 1e6)
+        np.testing.assert_array_almost_equal(iq_data, expected / abs(expected.max()))
+
+        target_filename = os.path.join(tempfile.gettempdir(), "chunked.complex")
+        progress = []
+        chunk_rows = CSVImportDialog.CHUNK_ROWS
+        CSVImportDialog.CHUNK_ROWS = 64
+        try:
+            num_samples, sample_rate = CSVImportDialog.import_csv_file(filename, target_filename, ",", 1, 2, 0,
+                                                                       skip_rows=11, decimation=3,
+                                                                       progress_callback=progress.append)
+        finally:
+            CSVImportDialog.CHUNK_ROWS = chunk_rows
+
+        expected = expected[10::3]
+        self.assertEqual(num_samples, len(expected))
+        self.assertAlmostEqual(sample_rate, 1e6 / 3)
+        self.assertEqual(progress[-1], 100)
+        self.assertEqual(progress, sorted(progress))
+        np.testing.assert_array_almost_equal(np.fromfile(target_filename, dtype=np.complex64),
+                                             expected / abs(expected.max()))
@@ -1,7 +1,9 @@
 import hashlib
+import io
 import os
 import tarfile
 import tempfile
+import wave
 from zipfile import ZipFile
 
 import numpy as np
@@ -11,6 +13,7 @@ from PyQt5.QtWidgets import QApplication, QFileDialog
 
 from tests.QtTestCase import QtTestCase
 from urh.signalprocessing.IQArray import IQArray
+from urh.signalprocessing.Signal import Signal
 from urh.util import FileOperator
 
 
@@ -23,6 +26,41 @@ class TestFileOperator(QtTestCase):
         self.assertTrue(os.path.isfile("test.wav"))
         os.remove("test.wav")
 
+    def test_load_wav(self):
+        filename = os.path.join(tempfile.gettempdir(), "test_load_wav.wav")
+        samples = np.array([[-8388608, 8388607], [0, -1], [4096, -4096]], dtype=np.int32)
+
+        w = wave.open(filename, "w")
+        w.setnchannels(2)
+        w.setsampwidth(3)
+        w.setframerate(48000)
+        w.writeframes(samples.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes())
+        w.close()
+
+        signal = Signal(filename, "")
+        self.assertEqual(signal.sample_rate, 48000)
+        self.assertEqual(signal.iq_array.dtype, np.float32)
+        self.assertFalse(signal.already_demodulated)
+        self.assertTrue(np.allclose(signal.iq_array.data, (samples + 0.5) / 8388607))
+
+        w = wave.open(filename, "w")
+        w.setnchannels(1)
+        w.setsampwidth(1)
+        w.setframerate(1000)
+        w.writeframes(np.array([0, 255, 128], dtype=np.uint8).tobytes())
+        w.close()
+
+        signal = Signal(filename, "")
+        self.assertTrue(signal.already_demodulated)
+        self.assertTrue(np.allclose(signal.iq_array.real, (np.array([0, 255, 128]) - 127.5) / 255))
+        self.assertTrue(np.all(signal.iq_array.imag == 0))
+
+        data = IQArray(np.array([0.5, -0.5, 0.25, -0.25], dtype=np.float32))
+        FileOperator.save_data(data, filename, sample_rate=10e3)
+        signal = Signal(filename, "")
+        self.assertTrue(np.allclose(signal.iq_array.data, data.data, atol=1e-4))
+        os.remove(filename)
+
     def test_uncompress_archives(self):
         temp_dir = tempfile.gettempdir()
         os.chdir(temp_dir)
@@ -58,6 +96,54 @@ class TestFileOperator(QtTestCase):
         zip_md5_after_save = hashlib.md5(open(os.path.join(temp_dir, "test.zip"), 'rb').read()).hexdigest()
         self.assertNotEqual(zip_md5, zip_md5_after_save)
 
+    def test_stream_archive_members(self):
+        temp_dir = tempfile.mkdtemp()
+        extract_dir = os.path.join(temp_dir, "extracted")
+        names = ["a.complex", "b.complex16s", "c.txt"]
+
+        for archive in ("test.tar", "test.tar.bz2", "test.zip"):
+            archive = os.path.join(temp_dir, archive)
+            if archive.endswith(".zip"):
+                with ZipFile(archive, "w") as zip:
+                    for i, name in enumerate(names):
+                        zip.writestr(name, np.full(8 * (i + 1), i, dtype=np.int8).tobytes())
+            else:
+                with tarfile.open(archive, "w:" + ("bz2" if archive.endswith("bz2") else "")) as tar:
+                    for i, name in enumerate(names):
+                        info = tarfile.TarInfo(name)
+                        info.size = 8 * (i + 1)
+                        tar.addfile(info, io.BytesIO(np.full(info.size, i, dtype=np.int8).tobytes()))
+
+            file_names = FileOperator.uncompress_archives([archive], extract_dir)
+            self.assertEqual([os.path.basename(f) for f in file_names], names)
+            # Only the text file is extracted, the signals get streamed from the archive
+            self.assertEqual(os.listdir(extract_dir), ["c.txt"])
+
+            signal = Signal(file_names[1], "")
+            self.assertEqual(signal.iq_array.dtype, np.int8)
+            self.assertEqual(len(signal.iq_array), 8)
+            self.assertTrue(np.all(signal.iq_array.data == 1))
+
+            FileOperator.save_data(IQArray(np.array([5, 6, 7, 8, 9, 10], dtype=np.int8)), file_names[1])
+            self.assertTrue(np.array_equal(Signal(file_names[1], "").iq_array.data, [[5, 6], [7, 8], [9, 10]]))
+            self.assertEqual(len(Signal(file_names[0], "").iq_array), 1)
+            self.assertEqual(len(FileOperator.uncompress_archives([archive], extract_dir)), 3)
+            self.assertFalse(any(f.endswith(".tmp") for f in os.listdir(temp_dir)))
+
+            # Saving again must not add further members
+            size = os.path.getsize(archive)
+            FileOperator.save_data(IQArray(np.array([1, 2, 3, 4, 5, 6], dtype=np.int8)), file_names[1])
+            self.assertTrue(np.array_equal(Signal(file_names[1], "").iq_array.data, [[1, 2], [3, 4], [5, 6]]))
+            if archive.endswith(".tar"):
+                self.assertEqual(os.path.getsize(archive), size)
+            FileOperator.save_data(IQArray(np.arange(2000, dtype=np.int8)), file_names[1])
+            self.assertEqual(len(Signal(file_names[1], "").iq_array), 1000)
+            if not archive.endswith(".zip"):
+                with tarfile.open(archive) as tar:
+                    self.assertEqual(tar.getnames(), names)
+
+            os.remove(os.path.join(extract_dir, "c.txt"))
+
     def test_get_open_dialog(self):
         d1 = FileOperator.get_open_dialog(directory_mode=False)
         self.assertEqual(d1.fileMode(), QFileDialog.ExistingFiles)
@@ -85,6 +85,22 @@ class TestGenerator(QtTestCase):
         gen_proto = gen_proto[:gen_proto.index(" ")]
         self.assertTrue(proto.startswith(gen_proto))
 
+    def test_cancel_modulation(self):
+        self.add_signal_to_form("ask.complex")
+        gframe = self.form.generator_tab_controller  # type: GeneratorTabController
+        self.add_signal_to_generator(signal_index=0)
+        buffer = gframe.prepare_modulation_buffer(gframe.total_modulated_samples, show_error=False)
+
+        # Cancel as soon as the first progress is reported
+        gframe.ui.prBarGeneration.valueChanged.connect(gframe.ui.btnCancelGeneration.click)
+        self.assertIsNone(gframe.modulate_data(buffer))
+        self.assertTrue(gframe.ui.prBarGeneration.isHidden())
+        self.assertTrue(gframe.ui.btnCancelGeneration.isHidden())
+
+        gframe.ui.prBarGeneration.valueChanged.disconnect(gframe.ui.btnCancelGeneration.click)
+        self.assertIsNotNone(gframe.modulate_data(buffer))
+        self.assertEqual(len(gframe.modulation_msg_indices), gframe.table_model.row_count)
+
     def test_close_signal(self):
         self.add_signal_to_form("ask.complex")
         sframe = self.form.signal_tab_controller.signal_frames[0]
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from urh.signalprocessing.ModulationCache import ModulationCache
+from urh.signalprocessing.Modulator import Modulator
+
+
+class TestModulationCache(unittest.TestCase):
+    def setUp(self):
+        self.modulator = Modulator("test")
+        self.modulator.samples_per_symbol = 100
+        self.bits = "1011001110001010"
+
+    def test_equal_to_modulator(self):
+        cache = ModulationCache()
+        for modulation_type in ("ASK", "FSK", "PSK", "GFSK"):
+            self.modulator.modulation_type = modulation_type
+            self.modulator.parameters = self.modulator.get_default_parameters()
+            for pause in (0, 1234):
+                for _ in range(2):
+                    cached = cache.modulate(self.modulator, self.bits, pause=pause)
+                    expected = self.modulator.modulate(self.bits, pause=pause)
+                    np.testing.assert_array_equal(cached.data, expected.data)
+
+        # The waveform is modulated once per modulation type and reused for other pauses
+        self.assertEqual((cache.misses, cache.hits), (4, 12))
+
+    def test_phase_continuity(self):
+        cache = ModulationCache()
+        self.modulator.modulation_type = "FSK"
+        self.modulator.parameters = self.modulator.get_default_parameters()
+
+        first = cache.modulate(self.modulator, self.bits)
+        # A waveform continuing the phase of the first one must not be taken from the cache
+        continued = cache.modulate(self.modulator, self.bits, start=len(first))
+        np.testing.assert_array_equal(continued.data,
+                                      self.modulator.modulate(self.bits, start=len(first)).data)
+        self.assertFalse(np.array_equal(first.data, continued.data))
+        self.assertEqual(cache.misses, 2)
+
+    def test_parameter_change(self):
+        cache = ModulationCache()
+        first = cache.modulate(self.modulator, self.bits)
+        self.modulator.carrier_freq_hz = 20e3
+        second = cache.modulate(self.modulator, self.bits)
+        self.assertFalse(np.array_equal(first.data, second.data))
+        np.testing.assert_array_equal(cache.modulate(self.modulator, self.bits, dtype=np.int8).data,
+                                      self.modulator.modulate(self.bits, dtype=np.int8).data)
+        self.assertEqual(cache.misses, 3)
+
+    def test_eviction(self):
+        waveform_size = len(self.bits) * self.modulator.samples_per_symbol * 2 * 4
+        cache = ModulationCache(max_size=3 * waveform_size)
+        bits = ["{:016b}".format(i) for i in range(5)]
+        for b in bits:
+            cache.modulate(self.modulator, b, dtype=np.float32)
+
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.size, 3 * waveform_size)
+
+        cache.modulate(self.modulator, bits[-1], dtype=np.float32)
+        self.assertEqual(cache.hits, 1)
+        cache.modulate(self.modulator, bits[0], dtype=np.float32)
+        self.assertEqual(cache.misses, 6)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
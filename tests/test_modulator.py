@@ -1,6 +1,7 @@
 import array
 import os
 import tempfile
+import threading
 import time
 import unittest
 
@@ -144,3 +145,48 @@ class TestModulator(unittest.TestCase):
         result = modulate_c(bits, 100, "GFSK", parameters, 1, 1, 40e3, 0, 1e6, 1000, 0)
 
         # result.tofile("/tmp/test_gfsk.complex")
+
+        # Compare with a direct convolution of the frequencies with the gaussian filter in double precision
+        for bits_per_symbol, parameters, start in [(1, [-10e3, 10e3], 1234), (2, [-20e3, -5e3, 5e3, 20e3], 0)]:
+            bits = array.array("B", np.random.RandomState(0).randint(0, 2, 60 * bits_per_symbol))
+            sps, bt, width, sample_rate = 50, 0.5, 1.0, 1e6
+            result = modulate_c(bits, sps, "GFSK", array.array("f", parameters), bits_per_symbol, 1, 40e3, 0.3,
+                                sample_rate, 10, start, np.float32, bt, width)
+
+            symbols = np.reshape(bits, (-1, bits_per_symbol)).dot(1 << np.arange(bits_per_symbol)[::-1])
+            k = np.arange(-int(width * sps), int(width * sps) + 1)
+            gauss = np.exp(-(np.sqrt(2) * np.pi / np.sqrt(np.log(2)) * bt * k / sps) ** 2)
+            freqs = np.convolve(np.repeat(np.array(parameters)[symbols], sps), gauss / gauss.sum(), "same")
+            t = (start + np.arange(len(freqs))) / sample_rate
+            phases = 0.3 + np.concatenate(([0], np.cumsum(2 * np.pi * t[:-1] * (freqs[:-1] - freqs[1:]))))
+            expected = np.exp(1j * (2 * np.pi * freqs * t + phases))
+
+            np.testing.assert_allclose(result[:len(freqs), 0], expected.real, atol=1e-3)
+            np.testing.assert_allclose(result[:len(freqs), 1], expected.imag, atol=1e-3)
+            self.assertTrue(np.all(result[len(freqs):] == 0))
+
+    def test_modulate_batch(self):
+        modulators = [Modulator("ASK"), Modulator("FSK")]
+        modulators[1].modulation_type = "FSK"
+        modulators[1].parameters = modulators[1].get_default_parameters()
+        modulators[1].samples_per_symbol = 50
+
+        rng = np.random.RandomState(42)
+        data = [array.array("B", rng.randint(0, 2, rng.randint(0, 64))) for _ in range(500)]
+        pauses = rng.randint(0, 1000, len(data)).tolist()
+        modulator_indices = rng.randint(0, 2, len(data)).tolist()
+
+        progress = []
+        buffer, ends = Modulator.modulate_batch(modulators, data, pauses, modulator_indices, dtype=np.float32,
+                                                num_threads=4, progress_callback=progress.append)
+
+        expected = np.concatenate([modulators[i].modulate(bits, pause=pause, dtype=np.float32).data
+                                   if len(bits) > 0 else np.zeros((pause, 2), dtype=np.float32)
+                                   for bits, pause, i in zip(data, pauses, modulator_indices)])
+        np.testing.assert_array_equal(buffer.data, expected)
+        self.assertEqual(ends[-1], len(expected))
+        self.assertEqual(progress[-1], len(data))
+
+        cancel_event = threading.Event()
+        cancel_event.set()
+        self.assertEqual(Modulator.modulate_batch(modulators, data, pauses, cancel_event=cancel_event), (None, None))
@@ -0,0 +1,85 @@
+import socket
+import time
+import unittest
+
+import numpy as np
+
+from urh.plugins.NetworkSDRInterface.NetworkSDRInterfacePlugin import NetworkSDRInterfacePlugin
+from urh.signalprocessing.IQArray import IQArray
+from urh.util import util
+
+
+class TestNetworkSDRTransport(unittest.TestCase):
+    def setUp(self):
+        self.receiver = NetworkSDRInterfacePlugin(raw_mode=True)
+        self.receiver.receive_buffer = IQArray(None, dtype=np.float32, n=100000)
+        self.receiver.server_port = util.get_free_port()
+
+        self.sender = NetworkSDRInterfacePlugin(raw_mode=True, sending=True)
+        self.sender.client_port = self.receiver.server_port
+
+    def tearDown(self):
+        self.receiver.stop_tcp_server()
+
+    def wait_for_samples(self, num_samples: int):
+        for _ in range(200):
+            if self.receiver.current_receive_index >= num_samples:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.receiver.current_receive_index, num_samples)
+
+    def test_raw_tcp(self):
+        self.receiver.start_tcp_server_for_receiving()
+        samples = np.random.uniform(-1, 1, (5000, 2)).astype(np.float32)
+        data = samples.tobytes()
+
+        sock = socket.create_connection(("127.0.0.1", self.receiver.server_port))
+        try:
+            # Samples split at arbitrary positions are available before the connection is closed
+            for start, end in [(0, 3), (3, 1001), (1001, 20000), (20000, len(data))]:
+                sock.sendall(data[start:end])
+                time.sleep(0.01)
+            self.wait_for_samples(len(samples))
+        finally:
+            sock.close()
+
+        np.testing.assert_array_equal(self.receiver.received_data, samples)
+
+    def test_framed_tcp(self):
+        self.receiver.start_tcp_server_for_receiving()
+        self.sender.transport = NetworkSDRInterfacePlugin.TRANSPORT_FRAMED_TCP
+        self.sender.SEND_BATCH_SIZE = 4096
+
+        for dtype in (np.float32, np.int16):
+            self.receiver.current_receive_index = 0
+            samples = IQArray(np.random.uniform(-1, 1, (20000, 2)).astype(np.float32)).convert_to(dtype)
+            self.sender.send_raw_data(IQArray(samples), 1)
+            self.wait_for_samples(len(samples))
+            np.testing.assert_array_equal(self.receiver.received_data,
+                                          IQArray(samples).convert_to(np.float32))
+
+        self.assertEqual(self.receiver.num_lost_frames, 0)
+
+    def test_framed_udp(self):
+        self.receiver.transport = NetworkSDRInterfacePlugin.TRANSPORT_FRAMED_UDP
+        self.receiver.start_tcp_server_for_receiving()
+        self.sender.transport = NetworkSDRInterfacePlugin.TRANSPORT_FRAMED_UDP
+
+        samples = np.random.uniform(-1, 1, (20000, 2)).astype(np.float32)
+        self.sender.send_raw_data(IQArray(samples), 1)
+        self.wait_for_samples(len(samples))
+        np.testing.assert_array_equal(self.receiver.received_data, samples)
+        self.assertEqual(self.receiver.num_lost_frames, 0)
+
+        # The sender used sequence numbers 0 to 2, so frames 3, 5, 6 and 7 are accounted as lost
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        with sock:
+            for sequence in (4, 8):
+                header = NetworkSDRInterfacePlugin.pack_frame_header(sequence, 10, np.float32)
+                sock.sendto(header + samples[:10].tobytes(), ("127.0.0.1", self.receiver.server_port))
+        self.wait_for_samples(len(samples) + 20)
+        self.assertEqual(self.receiver.num_lost_frames, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -57,6 +57,41 @@ class TestProjectManager(QtTestCase):
         self.form.project_manager.set_project_folder(self.form.project_manager.project_path, close_all=False)
         self.assertEqual(len(self.gframe.modulators), 2)
 
+    def test_save_unchanged_project(self):
+        self.add_signal_to_form("ask.complex")
+        self.form.save_project()
+
+        project_file = self.form.project_manager.project_file
+        mtime = os.stat(project_file).st_mtime_ns
+        self.form.save_project()
+        self.assertEqual(os.stat(project_file).st_mtime_ns, mtime)
+
+        self.form.signal_tab_controller.signal_frames[0].signal.name = "renamed"
+        self.form.compare_frame_controller.proto_analyzer.messages[0].pause = 1337
+        self.form.save_project()
+
+        with open(project_file) as f:
+            content = f.read()
+        self.assertIn('name="renamed"', content)
+        self.assertIn('pause="1337"', content)
+        self.assertFalse(any(f.endswith(".tmp") for f in os.listdir(os.path.dirname(project_file))))
+
+    def test_save_project_after_writing_signal_information(self):
+        self.add_signal_to_form("ask.complex")
+        signal = self.form.signal_tab_controller.signal_frames[0].signal
+        self.form.save_project()
+
+        # Writing the signal information changes the tag of the last save
+        signal.name = "renamed"
+        self.form.project_manager.write_signal_information_to_project_file(signal)
+        signal.name = "ask"
+        self.form.save_project()
+
+        with open(self.form.project_manager.project_file) as f:
+            content = f.read()
+        self.assertIn('name="ask"', content)
+        self.assertNotIn('name="renamed"', content)
+
     def test_close_all(self):
         self.form.close_project()
 
@@ -1,9 +1,16 @@
+import copy
 import os
 import tempfile
 import unittest
+from unittest import mock
 
 from tests.utils_testing import get_path_for_data_file
+from urh.signalprocessing.Encoding import Encoding
 from urh.signalprocessing.Message import Message
+from urh.signalprocessing.MessageColumns import MessageColumns
+from urh.signalprocessing.MessageType import MessageType
+from urh.signalprocessing.Participant import Participant
+from urh.signalprocessing.ProtocoLabel import ProtocolLabel
 from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
 from urh.signalprocessing.Signal import Signal
 
@@ -65,3 +72,146 @@ class TestProtocolAnalyzer(unittest.TestCase):
         pa.from_binary(filename)
         self.assertEqual(len(pa.messages), 3)
         self.assertEqual(pa.plain_bits_str[2], "111000111001101111101000")
+
+    def test_binary_sidecar(self):
+        alice, bob = Participant("Alice", "A"), Participant("Bob", "B")
+        decodings = [Encoding(["Non Return To Zero (NRZ)"]), Encoding(["Non Return To Zero Inverted (NRZ-I)", "Invert"])]
+
+        pa = ProtocolAnalyzer(None)
+        other_type = MessageType("other", iterable=[ProtocolLabel("data", 2, 5, 0)])
+        pa.message_types.append(other_type)
+        for i, bits in enumerate(["1110001110011011", "11101", "", "101"]):
+            message = Message.from_plain_bits_str(bits, pause=1000 * i)
+            message.timestamp = 42.5 + i
+            message.rssi = 0.25 * i
+            message.participant = [alice, bob, None, alice][i]
+            message.message_type = other_type if i % 2 else pa.default_message_type
+            message.decoder = decodings[i % 2]
+            pa.messages.append(message)
+
+        filename = os.path.join(tempfile.mkdtemp(), "test.proto.xml")
+        pa.to_xml_file(filename, decoders=decodings, participants=[alice, bob], write_bits=True, binary_sidecar=True)
+        self.assertTrue(os.path.isfile(os.path.join(os.path.dirname(filename), "test.proto.msgs")))
+        with open(filename) as f:
+            self.assertNotIn("<message ", f.read())
+
+        loaded = ProtocolAnalyzer(None)
+        loaded.from_xml_file(filename, read_bits=True)
+        self.assertEqual(len(loaded.messages), 4)
+        self.assertEqual([len(msg) for msg in loaded.messages], [16, 5, 0, 3])
+        self.assertEqual(loaded.plain_bits_str, pa.plain_bits_str)
+        self.assertEqual([msg.pause for msg in loaded.messages], [0, 1000, 2000, 3000])
+        self.assertEqual([msg.timestamp for msg in loaded.messages], [42.5, 43.5, 44.5, 45.5])
+        self.assertEqual([msg.rssi for msg in loaded.messages], [0, 0.25, 0.5, 0.75])
+        self.assertEqual([msg.participant for msg in loaded.messages], [alice, bob, None, alice])
+        self.assertEqual([msg.decoder for msg in loaded.messages], [decodings[i % 2] for i in range(4)])
+        self.assertEqual([msg.message_type.name for msg in loaded.messages], ["Default", "other", "Default", "other"])
+        self.assertIs(loaded.messages[1].message_type, loaded.messages[3].message_type)
+        self.assertEqual(loaded.messages[1].message_type[0].start, 2)
+
+        # Saving again to the same file must not break messages that were not loaded yet
+        loaded.to_xml_file(filename, decoders=decodings, participants=[alice, bob], write_bits=True,
+                           binary_sidecar=True)
+        reloaded = ProtocolAnalyzer(None)
+        reloaded.from_xml_file(filename, read_bits=True)
+        self.assertEqual(reloaded.plain_bits_str, pa.plain_bits_str)
+
+    @unittest.skipUnless(os.path.isfile("/proc/self/maps"), "requires /proc/self/maps")
+    def test_binary_sidecar_save_to_loaded_file(self):
+        pa = ProtocolAnalyzer(None)
+        for bits in ["1110001110011011", "11101", "101"]:
+            pa.messages.append(Message.from_plain_bits_str(bits))
+
+        filename = os.path.join(tempfile.mkdtemp(), "test.proto.xml")
+        sidecar_filename = os.path.realpath(os.path.join(os.path.dirname(filename), "test.proto.msgs"))
+        pa.to_xml_file(filename, decoders=[], participants=[], write_bits=True, binary_sidecar=True)
+
+        loaded = ProtocolAnalyzer(None)
+        loaded.from_xml_file(filename, read_bits=True)
+        # Copy shares the lazily loaded bits, which are not loaded by saving the protocol
+        not_loaded = copy.deepcopy(loaded.messages[1])
+
+        def is_mapped():
+            with open("/proc/self/maps") as f:
+                return any(line.rstrip("\n").endswith(sidecar_filename) for line in f)
+
+        self.assertTrue(is_mapped())
+
+        # A mapped file cannot be replaced on Windows, so it must be unmapped before saving to it
+        os_replace = os.replace
+
+        def replace(src, dst):
+            self.assertFalse(is_mapped())
+            os_replace(src, dst)
+
+        with mock.patch("os.replace", replace):
+            loaded.to_xml_file(filename, decoders=[], participants=[], write_bits=True, binary_sidecar=True)
+
+        self.assertEqual(not_loaded.plain_bits_str, "11101")
+        reloaded = ProtocolAnalyzer(None)
+        reloaded.from_xml_file(filename, read_bits=True)
+        self.assertEqual(reloaded.plain_bits_str, pa.plain_bits_str)
+
+    def test_columnar_export(self):
+        alice, bob = Participant("Alice", "A", address_hex="ab"), Participant("Bob", "B")
+
+        pa = ProtocolAnalyzer(None)
+        other_type = MessageType("other", iterable=[ProtocolLabel("data", 2, 5, 0)])
+        pa.message_types.append(other_type)
+        for i, bits in enumerate(["1110001110011011", "11101", "", "101"]):
+            message = Message.from_plain_bits_str(bits, pause=1000 * i)
+            message.timestamp = 42.5 + i
+            message.rssi = 0.25 * i
+            message.participant = [alice, bob, None, alice][i]
+            message.message_type = other_type if i % 2 else pa.default_message_type
+            pa.messages.append(message)
+
+        directory = tempfile.mkdtemp()
+        MessageColumns.CHUNK_MESSAGES, chunk_messages = 3, MessageColumns.CHUNK_MESSAGES
+        try:
+            pa.to_npz(os.path.join(directory, "test.npz"))
+            pa.to_column_directory(os.path.join(directory, "columns"))
+        finally:
+            MessageColumns.CHUNK_MESSAGES = chunk_messages
+
+        for path in ("test.npz", "columns"):
+            columns = MessageColumns.load(os.path.join(directory, path))
+            self.assertEqual(columns["data"].shape, (4, 2))
+            self.assertEqual(columns["data"][0].tolist(), [0b11100011, 0b10011011])
+            self.assertEqual(columns["bit_lengths"].tolist(), [16, 5, 0, 3])
+            for i in range(4):
+                self.assertEqual("".join(map(str, MessageColumns.unpack_bits(columns, i))), pa.plain_bits_str[i])
+            self.assertEqual(columns["pauses"].tolist(), [0, 1000, 2000, 3000])
+            self.assertEqual(columns["timestamps"].tolist(), [42.5, 43.5, 44.5, 45.5])
+            self.assertEqual(columns["rssis"].tolist(), [0, 0.25, 0.5, 0.75])
+            self.assertEqual(columns["participant_names"].tolist(), ["Alice", "Bob"])
+            self.assertEqual(columns["participant_addresses"].tolist(), ["ab", ""])
+            self.assertEqual(columns["participant_indices"].tolist(), [0, 1, -1, 0])
+            self.assertEqual(columns["message_type_names"].tolist(), ["Default", "other"])
+            self.assertEqual(columns["message_type_indices"].tolist(), [0, 1, 0, 1])
+            self.assertEqual(columns["label_names"].tolist(), ["data"])
+            self.assertEqual(columns["label_message_type_indices"].tolist(), [1])
+            self.assertEqual(columns["label_starts"].tolist(), [2])
+            self.assertEqual(columns["label_ends"].tolist(), [6])
+
+    def test_view_arrays_with_label_alignment(self):
+        pa = ProtocolAnalyzer(None)
+        pa.default_message_type.append(ProtocolLabel("first", 0, 2, 0))
+        pa.default_message_type.append(ProtocolLabel("second", 3, 12, 1))
+        aligned_type = MessageType("aligned", iterable=pa.default_message_type)
+        pa.messages.append(Message.from_plain_bits_str("1011001011110010"))
+        pa.messages.append(Message.from_plain_bits_str("10110100111"))
+        pa.messages.append(Message.from_plain_bits_str(""))
+        pa.messages[0].message_type = pa.default_message_type
+        pa.messages[1].message_type = aligned_type
+
+        for view in (1, 2):
+            arrays = pa.get_view_arrays(view, decoded=False)
+            strings = pa.get_view_strings(view, decoded=False)
+            for msg, arr, string in zip(pa.messages, arrays, strings):
+                expected = msg.plain_hex_array if view == 1 else msg.plain_ascii_array
+                self.assertEqual(list(arr), list(expected))
+                self.assertEqual(string, msg.plain_hex_str if view == 1 else msg.plain_ascii_str)
+
+        self.assertEqual(pa.plain_hex_str, ["a9784", "aa7", ""])
+        self.assertEqual(pa.plain_bits_str, ["1011001011110010", "10110100111", ""])
@@ -0,0 +1,45 @@
+import unittest
+
+from urh.signalprocessing.Message import Message
+from urh.signalprocessing.ProtocolAnalyzer import ProtocolAnalyzer
+from urh.signalprocessing.ProtocolSearchIndex import ProtocolSearchIndex
+
+
+class TestProtocolSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.protocol = ProtocolAnalyzer(None)
+        for bits in ("10101010", "1111000010101010", "", "0000"):
+            self.protocol.messages.append(Message.from_plain_bits_str(bits))
+
+    def test_substring(self):
+        index = ProtocolSearchIndex(self.protocol, view=0)
+        self.assertEqual(index.find("1010"), [(0, 0, 4), (0, 2, 6), (0, 4, 8),
+                                              (1, 8, 12), (1, 10, 14), (1, 12, 16)])
+        self.assertEqual(index.find("0000"), [(1, 4, 8), (3, 0, 4)])
+        self.assertEqual(index.find("1010", start_message=1), [(1, 8, 12), (1, 10, 14), (1, 12, 16)])
+        self.assertEqual(index.find("00001"), [(1, 4, 9)])
+
+        hex_index = ProtocolSearchIndex(self.protocol, view=1)
+        self.assertEqual(hex_index.find("aa"), [(0, 0, 2), (1, 2, 4)])
+
+    def test_wildcard(self):
+        index = ProtocolSearchIndex(self.protocol, view=1)
+        self.assertEqual(index.find("?a"), [(0, 0, 2), (1, 1, 3), (1, 2, 4)])
+        self.assertEqual(index.find("f*a"), [(1, 0, 3)])
+
+        # no wildcards in ascii view
+        self.assertEqual(ProtocolSearchIndex(self.protocol, view=2).find("?"), [])
+
+    def test_regex(self):
+        index = ProtocolSearchIndex(self.protocol, view=0)
+        self.assertEqual(index.find("^1+", regex=True), [(0, 0, 1), (1, 0, 4)])
+        self.assertEqual(index.find("0{4}1", regex=True), [(1, 4, 9)])
+        # matches must not span messages
+        self.assertEqual(index.find("0[01]+", regex=True), [(0, 1, 8), (1, 4, 16), (3, 0, 4)])
+
+    def test_update(self):
+        index = ProtocolSearchIndex(self.protocol, view=0)
+        self.assertEqual(len(index.find("0000")), 2)
+        self.protocol.messages.append(Message.from_plain_bits_str("110000"))
+        self.assertEqual(index.find("0000", start_message=2), [(3, 0, 4), (4, 2, 6)])
+        self.assertEqual(index.num_indexed_messages, 5)
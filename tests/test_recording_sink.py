@@ -0,0 +1,98 @@
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from tests.test_shared_memory_ring import CountingDevice
+from urh.dev.RecordingSink import RecordingSink
+from urh.signalprocessing.CompressedIQFile import CompressedIQFile
+
+
+class TestRecordingSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "recording.complex")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def chunks(num_samples: int, chunk_size: int):
+        data = np.arange(2 * num_samples, dtype=np.float32).reshape((-1, 2))
+        return data, [data[i:i + chunk_size] for i in range(0, num_samples, chunk_size)]
+
+    def test_write(self):
+        data, chunks = self.chunks(100000, 1234)
+        sink = RecordingSink(self.filename, dtype=np.float32)
+        for chunk in chunks:
+            self.assertTrue(sink.write(chunk))
+        sink.close()
+
+        self.assertEqual(sink.filenames, [self.filename])
+        self.assertEqual(sink.num_written_samples, len(data))
+        self.assertEqual(sink.num_dropped_samples, 0)
+        np.testing.assert_array_equal(np.fromfile(self.filename, dtype=np.float32), data.flatten())
+
+    def test_split_files(self):
+        data, chunks = self.chunks(10000, 777)
+        # 3000 samples by duration are less than 4000 samples by size, so the duration limit applies
+        sink = RecordingSink(self.filename, dtype=np.float32, sample_rate=1e3, max_file_size=4000 * 8,
+                             max_file_duration=3, num_blocks=2)
+        for chunk in chunks:
+            sink.write(chunk)
+        sink.close()
+
+        self.assertEqual([os.path.basename(f) for f in sink.filenames],
+                         ["recording_{:04d}.complex".format(i) for i in range(4)])
+        parts = [np.fromfile(f, dtype=np.float32).reshape((-1, 2)) for f in sink.filenames]
+        self.assertEqual([len(p) for p in parts], [3000, 3000, 3000, 1000])
+        np.testing.assert_array_equal(np.concatenate(parts), data)
+
+        with self.assertRaises(ValueError):
+            RecordingSink(self.filename, max_file_duration=3)
+
+    def test_compressed(self):
+        data, chunks = self.chunks(50000, 4096)
+        sink = RecordingSink(self.filename, dtype=np.float32, compress=True)
+        for chunk in chunks:
+            sink.write(chunk)
+        sink.close()
+
+        self.assertEqual(sink.filenames, [self.filename + ".coco"])
+        np.testing.assert_array_equal(CompressedIQFile(sink.filenames[0]).to_iq_array().data, data)
+
+    def test_drop_samples(self):
+        sink = RecordingSink(self.filename, dtype=np.float32, num_blocks=1)
+        block_samples = RecordingSink.BLOCK_SIZE // 8
+
+        self.assertTrue(sink.write(np.zeros((block_samples, 2), dtype=np.float32)))
+        # The only block is passed to the writer thread, so further samples get dropped until it is free again
+        dropped = 0
+        for _ in range(100):
+            if not sink.write(np.ones((10, 2), dtype=np.float32)):
+                dropped += 10
+        sink.close()
+
+        self.assertEqual(sink.num_dropped_samples, dropped)
+        self.assertEqual(sink.num_received_samples, block_samples + 1000)
+        self.assertEqual(os.path.getsize(self.filename), 8 * sink.num_written_samples)
+
+    def test_device_recording(self):
+        device = CountingDevice(center_freq=433.92e6, sample_rate=1e6, bandwidth=1e6, gain=20)
+        device.recording_sink = RecordingSink(self.filename, dtype=np.float32)
+        device.start_rx_mode()
+
+        num_samples = CountingDevice.NUM_CHUNKS * CountingDevice.CHUNK_SAMPLES
+        deadline = time.time() + 10
+        while device.current_recv_index < num_samples and time.time() < deadline:
+            time.sleep(0.01)
+
+        device.stop_rx_mode("Test finished")
+        device.recording_sink.close()
+        np.testing.assert_array_equal(np.fromfile(self.filename, dtype=np.float32), np.arange(2 * num_samples))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from multiprocessing import Process
 
 import numpy as np
 
@@ -6,6 +7,14 @@ from urh.signalprocessing.IQArray import IQArray
 from urh.util.RingBuffer import RingBuffer
 
 
+def push_numbers(ring_buffer: RingBuffer, num_values: int, chunk_size: int):
+    for i in range(0, num_values, chunk_size):
+        values = np.arange(2 * i, 2 * min(i + chunk_size, num_values), dtype=np.float32).reshape((-1, 2))
+        while not ring_buffer.will_fit(len(values)):
+            pass
+        ring_buffer.push(values)
+
+
 class TestRingBuffer(unittest.TestCase):
     def test_push(self):
         ring_buffer = RingBuffer(size=10)
@@ -77,6 +86,54 @@ class TestRingBuffer(unittest.TestCase):
         self.assertTrue(ring_buffer.will_fit(4))
         self.assertFalse(ring_buffer.will_fit(5))
 
+    def test_pop_into(self):
+        ring_buffer = RingBuffer(size=8)
+        out = np.zeros((5, 2), dtype=np.float32)
+        self.assertEqual(ring_buffer.pop_into(out), 0)
+
+        ring_buffer.push(np.arange(12, dtype=np.float32).reshape((-1, 2)))
+        self.assertEqual(ring_buffer.pop_into(out), 5)
+        np.testing.assert_array_equal(out, np.arange(10).reshape((-1, 2)))
+
+        # wrap around the end of the buffer
+        ring_buffer.push(np.arange(100, 112, dtype=np.float32).reshape((-1, 2)))
+        self.assertEqual(ring_buffer.pop_into(out, ensure_even_length=True), 4)
+        np.testing.assert_array_equal(out[:4], [[10, 11], [100, 101], [102, 103], [104, 105]])
+        self.assertEqual(len(ring_buffer), 3)
+
+    def test_peek(self):
+        ring_buffer = RingBuffer(size=6)
+        ring_buffer.push(np.arange(8, dtype=np.float32).reshape((-1, 2)))
+        ring_buffer.consume(3)
+        ring_buffer.push(np.arange(8, 16, dtype=np.float32).reshape((-1, 2)))
+
+        first, second = ring_buffer.peek()
+        np.testing.assert_array_equal(first, [[6, 7], [8, 9], [10, 11]])
+        np.testing.assert_array_equal(second, [[12, 13], [14, 15]])
+        self.assertTrue(np.shares_memory(first, ring_buffer.data))
+
+        first, second = ring_buffer.peek(2)
+        self.assertEqual((len(first), len(second)), (2, 0))
+
+        ring_buffer.consume(4)
+        np.testing.assert_array_equal(ring_buffer.pop(-1), [[14, 15]])
+        np.testing.assert_array_equal(ring_buffer.view_data[-4:], [12, 13, 14, 15])
+
+    def test_transfer_between_processes(self):
+        ring_buffer = RingBuffer(size=1000)
+        num_values = 100000
+        p = Process(target=push_numbers, args=(ring_buffer, num_values, 300))
+        p.daemon = True
+        p.start()
+
+        result = np.empty((num_values, 2), dtype=np.float32)
+        pos = 0
+        while pos < num_values:
+            pos += ring_buffer.pop_into(result[pos:pos + 256])
+
+        p.join()
+        np.testing.assert_array_equal(result.flatten(), np.arange(2 * num_values))
+
 
 if __name__ == '__main__':
     unittest.main()
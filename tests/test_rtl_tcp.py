@@ -0,0 +1,84 @@
+import socket
+import threading
+import unittest
+from multiprocessing import Pipe
+
+import numpy as np
+
+from tests.rtl_tcp_stand_in import RTLTCPStandIn
+from urh.dev.native.RTLSDRTCP import RTLSDRTCP
+from urh.util.SocketReader import SocketReader
+
+
+class TestRTLTCP(unittest.TestCase):
+    def test_socket_reader(self):
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            reader = SocketReader(receiver, read_size=64, num_buffers=2, alignment=2)
+            sender.sendall(b"\x01\x02\x03")
+            self.assertEqual(bytes(reader.read_exactly(2)), b"\x01\x02")
+
+            # The incomplete frame is carried over to the next read
+            self.assertEqual(bytes(reader.read(timeout=1)), b"")
+            sender.sendall(b"\x04\x05")
+            self.assertEqual(bytes(reader.read(timeout=1)), b"\x03\x04")
+            self.assertEqual(len(reader.read(timeout=0.01)), 0)
+
+            sender.sendall(bytes(range(100)))
+            received = bytes(reader.read(timeout=1))
+            self.assertEqual(received, b"\x05" + bytes(range(63)))
+            # Frames larger than the buffers are read into a new buffer
+            sender.sendall(bytes(63))
+            self.assertEqual(bytes(reader.read_exactly(100)), bytes(range(63, 100)) + bytes(63))
+
+    def test_receive(self):
+        data = np.random.randint(0, 256, 2 * 10 ** 6, dtype=np.uint8).tobytes()
+        parent_data_conn, child_data_conn = Pipe(duplex=False)
+        parent_ctrl_conn, child_ctrl_conn = Pipe()
+
+        with RTLTCPStandIn(data, chunk_size=12345, loop=False) as server:
+            args = (child_data_conn, child_ctrl_conn, 0, 433.92e6, 2e6, 1e6, 20, 0, 0, "127.0.0.1", server.port)
+            receive_thread = threading.Thread(target=RTLSDRTCP.receive_sync, args=args, daemon=True)
+            receive_thread.start()
+
+            received = bytearray()
+            while len(received) < len(data):
+                self.assertTrue(parent_data_conn.poll(5))
+                chunk = parent_data_conn.recv_bytes()
+                self.assertEqual(len(chunk) % 2, 0)
+                received += chunk
+
+            parent_ctrl_conn.send(RTLSDRTCP.Command.STOP.name)
+            receive_thread.join(5)
+            self.assertFalse(receive_thread.is_alive())
+
+        self.assertEqual(bytes(received), data)
+        self.assertEqual(server.commands[:2], [("centerFreq", 433920000), ("sampleRate", 2000000)])
+        self.assertEqual(server.commands[-1], ("tunerGain", 20))
+
+    def test_receive_connection_closed(self):
+        parent_data_conn, child_data_conn = Pipe(duplex=False)
+        parent_ctrl_conn, child_ctrl_conn = Pipe()
+
+        with RTLTCPStandIn(bytes(1000), loop=False) as server:
+            args = (child_data_conn, child_ctrl_conn, 0, 433.92e6, 2e6, 1e6, 20, 0, 0, "127.0.0.1", server.port)
+            receive_thread = threading.Thread(target=RTLSDRTCP.receive_sync, args=args, daemon=True)
+            receive_thread.start()
+            self.assertTrue(parent_data_conn.poll(5))
+
+        # The receive loop ends by itself after rtl_tcp closed the connection
+        receive_thread.join(5)
+        self.assertFalse(receive_thread.is_alive())
+
+        messages = []
+        try:
+            while parent_ctrl_conn.poll():
+                messages.append(parent_ctrl_conn.recv())
+        except EOFError:
+            pass
+        self.assertIn("rtl_tcp closed the connection:1", messages)
+        self.assertEqual(messages[-1], "close:0")
+
+
+if __name__ == '__main__':
+    unittest.main()
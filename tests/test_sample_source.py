@@ -0,0 +1,91 @@
+import os
+import pickle
+import tempfile
+import unittest
+from multiprocessing import Value, Array
+
+import numpy as np
+
+from urh.dev.SampleSource import ArraySampleSource, FileSampleSource, GeneratorSampleSource
+from urh.dev.native.SendConfig import SendConfig
+from urh.signalprocessing.CompressedIQFile import CompressedIQFile
+from urh.signalprocessing.IQArray import IQArray
+
+
+def generate_chunks(num_chunks: int, chunk_size: int):
+    for i in range(num_chunks):
+        yield np.arange(2 * i * chunk_size, 2 * (i + 1) * chunk_size, dtype=np.float32).reshape((-1, 2))
+
+
+def iq_to_bytes(samples: np.ndarray):
+    arr = Array("B", 2 * len(samples), lock=False)
+    numpy_view = np.frombuffer(arr, dtype=np.uint8)
+    numpy_view[:] = samples.flatten(order="C")
+    return arr
+
+
+class TestSampleSource(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.samples = np.random.uniform(-1, 1, (10000, 2)).astype(np.float32)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_array_source(self):
+        source = ArraySampleSource(IQArray(self.samples))
+        self.assertEqual(len(source), len(self.samples))
+        np.testing.assert_array_equal(source.read(100, 200), self.samples[100:200])
+        np.testing.assert_array_equal(source[:50], self.samples[:50])
+
+        source = ArraySampleSource(self.samples.view(np.complex64).flatten())
+        np.testing.assert_array_equal(source.read(9990, 20000), self.samples[9990:])
+
+    def test_file_source(self):
+        filename = os.path.join(self.tmp_dir.name, "test.complex")
+        self.samples.tofile(filename)
+        source = FileSampleSource(filename)
+        self.assertEqual(len(source), len(self.samples))
+        np.testing.assert_array_equal(source.read(1234, 5678), self.samples[1234:5678])
+
+        source = pickle.loads(pickle.dumps(source))
+        np.testing.assert_array_equal(source.read(0, 10), self.samples[:10])
+
+        filename = os.path.join(self.tmp_dir.name, "test.coco")
+        CompressedIQFile.write(filename, IQArray(self.samples), chunk_samples=1000)
+        source = FileSampleSource(filename)
+        self.assertEqual(source.dtype, np.float32)
+        np.testing.assert_array_equal(source.read(1500, 4321), self.samples[1500:4321])
+
+    def test_generator_source(self):
+        source = GeneratorSampleSource(generate_chunks, 1200, 10, 100)
+        expected = np.arange(2000, dtype=np.float32).reshape((-1, 2))
+
+        np.testing.assert_array_equal(source.read(0, 150), expected[:150])
+        np.testing.assert_array_equal(source.read(150, 420), expected[150:420])
+        # Reading from the beginning again restarts the generator
+        np.testing.assert_array_equal(source.read(50, 60), expected[50:60])
+        # After the generator ends, zeros are returned
+        np.testing.assert_array_equal(source.read(990, 2000)[:10], expected[990:])
+        np.testing.assert_array_equal(source.read(1000, 2000), np.zeros((200, 2)))
+
+        source = pickle.loads(pickle.dumps(source))
+        np.testing.assert_array_equal(source.read(0, 1000), expected)
+
+    def test_send_config(self):
+        samples = np.random.randint(-128, 127, (5000, 2), dtype=np.int8)
+        source = GeneratorSampleSource(iter, len(samples), np.array_split(samples, 7))
+        send_config = SendConfig(source, Value("L", 0), Value("L", 0), total_samples=2 * len(samples),
+                                 sending_repeats=2, iq_to_bytes_method=iq_to_bytes, data_type=np.int8)
+
+        sent = []
+        while not send_config.sending_is_finished():
+            sent.append(np.frombuffer(send_config.get_data_to_send(1024), dtype=np.uint8).copy())
+
+        expected = np.tile(samples.flatten().view(np.uint8), 2)
+        np.testing.assert_array_equal(np.concatenate(sent), expected)
+        self.assertEqual(len(send_config.get_data_to_send(1024)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import os
+import pickle
 import socket
 import time
 from multiprocessing import Process, Value, Array
@@ -263,6 +264,25 @@ class TestSendRecvDialog(QtTestCase):
 
         continuous_send_dialog.close()
 
+    def test_continuous_send_dialog_sample_source(self):
+        self.add_signal_to_form("esaver.complex16s")
+        self.__add_first_signal_to_generator()
+
+        gframe = self.form.generator_tab_controller  # type: GeneratorTabController
+        for msg in gframe.table_model.protocol.messages:
+            msg.pause = 5000
+
+        expected = gframe.modulate_data(gframe.prepare_modulation_buffer(gframe.total_modulated_samples))
+
+        # Native devices modulate the messages in their send process while sending
+        continuous_send_dialog = self.__get_continuous_send_dialog()
+        sample_source = pickle.loads(pickle.dumps(continuous_send_dialog.sample_source))
+        self.assertEqual(len(sample_source), len(expected))
+        np.testing.assert_array_equal(sample_source.read(0, 12345), expected[:12345])
+        np.testing.assert_array_equal(sample_source.read(12345, len(expected)), expected[12345:])
+
+        continuous_send_dialog.close()
+
     def test_sniff(self):
         assert isinstance(self.form, MainController)
         # add a signal so we can use it
@@ -0,0 +1,145 @@
+import time
+import unittest
+from unittest import mock
+from multiprocessing import Process
+
+import numpy as np
+
+from urh.dev.native.Device import Device
+from urh.util.SharedMemoryRing import SharedMemoryRing
+
+
+def produce(ring: SharedMemoryRing, num_chunks: int, chunk_size: int):
+    for i in range(num_chunks):
+        chunk = np.arange(i * chunk_size, (i + 1) * chunk_size, dtype=np.float32)
+        # Wait for space for the record and a possible padding, so no chunk gets dropped
+        while ring.capacity - len(ring) < 2 * (chunk.nbytes + ring.RECORD_HEADER_SIZE):
+            time.sleep(0.001)
+        ring.send_bytes(chunk)
+    ring.close()
+
+
+class CountingDevice(Device):
+    """
+    Device sending consecutive numbers as samples
+    """
+    CHUNK_SAMPLES = 1000
+    NUM_CHUNKS = 50
+
+    @classmethod
+    def setup_device(cls, ctrl_connection, device_identifier):
+        return True
+
+    @classmethod
+    def process_command(cls, command, ctrl_connection, is_tx: bool):
+        if command == cls.Command.STOP.name:
+            return cls.Command.STOP.name
+
+    @classmethod
+    def prepare_sync_receive(cls, ctrl_connection):
+        cls.chunk_index = 0
+        return 0
+
+    @classmethod
+    def receive_sync(cls, data_conn):
+        if cls.chunk_index < cls.NUM_CHUNKS:
+            start = 2 * cls.chunk_index * cls.CHUNK_SAMPLES
+            data_conn.send_bytes(np.arange(start, start + 2 * cls.CHUNK_SAMPLES, dtype=np.float32))
+            cls.chunk_index += 1
+        else:
+            time.sleep(0.01)
+
+    @classmethod
+    def shutdown_device(cls, ctrl_connection, is_tx: bool):
+        pass
+
+    @staticmethod
+    def bytes_to_iq(buffer):
+        return np.frombuffer(buffer, dtype=np.float32).reshape((-1, 2), order="C")
+
+
+class TestSharedMemoryRing(unittest.TestCase):
+    def test_wrap_around(self):
+        ring = SharedMemoryRing(1000)
+        for i in range(100):
+            self.assertIsNone(ring.send_bytes(np.arange(i, i + 30, dtype=np.float32)))
+            view = ring.recv_view(timeout=0)
+            np.testing.assert_array_equal(np.frombuffer(view, dtype=np.float32), np.arange(i, i + 30))
+            del view
+
+        ring.release()
+        self.assertEqual(len(ring), 0)
+        self.assertIsNone(ring.recv_view(timeout=0))
+        self.assertEqual(ring.num_dropped, 0)
+        ring.close()
+
+    def test_overrun(self):
+        ring = SharedMemoryRing(1024)
+        for i in range(10):
+            ring.send_bytes(np.full(50, i, dtype=np.float32))
+
+        for i in range(4):
+            self.assertEqual(np.frombuffer(ring.recv_view(timeout=0), dtype=np.float32)[0], i)
+
+        ring.release()
+        ring.send_bytes(np.full(50, 10, dtype=np.float32))
+        self.assertEqual(np.frombuffer(ring.recv_view(timeout=0), dtype=np.float32)[0], 10)
+        self.assertEqual(ring.num_dropped, 6)
+        ring.close()
+
+    def test_transfer_between_processes(self):
+        ring = SharedMemoryRing(64 * 1024)
+        num_chunks, chunk_size = 500, 1000
+        p = Process(target=produce, args=(ring, num_chunks, chunk_size))
+        p.daemon = True
+        p.start()
+
+        received = []
+        while True:
+            try:
+                view = ring.recv_view(timeout=5)
+            except EOFError:
+                break
+            self.assertIsNotNone(view)
+            received.append(np.frombuffer(view, dtype=np.float32).copy())
+            del view
+
+        p.join()
+        ring.close()
+        self.assertEqual(len(received), num_chunks)
+        np.testing.assert_array_equal(np.concatenate(received), np.arange(num_chunks * chunk_size))
+
+    def test_device_receive(self):
+        device = CountingDevice(center_freq=433.92e6, sample_rate=1e6, bandwidth=1e6, gain=20)
+        device.start_rx_mode()
+        self.assertIsNotNone(device.receive_ring)
+
+        num_samples = CountingDevice.NUM_CHUNKS * CountingDevice.CHUNK_SAMPLES
+        deadline = time.time() + 10
+        while device.current_recv_index < num_samples and time.time() < deadline:
+            time.sleep(0.01)
+
+        device.stop_rx_mode("Test finished")
+        self.assertEqual(device.current_recv_index, num_samples)
+        np.testing.assert_array_equal(device.received_data.flatten(), np.arange(2 * num_samples))
+
+    def test_small_shared_memory(self):
+        with mock.patch.object(SharedMemoryRing, "get_free_memory", return_value=10 ** 5):
+            self.assertRaises(OSError, SharedMemoryRing, 10 ** 6)
+
+            device = CountingDevice(center_freq=433.92e6, sample_rate=1e6, bandwidth=1e6, gain=20)
+            self.assertEqual(device.get_receive_ring_size(), 5 * 10 ** 4)
+            device.start_rx_mode()
+            self.assertIsNone(device.receive_ring)
+
+        num_samples = CountingDevice.NUM_CHUNKS * CountingDevice.CHUNK_SAMPLES
+        deadline = time.time() + 10
+        while device.current_recv_index < num_samples and time.time() < deadline:
+            time.sleep(0.01)
+
+        device.stop_rx_mode("Test finished")
+        self.assertEqual(device.current_recv_index, num_samples)
+
+
+if __name__ == '__main__':
+    unittest.main()
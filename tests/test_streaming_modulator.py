@@ -0,0 +1,81 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from urh.dev.SampleSource import GeneratorSampleSource
+from urh.signalprocessing.Modulator import Modulator
+from urh.signalprocessing.StreamingModulator import StreamingModulator, stream_messages
+
+
+class TestStreamingModulator(unittest.TestCase):
+    def setUp(self):
+        self.bits = np.random.RandomState(42).randint(0, 2, 200).astype(np.uint8)
+
+    def get_modulator(self, modulation_type: str, bits_per_symbol=1):
+        modulator = Modulator(modulation_type)
+        modulator.modulation_type = modulation_type
+        modulator.samples_per_symbol = 20
+        modulator.bits_per_symbol = bits_per_symbol
+        modulator.parameters = modulator.get_default_parameters()
+        return modulator
+
+    def test_equal_to_modulator(self):
+        for modulation_type, bits_per_symbol in [("ASK", 1), ("FSK", 2), ("PSK", 2), ("GFSK", 1)]:
+            modulator = self.get_modulator(modulation_type, bits_per_symbol)
+            expected = modulator.modulate(self.bits, pause=100, dtype=np.float32).data
+
+            streaming_modulator = StreamingModulator(modulator, dtype=np.float32)
+            np.testing.assert_allclose(streaming_modulator.modulate(self.bits, pause=100).data, expected, atol=1e-4)
+
+            # Chunks that do not end at symbol boundaries give the same samples as modulating at once
+            streaming_modulator.reset()
+            chunks = [streaming_modulator.modulate(self.bits[i:i + 33]).data for i in range(0, len(self.bits), 33)]
+            chunks.append(streaming_modulator.flush().data)
+            np.testing.assert_allclose(np.concatenate(chunks), expected[:-100], atol=1e-4)
+            self.assertEqual(streaming_modulator.num_samples, len(expected) - 100)
+
+    def test_phase_continuity(self):
+        modulator = self.get_modulator("FSK")
+        streaming_modulator = StreamingModulator(modulator, dtype=np.float32)
+        samples = np.concatenate([streaming_modulator.modulate(self.bits).data for _ in range(50)])
+
+        # Phase steps between samples never exceed the one of the highest frequency
+        phases = np.angle(samples[:, 0] + 1j * samples[:, 1])
+        steps = np.abs(np.angle(np.exp(1j * np.diff(phases))))
+        max_step = 2 * np.pi * max(map(abs, modulator.parameters)) / modulator.sample_rate
+        self.assertLess(steps.max(), max_step + 1e-3)
+
+    def test_stream(self):
+        modulator = self.get_modulator("GFSK")
+        messages = [(self.bits[:100], 0), (self.bits[100:], 1000), (self.bits, 50)]
+        expected = np.concatenate([StreamingModulator(modulator, np.int16).modulate(bits, pause).data
+                                   for bits, pause in [(self.bits, 1000), (self.bits, 50)]])
+
+        blocks = list(StreamingModulator(modulator, np.int16).stream(messages, 512))
+        self.assertTrue(all(len(block) == 512 for block in blocks[:-1]))
+        self.assertEqual(sum(map(len, blocks)), len(expected))
+
+        source = GeneratorSampleSource(StreamingModulator(modulator, np.int16).stream, len(expected),
+                                       messages, 512, dtype=np.int16)
+        # The first message is streamed in two parts, the second one continues the phase after the pause
+        np.testing.assert_allclose(source.read(0, len(expected))[:4000], expected[:4000], atol=1)
+        self.assertTrue(np.all(source.read(4000, 5000) == 0))
+
+    def test_stream_messages(self):
+        modulator = self.get_modulator("FSK", bits_per_symbol=2)
+        messages = [(self.bits[:101], 0), (self.bits[101:], 100), (self.bits[:51], 0), (self.bits[:50], 0)]
+        num_samples = StreamingModulator.get_num_samples(modulator, messages)
+        self.assertEqual(num_samples, (100 * 20 + 100) + (101 // 2 * 20))
+
+        expected = np.concatenate([block.data for block in stream_messages(modulator, messages, 256, np.float32)])
+        self.assertEqual(len(expected), num_samples)
+
+        # Module level generator function can be pickled with the source, e.g. for the send process
+        source = pickle.loads(pickle.dumps(GeneratorSampleSource(stream_messages, num_samples, modulator,
+                                                                 messages, 256, np.float32)))
+        np.testing.assert_array_equal(source.read(0, num_samples), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
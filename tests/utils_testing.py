@@ -47,6 +47,8 @@ def write_settings():
         settings.write("not_show_save_dialog", True)
         settings.write("NetworkSDRInterface", True)
         settings.write("align_labels", True)
+        settings.write("use_analysis_cache", False)  # never answer demodulation tests from the user's cache
+        settings.write("use_burst_index", False)
 
 
 # sys.settrace(trace_calls)